@@ -39,7 +39,7 @@ export const knowledgeBaseCommand = new Command('knowledge-base')
       // Spawn Python script with question
       // Must run from the gemini directory for uv to find the venv
       const geminiDir = join(SCRIPTS_DIR, 'gemini')
-      const child = spawn('uv', ['run', 'query_knowledge_base.py', '--question', question], {
+      const child = spawn('uv', ['run', 'query_knowledge_base.py', '--question', question, '--stream'], {
         cwd: geminiDir,
         stdio: 'inherit',
       })
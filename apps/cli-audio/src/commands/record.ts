@@ -10,7 +10,14 @@ const RECORDINGS_DIR = join(homedir(), 'Documents', 'recordings')
 
 export const recordCommand = new Command('record')
   .description('Record audio to WAV file (processing handled by Airflow DAG)')
-  .action(async () => {
+  .option('-p, --priority <n>', 'Processing priority, higher is processed first (RECORDING_INTAKE_POLICY=priority)', '0')
+  .action(async (options: { priority: string }) => {
+    const priority = Number.parseInt(options.priority, 10)
+    if (Number.isNaN(priority)) {
+      console.error(`Error: Invalid priority: ${options.priority}`)
+      process.exit(1)
+    }
+
     // Interactive prompts
     const answers = await inquirer.prompt<{ name: string; language: string }>([
       {
@@ -46,6 +53,7 @@ export const recordCommand = new Command('record')
         meeting_name: name,
         language: language,
         wav_path: wavPath,
+        ...(priority !== 0 && { priority }),
         timestamp: new Date().toISOString(),
       }
 
@@ -1,5 +1,5 @@
 import { spawn } from 'child_process'
-import { mkdirSync } from 'fs'
+import { mkdirSync, writeFileSync } from 'fs'
 import { homedir } from 'os'
 import { join } from 'path'
 import { Command } from 'commander'
@@ -13,7 +13,14 @@ const DEVICE_NAME = 'rec_mix.monitor'
 
 export const recordLiveCommand = new Command('record-live')
   .description('Record audio with real-time transcription')
-  .action(async () => {
+  .option('-p, --priority <n>', 'Processing priority, higher is processed first (RECORDING_INTAKE_POLICY=priority)', '0')
+  .action(async (options: { priority: string }) => {
+    const priority = Number.parseInt(options.priority, 10)
+    if (Number.isNaN(priority)) {
+      console.error(`Error: Invalid priority: ${options.priority}`)
+      process.exit(1)
+    }
+
     // Interactive prompts
     const answers = await inquirer.prompt<{ name: string; language: string }>([
       {
@@ -48,8 +55,33 @@ export const recordLiveCommand = new Command('record-live')
     const wavPath = join(RECORDINGS_DIR, `${name}.wav`)
     const jsonlPath = join(JSONL_DIR, `${name}.jsonl`)
     const markdownPath = join(MARKDOWN_DIR, `${name}.md`)
+    const metadataPath = join(RECORDINGS_DIR, `${name}.meta.json`)
     const recordLiveScriptPath = join(process.cwd(), 'src', 'recordLiveTS.ts')
 
+    // Hand the recording to the processing pipeline, which reuses the live transcript when good enough.
+    // Only once: the recorder also exits with 0 after Ctrl+C, and the pipeline may have claimed the file already
+    let metadataCreated = false
+    function createMetadata() {
+      if (metadataCreated) return
+      metadataCreated = true
+      const metadata = {
+        meeting_name: name,
+        language: language,
+        wav_path: wavPath,
+        ...(priority !== 0 && { priority }),
+        live_transcript: jsonlPath,
+        timestamp: new Date().toISOString(),
+      }
+
+      try {
+        writeFileSync(metadataPath, JSON.stringify(metadata, null, 2))
+        console.log(`✓ Metadata created: ${metadataPath}`)
+      } catch (error) {
+        const errorMessage = error instanceof Error ? error.message : String(error)
+        console.error(`Warning: Failed to create metadata file: ${errorMessage}`)
+      }
+    }
+
     // Record audio with live transcription
     const child = spawn(
       'bun',
@@ -69,6 +101,7 @@ export const recordLiveCommand = new Command('record-live')
         console.log(`✓ WAV: ${wavPath}`)
         console.log(`✓ Markdown: ${markdownPath}`)
         console.log(`✓ JSONL: ${jsonlPath}`)
+        createMetadata()
         console.log('')
         process.exit(0)
       }, 500)
@@ -85,6 +118,7 @@ export const recordLiveCommand = new Command('record-live')
         console.log(`✓ WAV: ${wavPath}`)
         console.log(`✓ Markdown: ${markdownPath}`)
         console.log(`✓ JSONL: ${jsonlPath}`)
+        createMetadata()
         console.log('')
       }
     })
@@ -155,6 +155,8 @@ async function recordAndTranscribe(
       language,
       enable_partials: true,
       max_delay: 2.0,
+      // Speaker labels let the pipeline use this transcript instead of a batch job
+      diarization: 'speaker',
     },
     audio_format: {
       type: 'raw',
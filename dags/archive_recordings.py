@@ -0,0 +1,87 @@
+"""
+Airflow DAG for recording retention.
+
+Runs nightly and compacts WAVs of recordings that finished processing:
+1. Replace WAVs older than RETENTION_DAYS with FLAC or Opus archives (or delete
+   them), after checking that the MP3 and transcript are complete
+2. Refresh the recording summary sidecars and recordings index for the changed files
+
+Settings come from the environment of the Airflow worker:
+- RETENTION_DAYS: minimum WAV age in days (default: 30)
+- RETENTION_MODE: flac, opus or delete (default: flac)
+- RETENTION_CPU_PERCENT: share of CPUs used for encoding (default: 50)
+- RETENTION_MAX_RUNTIME_MINUTES: stop starting new recordings after this long (default: 240)
+
+Reports are written to ~/Documents/recordings/.retention/.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import os
+
+from airflow import DAG
+from airflow.providers.standard.operators.bash import BashOperator
+
+# Configuration
+RECORDINGS_DIR = str(Path.home() / "Documents" / "recordings")
+PACKAGES_DIR = str(Path.home() / "repositories" / "magik" / "packages")
+
+# Default arguments for the DAG
+default_args = {
+    'owner': 'airflow',
+    'depends_on_past': False,
+    'start_date': datetime(2025, 1, 1),
+    'email_on_failure': False,
+    'email_on_retry': False,
+    'retries': 1,
+    'retry_delay': timedelta(minutes=30),
+}
+
+
+# Create the DAG
+with DAG(
+    'archive_recordings',
+    default_args=default_args,
+    description='Compact processed recording WAVs to FLAC/Opus after the retention period',
+    schedule='0 3 * * *',  # Daily at 3am
+    catchup=False,
+    max_active_runs=1,
+    tags=['recording', 'retention'],
+) as dag:
+
+    # Task 1: Archive or delete old WAVs
+    archive_wavs = BashOperator(
+        task_id='archive_wavs',
+        bash_command=(
+            f"python3 {PACKAGES_DIR}/audio/scripts/archive_recordings.py "
+            "--dir \"$RECORDINGS_DIR\" "
+            "--older-than-days \"$RETENTION_DAYS\" "
+            "--mode \"$RETENTION_MODE\" "
+            "--cpu-percent \"$RETENTION_CPU_PERCENT\" "
+            "--max-runtime-minutes \"$RETENTION_MAX_RUNTIME_MINUTES\" "
+        ),
+        env={
+            'RECORDINGS_DIR': RECORDINGS_DIR,
+            'RETENTION_DAYS': os.environ.get('RETENTION_DAYS', '30'),
+            'RETENTION_MODE': os.environ.get('RETENTION_MODE', 'flac'),
+            'RETENTION_CPU_PERCENT': os.environ.get('RETENTION_CPU_PERCENT', '50'),
+            'RETENTION_MAX_RUNTIME_MINUTES': os.environ.get('RETENTION_MAX_RUNTIME_MINUTES', '240'),
+            'PATH': os.environ.get('PATH', ''),
+            'HOME': os.environ.get('HOME', ''),
+        },
+    )
+
+    # Task 2: Rewrite stale summary sidecars (file sizes changed) and update their index entries
+    refresh_summaries = BashOperator(
+        task_id='refresh_summaries',
+        bash_command=f"python3 {PACKAGES_DIR}/transcription/scripts/recording_summary.py backfill --dir \"$RECORDINGS_DIR\" ",
+        env={
+            'RECORDINGS_DIR': RECORDINGS_DIR,
+            'PATH': os.environ.get('PATH', ''),
+            'HOME': os.environ.get('HOME', ''),
+        },
+        # Sidecars must follow the files even if some archives failed
+        trigger_rule='all_done',
+    )
+
+    archive_wavs >> refresh_summaries
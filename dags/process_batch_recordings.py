@@ -2,21 +2,33 @@
 Airflow DAG for processing audio recordings.
 
 This DAG watches for new metadata files created by the record command,
-then orchestrates the complete processing pipeline:
-1. Create Obsidian meeting note
-2. Convert WAV to MP3
-3. Update Obsidian with audio link
-4. Transcribe audio with Speechmatics
-5. Format transcript to markdown
-6. Update Obsidian with transcript link
+claims one per run (shortest recording first by default, see
+RECORDING_INTAKE_POLICY), then orchestrates the complete processing pipeline:
+1. Convert WAV to MP3 (plus a mono 16 kHz derivative that is uploaded for transcription)
+2. Transcribe audio: reuse the live transcription of record-live recordings when it
+   meets the quality bar, otherwise Speechmatics batch (long recordings split at
+   silences, in parallel)
+3. Write the recording summary sidecar and update the recordings index
+4. Format transcript to markdown
+5. Update local full-text transcript index
+6. Create/update the Obsidian meeting note with audio and transcript links (one atomic write)
 7. Upload transcript to Gemini knowledge base
 8. Cleanup metadata file
+
+Every stage publishes start/finish/failure events with timings to backend-socket
+(channel recording:<meeting name>, see pipeline_progress.py); set SOCKET_SERVER_URL
+to an empty string to turn them off. Each broadcast carries all stages so far,
+kept in <meeting name>.progress.json in the recordings directory while the
+recording is processed (task callbacks run in separate processes).
 """
 
 from datetime import datetime, timedelta
 from pathlib import Path
+import functools
+import importlib.util
 import json
 import os
+import time
 
 from airflow import DAG
 from airflow.providers.standard.operators.python import PythonOperator, ShortCircuitOperator
@@ -27,6 +39,69 @@ from airflow.models import Variable
 RECORDINGS_DIR = str(Path.home() / "Documents" / "recordings")
 PACKAGES_DIR = str(Path.home() / "repositories" / "magik" / "packages")
 OBSIDIAN_DIR = str(Path.home() / "Obsidian" / "magic")
+SOCKET_SERVER_URL = os.environ.get('SOCKET_SERVER_URL', 'http://localhost:4001')
+# Longest a finished task waits for its progress event to be delivered
+PROGRESS_FLUSH_SECONDS = 2.0
+FIRST_TASK_ID = 'check_for_metadata'
+LAST_TASK_ID = 'cleanup_metadata'
+# Which queued recording is processed next: shortest (audio first), priority (.meta.json
+# "priority", higher first) or fifo; see recording_queue.py
+RECORDING_INTAKE_POLICY = os.environ.get('RECORDING_INTAKE_POLICY', 'shortest')
+# Recordings queued longer than this are taken first, whatever the policy
+RECORDING_INTAKE_MAX_WAIT_MINUTES = float(os.environ.get('RECORDING_INTAKE_MAX_WAIT_MINUTES', '120'))
+
+# Task start times (monotonic) by (run_id, task_id), for stage durations
+_stage_started = {}
+
+
+def publish_progress(status):
+    """Task callback publishing a stage event for the recording to backend-socket. Never fails the task."""
+    def callback(context):
+        if not SOCKET_SERVER_URL:
+            return
+        try:
+            ti = context['task_instance']
+            meeting_name = ti.xcom_pull(task_ids='check_for_metadata', key='meeting_name')
+            if not meeting_name:
+                return  # No recording claimed (yet)
+
+            key = (ti.run_id, ti.task_id)
+            now = time.monotonic()
+            event = {
+                'status': status,
+                'started_at': ti.start_date.isoformat() if ti.start_date else None,
+                'try_number': ti.try_number,
+            }
+            if status == 'running':
+                _stage_started[key] = now
+            else:
+                event['finished_at'] = datetime.now().astimezone().isoformat()
+                if key in _stage_started:
+                    event['duration_seconds'] = round(now - _stage_started.pop(key), 3)
+                elif ti.start_date:
+                    event['duration_seconds'] = round((datetime.now(ti.start_date.tzinfo) - ti.start_date).total_seconds(), 3)
+            if status in ('retrying', 'failed') and context.get('exception'):
+                event['error'] = str(context['exception'])[:500]
+
+            completed = status == 'success' and ti.task_id == LAST_TASK_ID
+            recording_status = 'failed' if status == 'failed' else 'completed' if completed else 'processing'
+
+            pipeline_progress = load_package_script('audio', 'pipeline_progress')
+            snapshot_path = pipeline_progress.snapshot_path_for(RECORDINGS_DIR, meeting_name)
+            if status == 'success' and ti.task_id == FIRST_TASK_ID:
+                # Newly claimed: drop stages left by an earlier, failed run of this recording
+                snapshot_path.unlink(missing_ok=True)
+            publisher = pipeline_progress.get_publisher(SOCKET_SERVER_URL)
+            publisher.publish(meeting_name, ti.task_id, event, recording_status, snapshot_path)
+            if completed:
+                snapshot_path.unlink(missing_ok=True)
+            # Start events are sent while the task runs; a finished task process is about to exit
+            if status != 'running':
+                publisher.flush(PROGRESS_FLUSH_SECONDS)
+        except Exception as e:
+            print(f"Warning: Progress event not published: {e}")
+    return callback
+
 
 # Default arguments for the DAG
 default_args = {
@@ -37,42 +112,99 @@ default_args = {
     'email_on_retry': False,
     'retries': 1,
     'retry_delay': timedelta(minutes=5),
+    'on_execute_callback': publish_progress('running'),
+    'on_success_callback': publish_progress('success'),
+    'on_retry_callback': publish_progress('retrying'),
+    'on_failure_callback': publish_progress('failed'),
 }
 
 
 def check_for_metadata(**context):
-    """Check if there's a metadata file to process. Returns False to skip if none found."""
-    metadata_files = list(Path(RECORDINGS_DIR).glob("*.meta.json"))
+    """Claim the next queued recording (by RECORDING_INTAKE_POLICY). Returns False to skip if none found."""
+    recording_queue = load_package_script('audio', 'recording_queue')
+    queue = recording_queue.scan_queue(RECORDINGS_DIR)
 
-    if not metadata_files:
+    if not queue:
         print("No metadata files found. Skipping this run.")
         return False  # Short-circuit: skip all downstream tasks
 
-    # Find the oldest unprocessed metadata file
-    file_path = Path(min(metadata_files, key=lambda p: p.stat().st_mtime))
-
-    with open(file_path, 'r') as f:
-        metadata = json.load(f)
-
-    # IMMEDIATELY rename file to .processing to prevent other runs from picking it up
-    processing_path = file_path.with_suffix('.processing')
-    file_path.rename(processing_path)
+    ordered = recording_queue.schedule(queue, RECORDING_INTAKE_POLICY,
+                                       max_wait=RECORDING_INTAKE_MAX_WAIT_MINUTES * 60)
+    for recording in ordered:
+        file_path = recording.metadata_path
+        try:
+            with open(file_path, 'r') as f:
+                metadata = json.load(f)
+            # IMMEDIATELY rename file to .processing to prevent other runs from picking it up
+            processing_path = file_path.with_suffix('.processing')
+            file_path.rename(processing_path)
+        except FileNotFoundError:
+            # Claimed by a concurrent run since the scan: try the next one
+            continue
+        break
+    else:
+        print("All queued recordings were claimed by other runs. Skipping this run.")
+        return False
     print(f"Renamed {file_path} -> {processing_path} (claimed for processing)")
+    print(f"Intake policy {RECORDING_INTAKE_POLICY}: {recording.duration / 60:.1f} min audio, "
+          f"priority {recording.priority}, queued {(time.time() - recording.queued_at) / 60:.0f} min, "
+          f"{len(queue) - 1} more waiting")
 
     # Push metadata to XCom for downstream tasks
     context['task_instance'].xcom_push(key='meeting_name', value=metadata['meeting_name'])
     context['task_instance'].xcom_push(key='language', value=metadata['language'])
     context['task_instance'].xcom_push(key='wav_path', value=metadata['wav_path'])
     context['task_instance'].xcom_push(key='metadata_path', value=str(processing_path))
+    # Set by record-live: JSONL of the real-time Speechmatics session
+    context['task_instance'].xcom_push(key='live_transcript', value=metadata.get('live_transcript', ''))
 
     print(f"Found recording to process: {metadata['meeting_name']}")
     print(f"Language: {metadata['language']}")
     print(f"WAV path: {metadata['wav_path']}")
+    if metadata.get('live_transcript'):
+        print(f"Live transcript: {metadata['live_transcript']}")
     print(f"Processing file: {processing_path}")
 
     return True  # Continue with processing
 
 
+@functools.cache
+def load_package_script(package, name):
+    """Import a Python script from packages/<package>/scripts (they are not installed as modules), once per process."""
+    spec = importlib.util.spec_from_file_location(name, Path(PACKAGES_DIR) / package / "scripts" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_meeting_note(**context):
+    """Create or update the Obsidian meeting note with the audio and transcript links in one write."""
+    ti = context['task_instance']
+    meeting_name = ti.xcom_pull(task_ids='check_for_metadata', key='meeting_name')
+    language = ti.xcom_pull(task_ids='check_for_metadata', key='language')
+
+    # Date/time of a new note come from the recording, not from when the pipeline got to it
+    created_at = None
+    with open(ti.xcom_pull(task_ids='check_for_metadata', key='metadata_path'), 'r') as f:
+        timestamp = json.load(f).get('timestamp')
+    if timestamp:
+        created_at = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).astimezone()
+
+    transcript_page = Path(OBSIDIAN_DIR) / "Transcriptions" / f"{meeting_name}.md"
+    meeting_note = load_package_script('obsidian', 'meeting_note')
+    note_path, changes = meeting_note.update_note(
+        meeting_name,
+        language,
+        audio_path=Path(RECORDINGS_DIR) / f"{meeting_name}.mp3",
+        transcript_path=transcript_page if transcript_page.exists() else None,
+        created_at=created_at,
+        vault_dir=OBSIDIAN_DIR,
+    )
+    for change in changes:
+        print(change)
+    print(f"Meeting note {'updated' if changes else 'unchanged'}: {note_path}")
+
+
 # Create the DAG
 with DAG(
     'process_batch_recordings',
@@ -89,63 +221,59 @@ with DAG(
         python_callable=check_for_metadata,
     )
 
-    # Task 2: Create Obsidian meeting note
-    create_meeting_note = BashOperator(
-        task_id='create_meeting_note',
-        bash_command=(
-            f"bash {PACKAGES_DIR}/obsidian/scripts/createMeetingNote.sh "
-            "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='meeting_name') }}\" "
-            "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='language') }}\" "
-        ),
-        env={
-            'PATH': os.environ.get('PATH', ''),
-            'HOME': os.environ.get('HOME', ''),
-        },
-    )
-
-    # Task 3: Convert WAV to MP3
+    # Task 2: Convert WAV to MP3 and the transcription derivative in one ffmpeg pass
     convert_to_mp3 = BashOperator(
         task_id='convert_to_mp3',
         bash_command=f"bash {PACKAGES_DIR}/audio/scripts/convertToMp3.sh \"{{{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='wav_path') }}}}\" ",
         env={
+            'TRANSCRIPTION_PROFILE': os.environ.get('TRANSCRIPTION_PROFILE', 'opus'),
             'PATH': os.environ.get('PATH', ''),
             'HOME': os.environ.get('HOME', ''),
         },
     )
 
-    # Task 4: Update Obsidian with audio link
-    update_audio_link = BashOperator(
-        task_id='update_audio_link',
+    # Task 3: Transcribe audio (live transcript if good enough, else Speechmatics batch as parallel segments)
+    transcribe_audio = BashOperator(
+        task_id='transcribe_audio',
         bash_command=(
-            f"bash {PACKAGES_DIR}/obsidian/scripts/createMeetingNote.sh "
-            "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='meeting_name') }}\" "
+            f"bash {PACKAGES_DIR}/transcription/scripts/transcribeRecording.sh "
+            "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='wav_path') }}\" "
             "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='language') }}\" "
-            "\"$RECORDINGS_DIR/{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='meeting_name') }}.mp3\" "
+            "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='live_transcript') or '' }}\" "
         ),
         env={
             'RECORDINGS_DIR': RECORDINGS_DIR,
+            'LIVE_TRANSCRIPT_MIN_COVERAGE': os.environ.get('LIVE_TRANSCRIPT_MIN_COVERAGE', '0.9'),
+            'LIVE_TRANSCRIPT_MAX_GAP_MINUTES': os.environ.get('LIVE_TRANSCRIPT_MAX_GAP_MINUTES', '5'),
+            'LIVE_TRANSCRIPT_MIN_CONFIDENCE': os.environ.get('LIVE_TRANSCRIPT_MIN_CONFIDENCE', '0.8'),
+            'LIVE_TRANSCRIPT_MIN_SPEAKERS': os.environ.get('LIVE_TRANSCRIPT_MIN_SPEAKERS', '1'),
+            'TRANSCRIBE_MAX_SEGMENT_MINUTES': os.environ.get('TRANSCRIBE_MAX_SEGMENT_MINUTES', '15'),
+            'TRANSCRIBE_WORKERS': os.environ.get('TRANSCRIBE_WORKERS', '4'),
+            'TRANSCRIPTION_PROFILE': os.environ.get('TRANSCRIPTION_PROFILE', 'opus'),
+            'SPEECHMATICS_API_KEY': os.environ.get('SPEECHMATICS_API_KEY', ''),
+            'SPEECHMATICS_API_URL': os.environ.get('SPEECHMATICS_API_URL', 'https://asr.api.speechmatics.com/v2'),
             'PATH': os.environ.get('PATH', ''),
             'HOME': os.environ.get('HOME', ''),
         },
     )
 
-    # Task 5: Transcribe audio with Speechmatics
-    transcribe_audio = BashOperator(
-        task_id='transcribe_audio',
+    # Task 4: Write compact summary sidecar and update recordings.index.json for listings
+    write_recording_summary = BashOperator(
+        task_id='write_recording_summary',
         bash_command=(
-            f"bash {PACKAGES_DIR}/transcription/scripts/transcribeAudio.sh "
-            "\"$RECORDINGS_DIR/{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='meeting_name') }}.mp3\" "
-            "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='language') }}\" "
+            f"python3 {PACKAGES_DIR}/transcription/scripts/recording_summary.py update "
+            "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='meeting_name') }}\" "
+            "--dir \"$RECORDINGS_DIR\" "
+            "--metadata \"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='metadata_path') }}\" "
         ),
         env={
             'RECORDINGS_DIR': RECORDINGS_DIR,
-            'SPEECHMATICS_API_KEY': os.environ.get('SPEECHMATICS_API_KEY', ''),
             'PATH': os.environ.get('PATH', ''),
             'HOME': os.environ.get('HOME', ''),
         },
     )
 
-    # Task 6: Format transcript to markdown
+    # Task 5: Format transcript to markdown
     format_transcript = BashOperator(
         task_id='format_transcript',
         bash_command=(
@@ -160,16 +288,10 @@ with DAG(
         },
     )
 
-    # Task 7: Update Obsidian with transcript link
-    update_transcript_link = BashOperator(
-        task_id='update_transcript_link',
-        bash_command=(
-            f"bash {PACKAGES_DIR}/obsidian/scripts/createMeetingNote.sh "
-            "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='meeting_name') }}\" "
-            "\"{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='language') }}\" "
-            "\"\" "  # audio_path (empty, already added)
-            "\"$OBSIDIAN_DIR/Transcriptions/{{ task_instance.xcom_pull(task_ids='check_for_metadata', key='meeting_name') }}.md\" "
-        ),
+    # Task 6: Update local full-text transcript index
+    index_transcript = BashOperator(
+        task_id='index_transcript',
+        bash_command=f"bash {PACKAGES_DIR}/gemini/scripts/indexTranscripts.sh \"$OBSIDIAN_DIR/Transcriptions\" ",
         env={
             'OBSIDIAN_DIR': OBSIDIAN_DIR,
             'PATH': os.environ.get('PATH', ''),
@@ -177,6 +299,12 @@ with DAG(
         },
     )
 
+    # Task 7: Create/update the Obsidian meeting note in-process (audio + transcript links, atomic, idempotent)
+    update_meeting_note = PythonOperator(
+        task_id='update_meeting_note',
+        python_callable=write_meeting_note,
+    )
+
     # Task 8: Upload transcript to Gemini knowledge base
     upload_to_gemini = BashOperator(
         task_id='upload_to_gemini',
@@ -188,6 +316,7 @@ with DAG(
         env={
             'OBSIDIAN_DIR': OBSIDIAN_DIR,
             'GOOGLE_API_KEY': os.environ.get('GOOGLE_API_KEY', ''),
+            'GOOGLE_GEMINI_BASE_URL': os.environ.get('GOOGLE_GEMINI_BASE_URL', ''),
             'PATH': os.environ.get('PATH', ''),
             'HOME': os.environ.get('HOME', ''),
         },
@@ -203,4 +332,4 @@ with DAG(
     )
 
     # Define task dependencies (linear pipeline)
-    check_metadata >> create_meeting_note >> convert_to_mp3 >> update_audio_link >> transcribe_audio >> format_transcript >> update_transcript_link >> upload_to_gemini >> cleanup_metadata
+    check_metadata >> convert_to_mp3 >> transcribe_audio >> write_recording_summary >> format_transcript >> index_transcript >> update_meeting_note >> upload_to_gemini >> cleanup_metadata
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Retention tiering for processed recordings.
+
+Recordings are kept as float32 stereo WAVs (about 1.4 GB per hour) after the
+pipeline has made the MP3 and transcript. This script finds WAVs older than
+--older-than-days, checks that the derived files are complete and replaces
+each WAV with a compact archive:
+- flac: lossless apart from float -> 24-bit conversion, about half the size
+- opus: perceptual, about 1% of the size at the default bitrate
+- delete: remove the WAV, keeping only the MP3
+
+A WAV is only touched when the recording is no longer in the pipeline (no
+.meta.json or .processing file), the MP3 exists with the same duration, and the
+transcript exists (unless --allow-untranscribed). Archives are encoded to a
+temporary file, checked for the same duration, synced to disk and given the
+WAV's modification time before the WAV is removed.
+
+Encoding runs niced, with single-threaded ffmpeg processes on at most
+--cpu-percent of the CPUs. A JSON report with bytes reclaimed, CPU and wall
+time per recording is written to <dir>/.retention/.
+
+Usage: python archive_recordings.py [--dir <recordings_dir>] [--older-than-days 30] [--mode flac|opus|delete]
+                                    [--cpu-percent 50] [--max-runtime-minutes 120] [--dry-run]
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+RECORDINGS_DIR = Path.home() / "Documents" / "recordings"
+REPORT_DIRNAME = ".retention"
+MODES = ('flac', 'opus', 'delete')
+DEFAULT_OLDER_THAN_DAYS = 30
+DEFAULT_CPU_PERCENT = 50
+DEFAULT_OPUS_BITRATE = "96k"
+NICENESS = 10
+
+# Derived files must match the WAV duration within this many seconds (or 0.5%)
+DURATION_TOLERANCE_SECONDS = 1.0
+DURATION_TOLERANCE_RATIO = 0.005
+
+ENCODER_ARGS = {
+    'flac': ['-c:a', 'flac', '-sample_fmt', 's32', '-compression_level', '5', '-f', 'flac'],
+    'opus': ['-c:a', 'libopus', '-vbr', 'on', '-application', 'audio', '-f', 'ogg'],
+}
+
+
+def isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def wav_duration(path: Path) -> float:
+    """Duration of a WAV from its header and file size (recordings stopped abruptly can have a wrong data size)."""
+    with open(path, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f"{path.name} is not a WAV file")
+        byte_rate = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{path.name} has no data chunk")
+            chunk_id, size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                byte_rate = struct.unpack('<HHII', f.read(12))[3]
+                f.seek(size + size % 2 - 12, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if not byte_rate:
+                    raise ValueError(f"{path.name} has no fmt chunk")
+                return (path.stat().st_size - f.tell()) / byte_rate
+            else:
+                f.seek(size + size % 2, os.SEEK_CUR)
+
+
+def probe_duration(path: Path):
+    """Duration reported by ffprobe, or None if the file cannot be decoded."""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', str(path)],
+        capture_output=True, text=True)
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def same_duration(a: float, b: float) -> bool:
+    return abs(a - b) <= max(DURATION_TOLERANCE_SECONDS, DURATION_TOLERANCE_RATIO * max(a, b))
+
+
+def skip_reason(recordings_dir: Path, name: str, wav_seconds: float, require_transcript: bool):
+    """Why a WAV must be kept, or None if its derived files are complete."""
+    if (recordings_dir / f"{name}.meta.json").exists() or (recordings_dir / f"{name}.meta.processing").exists():
+        return "in pipeline"
+
+    mp3_path = recordings_dir / f"{name}.mp3"
+    if not mp3_path.exists() or mp3_path.stat().st_size == 0:
+        return "no mp3"
+    mp3_seconds = probe_duration(mp3_path)
+    if mp3_seconds is None or not same_duration(mp3_seconds, wav_seconds):
+        return "mp3 incomplete"
+
+    if require_transcript:
+        try:
+            with open(recordings_dir / f"{name}_transcript.json", 'r', encoding='utf-8') as f:
+                if not json.load(f).get('results'):
+                    return "transcript empty"
+        except FileNotFoundError:
+            return "no transcript"
+        except ValueError:
+            return "transcript unreadable"
+    return None
+
+
+def run_measured(command):
+    """Run a command and return (exit code, stderr tail, CPU seconds) using its resource usage."""
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = process.stderr.read().decode(errors='replace')
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    process.stderr.close()
+    return process.returncode, stderr.strip()[-500:], usage.ru_utime + usage.ru_stime
+
+
+def archive(wav_path: Path, mode: str, wav_seconds: float, opus_bitrate: str) -> dict:
+    """Replace one WAV according to mode. Returns the report entry."""
+    wav_stat = wav_path.stat()
+    entry = {
+        'name': wav_path.stem,
+        'action': mode,
+        'audio_seconds': round(wav_seconds, 2),
+        'wav_bytes': wav_stat.st_size,
+        'output_bytes': 0,
+        'cpu_seconds': 0.0,
+    }
+    start = time.perf_counter()
+
+    if mode != 'delete':
+        output_path = wav_path.with_suffix(f".{mode}")
+        tmp_path = wav_path.with_name(f".{wav_path.stem}.{mode}.tmp")
+        encoder = ENCODER_ARGS[mode] + (['-b:a', opus_bitrate] if mode == 'opus' else [])
+        code, stderr, cpu = run_measured(['ffmpeg', '-nostdin', '-v', 'error', '-y', '-i', str(wav_path),
+                                          '-threads', '1', *encoder, str(tmp_path)])
+        entry['cpu_seconds'] = round(cpu, 3)
+        output_seconds = probe_duration(tmp_path) if code == 0 else None
+        if output_seconds is None or not same_duration(output_seconds, wav_seconds):
+            tmp_path.unlink(missing_ok=True)
+            entry.update(status='failed', error=stderr or f"{mode} duration {output_seconds} s does not match the WAV")
+            entry['wall_seconds'] = round(time.perf_counter() - start, 3)
+            return entry
+
+        # Durable before the WAV goes away; keeps the recording's original time
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.utime(tmp_path, (wav_stat.st_atime, wav_stat.st_mtime))
+        os.replace(tmp_path, output_path)
+        entry['output_bytes'] = output_path.stat().st_size
+
+    wav_path.unlink()
+    entry.update(status='done', reclaimed_bytes=entry['wav_bytes'] - entry['output_bytes'],
+                 wall_seconds=round(time.perf_counter() - start, 3))
+    return entry
+
+
+def find_candidates(recordings_dir: Path, older_than_days: float, require_transcript: bool):
+    """Return (candidates [(wav_path, seconds)], skipped entries) for WAVs older than the cutoff, oldest first."""
+    cutoff = time.time() - older_than_days * 86400
+    candidates, skipped = [], []
+    for wav_path in sorted(recordings_dir.glob("*.wav"), key=lambda path: (path.stat().st_mtime, path.name)):
+        if wav_path.stat().st_mtime > cutoff:
+            continue
+        try:
+            seconds = wav_duration(wav_path)
+        except (OSError, ValueError, struct.error) as e:
+            skipped.append({'name': wav_path.stem, 'status': 'skipped', 'reason': f"unreadable wav: {e}"})
+            continue
+        reason = skip_reason(recordings_dir, wav_path.stem, seconds, require_transcript)
+        if reason:
+            skipped.append({'name': wav_path.stem, 'status': 'skipped', 'reason': reason})
+        else:
+            candidates.append((wav_path, seconds))
+    return candidates, skipped
+
+
+def summarize(entries: list, wall_seconds: float, workers: int) -> dict:
+    done = [entry for entry in entries if entry['status'] == 'done']
+    reasons = {}
+    for entry in entries:
+        if entry['status'] == 'skipped':
+            reasons[entry['reason']] = reasons.get(entry['reason'], 0) + 1
+    audio_seconds = sum(entry['audio_seconds'] for entry in done)
+    return {
+        'archived': len(done),
+        'failed': sum(1 for entry in entries if entry['status'] == 'failed'),
+        'not_started': sum(1 for entry in entries if entry['status'] == 'not started'),
+        'skipped': reasons,
+        'wav_bytes': sum(entry['wav_bytes'] for entry in done),
+        'output_bytes': sum(entry['output_bytes'] for entry in done),
+        'reclaimed_bytes': sum(entry['reclaimed_bytes'] for entry in done),
+        'audio_hours': round(audio_seconds / 3600, 2),
+        'cpu_seconds': round(sum(entry.get('cpu_seconds', 0) for entry in entries), 3),
+        'wall_seconds': round(wall_seconds, 3),
+        'workers': workers,
+        'realtime_factor': round(audio_seconds / wall_seconds, 1) if wall_seconds and audio_seconds else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace old recording WAVs with FLAC/Opus archives or delete them")
+    parser.add_argument("--dir", type=Path, default=RECORDINGS_DIR, help=f"Recordings directory (default: {RECORDINGS_DIR})")
+    parser.add_argument("--older-than-days", type=float, default=DEFAULT_OLDER_THAN_DAYS,
+                        help=f"Only WAVs last modified this many days ago or earlier (default: {DEFAULT_OLDER_THAN_DAYS})")
+    parser.add_argument("--mode", choices=MODES, default='flac', help="What to do with the WAV (default: flac)")
+    parser.add_argument("--opus-bitrate", default=DEFAULT_OPUS_BITRATE,
+                        help=f"Opus bitrate (default: {DEFAULT_OPUS_BITRATE})")
+    parser.add_argument("--cpu-percent", type=float, default=DEFAULT_CPU_PERCENT,
+                        help=f"Share of CPUs used for parallel encoding (default: {DEFAULT_CPU_PERCENT})")
+    parser.add_argument("--max-runtime-minutes", type=float, default=None,
+                        help="Start no new recordings after this long (default: no limit)")
+    parser.add_argument("--allow-untranscribed", action="store_true",
+                        help="Archive WAVs of recordings without a transcript")
+    parser.add_argument("--report", type=Path, default=None,
+                        help=f"Report path (default: <dir>/{REPORT_DIRNAME}/retention-<timestamp>.json)")
+    parser.add_argument("--dry-run", action="store_true", help="List what would be archived without changing anything")
+    args = parser.parse_args()
+
+    if not args.dir.is_dir():
+        print(f"Error: Recordings directory not found: {args.dir}", file=sys.stderr)
+        sys.exit(1)
+    if not 0 < args.cpu_percent <= 100:
+        print("Error: --cpu-percent must be between 0 and 100", file=sys.stderr)
+        sys.exit(1)
+    tools = ('ffmpeg', 'ffprobe')
+    missing = [tool for tool in tools if not shutil.which(tool)]
+    if missing:
+        print(f"Error: {', '.join(missing)} not installed", file=sys.stderr)
+        sys.exit(1)
+
+    candidates, skipped = find_candidates(args.dir, args.older_than_days, not args.allow_untranscribed)
+    pending_bytes = sum(path.stat().st_size for path, _ in candidates)
+    print(f"Found {len(candidates)} WAV(s) to {args.mode} ({pending_bytes / 1024 ** 3:.2f} GB), "
+          f"{len(skipped)} kept")
+    for entry in skipped:
+        print(f"  - {entry['name']}: {entry['reason']}")
+
+    if args.dry_run:
+        for path, seconds in candidates:
+            print(f"  {path.name} ({seconds / 60:.1f} min, {path.stat().st_size / 1024 ** 2:.0f} MB)")
+        sys.exit(0)
+
+    # Leave the rest of the machine (and the recording pipeline) ahead of archiving
+    os.nice(NICENESS)
+    workers = max(1, math.floor((os.cpu_count() or 1) * args.cpu_percent / 100))
+    deadline = time.monotonic() + args.max_runtime_minutes * 60 if args.max_runtime_minutes else None
+    print_lock = threading.Lock()
+
+    def process(candidate):
+        path, seconds = candidate
+        if deadline and time.monotonic() > deadline:
+            return {'name': path.stem, 'status': 'not started', 'reason': 'max runtime reached'}
+        try:
+            entry = archive(path, args.mode, seconds, args.opus_bitrate)
+        except OSError as e:
+            entry = {'name': path.stem, 'action': args.mode, 'status': 'failed', 'error': str(e)}
+        with print_lock:
+            if entry['status'] == 'done':
+                print(f"  ✓ {entry['name']}: {entry['wav_bytes'] / 1024 ** 2:.0f} MB -> "
+                      f"{entry['output_bytes'] / 1024 ** 2:.0f} MB in {entry['wall_seconds']:.1f} s")
+            else:
+                print(f"  ✗ {entry['name']}: {entry['error']}", file=sys.stderr)
+        return entry
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        entries = list(pool.map(process, candidates))
+    wall_seconds = time.perf_counter() - start
+
+    report = {
+        'timestamp': isoformat(time.time()),
+        'dir': str(args.dir),
+        'mode': args.mode,
+        'older_than_days': args.older_than_days,
+        'totals': summarize(entries + skipped, wall_seconds, workers),
+        'recordings': entries + skipped,
+    }
+    report_path = args.report or (args.dir / REPORT_DIRNAME /
+                                  f"retention-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json")
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2) + "\n")
+
+    totals = report['totals']
+    print(f"✓ Archived {totals['archived']} recording(s) ({totals['audio_hours']} h of audio), "
+          f"reclaimed {totals['reclaimed_bytes'] / 1024 ** 3:.2f} GB in {totals['wall_seconds']:.1f} s "
+          f"with {workers} worker(s), {totals['cpu_seconds']:.1f} CPU s")
+    print(f"✓ Report written to {report_path}")
+    if totals['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,9 @@
 
 # Script to convert WAV file to MP3
 # Usage: ./convertToMp3.sh <input_file.wav>
-# Output: Creates <input_file>.mp3 in the same directory
+# Output: Creates <input_file>.mp3 in the same directory, plus a mono 16 kHz
+#         transcription derivative in .transcription/ (TRANSCRIPTION_PROFILE:
+#         opus (default), flac, or mp3 to upload the MP3 itself)
 
 if [ $# -ne 1 ]; then
     echo "Usage: $0 <input_file.wav>"
@@ -26,14 +28,40 @@ fi
 # Generate MP3 filename (same name, different extension)
 MP3_FILE="${WAV_FILE%.wav}.mp3"
 
+# Transcription derivative: speech recognition needs neither stereo nor 48 kHz
+TRANSCRIPTION_PROFILE="${TRANSCRIPTION_PROFILE:-opus}"
+case "$TRANSCRIPTION_PROFILE" in
+    opus) SPEECH_EXT="ogg"; SPEECH_ARGS=(-codec:a libopus -b:a 32k -application voip) ;;
+    flac) SPEECH_EXT="flac"; SPEECH_ARGS=(-codec:a flac -sample_fmt s16) ;;
+    mp3) SPEECH_EXT="" ;;
+    *)
+        echo "Error: Unknown TRANSCRIPTION_PROFILE '$TRANSCRIPTION_PROFILE' (use opus, flac or mp3)"
+        exit 1
+        ;;
+esac
+
+SPEECH_OUTPUT=()
+if [ -n "$SPEECH_EXT" ]; then
+    SPEECH_DIR="$(dirname "$WAV_FILE")/.transcription"
+    SPEECH_FILE="$SPEECH_DIR/$(basename "${WAV_FILE%.wav}").$SPEECH_EXT"
+    mkdir -p "$SPEECH_DIR"
+    SPEECH_OUTPUT=(-map 0:a -ac 1 -ar 16000 "${SPEECH_ARGS[@]}" "$SPEECH_FILE")
+fi
+
 echo "Converting WAV to MP3..."
 echo "Input:  $WAV_FILE"
 echo "Output: $MP3_FILE"
+if [ -n "$SPEECH_EXT" ]; then
+    echo "Transcription: $SPEECH_FILE ($TRANSCRIPTION_PROFILE, mono 16 kHz)"
+fi
 
-# Convert WAV to MP3 using ffmpeg
-if ffmpeg -i "$WAV_FILE" -codec:a libmp3lame -qscale:a 2 "$MP3_FILE" -y 2>/dev/null; then
+# Convert WAV to MP3 using ffmpeg; the WAV is decoded once for both outputs
+if ffmpeg -y -i "$WAV_FILE" -map 0:a -codec:a libmp3lame -qscale:a 2 "$MP3_FILE" "${SPEECH_OUTPUT[@]}" 2>/dev/null; then
     echo "Conversion successful!"
     echo "MP3 file saved to: $MP3_FILE"
+    if [ -n "$SPEECH_EXT" ]; then
+        echo "Transcription file saved to: $SPEECH_FILE"
+    fi
     exit 0
 else
     echo "Error: Conversion failed"
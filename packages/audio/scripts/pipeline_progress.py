@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Publish recording pipeline progress to backend-socket.
+
+process_batch_recordings reports each stage (start, success, retry, failure,
+with timings) by POSTing to backend-socket's /api/broadcast on the channel
+recording:<meeting name>, so UIs can follow a recording without polling
+backend-audio.
+
+Every broadcast carries a snapshot of all stages so far. Airflow runs each
+task instance (and its callbacks) in a separate process, so the snapshot is
+kept in a <name>.progress.json file next to the recording (update_snapshot(),
+under an exclusive lock) rather than in memory; the DAG starts it when a
+recording is claimed and removes it once the recording is completed.
+
+Publishing never blocks or fails the pipeline:
+- publish() only records the event; background threads post it over a small
+  pool of keep-alive HTTP connections
+- events of a channel that has not been sent yet are coalesced into one
+  broadcast of the latest snapshot. This happens within one process, e.g. a
+  task's start and finish when the start has not gone out yet; a slow or
+  unreachable socket server gets at most one pending request per channel
+- a channel is sent by one connection at a time, so a newer snapshot never
+  arrives before an older one
+- flush() waits a bounded time for pending broadcasts (before a task process
+  exits); whatever is still unsent is dropped
+
+Payload broadcast on recording:<name>:
+    {"recording": "<name>", "status": "processing" | "failed" | "completed",
+     "stages": {"<task_id>": {"status": "running" | "success" | "retrying" | "failed",
+                              "started_at", "finished_at", "duration_seconds", "try_number", "error"}},
+     "sent_at": "<ISO timestamp>"}
+
+Usage: python pipeline_progress.py <meeting_name> <stage> <status> [--url http://localhost:4001]
+                                   [--snapshot <recordings_dir>/<meeting_name>.progress.json]
+"""
+
+import argparse
+import atexit
+import fcntl
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+DEFAULT_SOCKET_URL = "http://localhost:4001"
+BROADCAST_PATH = "/api/broadcast"
+CHANNEL_PREFIX = "recording:"
+STAGE_STATUSES = ("running", "success", "retrying", "failed")
+RECORDING_STATUSES = ("processing", "failed", "completed")
+DEFAULT_CONNECTIONS = 2
+DEFAULT_TIMEOUT_SECONDS = 2.0
+# How long the interpreter waits at exit for unsent events
+EXIT_FLUSH_SECONDS = 1.0
+SNAPSHOT_SUFFIX = ".progress.json"
+
+
+def channel_for(recording):
+    return f"{CHANNEL_PREFIX}{recording}"
+
+
+def utc_now():
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def snapshot_path_for(recordings_dir, recording):
+    return Path(recordings_dir) / f"{recording}{SNAPSHOT_SUFFIX}"
+
+
+def update_snapshot(path, recording, stage, event, status=None):
+    """Merge a stage event into the recording's snapshot file and return the snapshot. Safe across processes."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    with os.fdopen(fd, 'r+', encoding='utf-8') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            try:
+                previous = json.loads(f.read() or '{}')
+            except json.JSONDecodeError:
+                # Cut off by a task process killed mid-write; start over
+                previous = {}
+            if not isinstance(previous, dict) or previous.get('recording') != recording:
+                previous = {}
+            snapshot = {
+                'recording': recording,
+                'status': status or previous.get('status', 'processing'),
+                'stages': {**previous.get('stages', {}), stage: event},
+            }
+            f.seek(0)
+            f.truncate()
+            json.dump(snapshot, f, indent=2)
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+    return snapshot
+
+
+class ProgressPublisher:
+    """Coalescing, non-blocking publisher of recording progress to one backend-socket server."""
+
+    def __init__(self, base_url, connections=DEFAULT_CONNECTIONS, timeout=DEFAULT_TIMEOUT_SECONDS):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Invalid socket server URL: {base_url}")
+        self.url = base_url
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self._address = (parts.hostname, parts.port)
+        self._path = parts.path.rstrip('/') + BROADCAST_PATH
+        self._timeout = timeout
+
+        self._condition = threading.Condition()
+        self._state = {}     # channel -> latest payload
+        self._pending = {}   # channels with unsent changes (dict as an ordered set)
+        self._sending = set()
+        self._idle = []      # pooled keep-alive connections
+        self._closed = False
+        self._warned = False
+        self.published = self.sent = self.failed = self.coalesced = 0
+
+        for index in range(max(1, connections)):
+            threading.Thread(target=self._send_loop, name=f"progress-publisher-{index}", daemon=True).start()
+
+    def publish(self, recording, stage, event, status=None, snapshot_path=None):
+        """
+        Record a stage event (and optionally the recording's status) for sending.
+
+        With snapshot_path the event is merged into that snapshot file first and
+        the whole file is broadcast; without it, only the events published in
+        this process are. Never blocks on network I/O.
+        """
+        channel = channel_for(recording)
+        snapshot = update_snapshot(snapshot_path, recording, stage, event, status) if snapshot_path else None
+        with self._condition:
+            if snapshot:
+                self._state[channel] = snapshot
+            else:
+                payload = self._state.setdefault(channel, {'recording': recording, 'status': 'processing', 'stages': {}})
+                payload['stages'][stage] = event
+                if status:
+                    payload['status'] = status
+            self.published += 1
+            if channel in self._pending:
+                self.coalesced += 1
+            else:
+                self._pending[channel] = None
+                self._condition.notify()
+
+    def flush(self, timeout):
+        """Wait up to timeout seconds until everything published has been sent. Returns True if it was."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._sending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout=EXIT_FLUSH_SECONDS):
+        """Flush for up to timeout seconds, then stop the sender threads and close pooled connections."""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def stats(self):
+        with self._condition:
+            return {'published': self.published, 'sent': self.sent, 'failed': self.failed,
+                    'coalesced': self.coalesced, 'pending': len(self._pending)}
+
+    def _send_loop(self):
+        while True:
+            with self._condition:
+                while not (channel := next((c for c in self._pending if c not in self._sending), None)):
+                    if self._closed:
+                        return
+                    self._condition.wait()
+                del self._pending[channel]
+                # Serialized under the lock: a snapshot of every stage published so far
+                body = json.dumps({'channel': channel, 'payload': {**self._state[channel], 'sent_at': utc_now()}})
+                self._sending.add(channel)
+
+            error = self._post(body.encode())
+
+            with self._condition:
+                self._sending.discard(channel)
+                if error:
+                    self.failed += 1
+                else:
+                    self.sent += 1
+                self._condition.notify_all()
+            if error and not self._warned:
+                self._warned = True
+                print(f"Warning: Progress events not delivered to {self.url}: {error}", file=sys.stderr)
+
+    def _post(self, body):
+        """POST one broadcast. Returns None on success, else the error."""
+        error = None
+        # A second attempt on a fresh connection covers keep-alive connections the server has closed
+        for _ in range(2):
+            with self._condition:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._connection_class(*self._address, timeout=self._timeout)
+            try:
+                connection.request('POST', self._path, body=body, headers={'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                error = e
+                continue
+            with self._condition:
+                if self._closed:
+                    connection.close()
+                else:
+                    self._idle.append(connection)
+            return None if response.status < 300 else f"HTTP {response.status}"
+        return error
+
+
+_publishers = {}
+_publishers_lock = threading.Lock()
+
+
+def get_publisher(base_url=None):
+    """Shared publisher for a socket server URL (default: SOCKET_SERVER_URL), flushed at interpreter exit."""
+    url = base_url or os.environ.get('SOCKET_SERVER_URL') or DEFAULT_SOCKET_URL
+    with _publishers_lock:
+        if url not in _publishers:
+            publisher = ProgressPublisher(url)
+            atexit.register(publisher.flush, EXIT_FLUSH_SECONDS)
+            _publishers[url] = publisher
+        return _publishers[url]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish a recording pipeline progress event to backend-socket")
+    parser.add_argument("meeting_name", help="Recording (meeting) name")
+    parser.add_argument("stage", help="Pipeline stage (task id)")
+    parser.add_argument("status", choices=STAGE_STATUSES, help="Stage status")
+    parser.add_argument("--recording-status", choices=RECORDING_STATUSES, help="Overall recording status")
+    parser.add_argument("--error", help="Error message of a failed stage")
+    parser.add_argument("--url", help=f"Socket server URL (default: $SOCKET_SERVER_URL or {DEFAULT_SOCKET_URL})")
+    parser.add_argument("--snapshot", type=Path,
+                        help="Merge the event into this snapshot file and broadcast all its stages")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help=f"Seconds to wait for delivery (default: {DEFAULT_TIMEOUT_SECONDS})")
+    args = parser.parse_args()
+
+    try:
+        publisher = get_publisher(args.url)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    event = {'status': args.status, 'started_at' if args.status == 'running' else 'finished_at': utc_now()}
+    if args.error:
+        event['error'] = args.error
+    try:
+        publisher.publish(args.meeting_name, args.stage, event, args.recording_status, args.snapshot)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not publisher.flush(args.timeout) or publisher.failed:
+        print(f"Error: Event not delivered to {publisher.url}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ Published {args.stage} {args.status} on {channel_for(args.meeting_name)}")
+
+
+if __name__ == '__main__':
+    main()
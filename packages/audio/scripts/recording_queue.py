@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Scheduling of queued recordings for the processing pipeline.
+
+Recordings wait in the recordings directory as <name>.meta.json until
+process_batch_recordings claims one. The policy decides which is next:
+- fifo: oldest first (by the metadata file's modification time)
+- shortest: shortest audio first, from the WAV header (or the WAV size when
+  the header is incomplete); ties in arrival order
+- priority: highest `priority` in the .meta.json first (integer, default 0),
+  then shortest, then oldest
+
+Starvation protection: a recording that has waited longer than max_wait
+seconds is taken before everything else (the longest-waiting first), so long
+or low-priority recordings still finish in bounded time under a steady stream
+of short ones.
+
+Usage: python recording_queue.py [--dir ~/Documents/recordings] [--policy shortest] [--max-wait-minutes 120]
+       (prints the queue in the order it would be processed)
+"""
+
+import argparse
+import json
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+# Also loaded by the DAG from its file path, where this directory is not on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from archive_recordings import wav_duration  # noqa: E402
+
+RECORDINGS_DIR = Path.home() / "Documents" / "recordings"
+METADATA_PATTERN = "*.meta.json"
+POLICIES = ('fifo', 'shortest', 'priority')
+DEFAULT_POLICY = 'shortest'
+DEFAULT_MAX_WAIT_MINUTES = 120
+# recordAudio.sh records 48 kHz stereo float32; used when the WAV header has no usable length
+RECORDER_BYTES_PER_SECOND = 48000 * 2 * 4
+
+
+@dataclass
+class QueuedRecording:
+    """A recording waiting to be processed."""
+    name: str
+    queued_at: float      # epoch seconds
+    duration: float       # seconds of audio (inf when unknown)
+    priority: int = 0
+    metadata_path: Path = None
+
+
+def estimated_duration(wav_path):
+    """Seconds of audio in a WAV file, from its header (or its size if the header is incomplete)."""
+    try:
+        return wav_duration(wav_path)
+    except (ValueError, struct.error):
+        return wav_path.stat().st_size / RECORDER_BYTES_PER_SECOND
+
+
+def scan_queue(recordings_dir):
+    """Queued recordings: every <name>.meta.json with its WAV duration and priority."""
+    queue = []
+    for metadata_path in Path(recordings_dir).glob(METADATA_PATTERN):
+        try:
+            queued_at = metadata_path.stat().st_mtime
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # Claimed by another run meanwhile, or still being written
+            continue
+        name = metadata.get('meeting_name') or metadata_path.name[:-len(".meta.json")]
+        wav_path = Path(metadata.get('wav_path') or Path(recordings_dir) / f"{name}.wav")
+        try:
+            duration = estimated_duration(wav_path)
+        except OSError:
+            duration = float('inf')
+        try:
+            priority = int(metadata.get('priority', 0))
+        except (TypeError, ValueError):
+            priority = 0
+        queue.append(QueuedRecording(name, queued_at, duration, priority, metadata_path))
+    return queue
+
+
+def policy_key(policy):
+    """Sort key for a policy; smallest key is processed first."""
+    if policy == 'fifo':
+        return lambda r: (r.queued_at,)
+    if policy == 'shortest':
+        return lambda r: (r.duration, r.queued_at)
+    if policy == 'priority':
+        return lambda r: (-r.priority, r.duration, r.queued_at)
+    raise ValueError(f"Unknown scheduling policy: {policy} (use {', '.join(POLICIES)})")
+
+
+def schedule(queue, policy=DEFAULT_POLICY, now=None, max_wait=DEFAULT_MAX_WAIT_MINUTES * 60):
+    """Queue in processing order: starving recordings (waited > max_wait) oldest first, then by policy."""
+    now = time.time() if now is None else now
+    key = policy_key(policy)
+    starving = sorted((r for r in queue if max_wait is not None and now - r.queued_at > max_wait),
+                      key=lambda r: r.queued_at)
+    starving_ids = {id(r) for r in starving}
+    return starving + sorted((r for r in queue if id(r) not in starving_ids), key=key)
+
+
+def next_recording(queue, policy=DEFAULT_POLICY, now=None, max_wait=DEFAULT_MAX_WAIT_MINUTES * 60):
+    """The recording to process next, or None for an empty queue."""
+    ordered = schedule(queue, policy, now, max_wait)
+    return ordered[0] if ordered else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show queued recordings in processing order")
+    parser.add_argument("--dir", default=str(RECORDINGS_DIR), help=f"Recordings directory (default: {RECORDINGS_DIR})")
+    parser.add_argument("--policy", choices=POLICIES, default=DEFAULT_POLICY,
+                        help=f"Scheduling policy (default: {DEFAULT_POLICY})")
+    parser.add_argument("--max-wait-minutes", type=float, default=DEFAULT_MAX_WAIT_MINUTES,
+                        help=f"Starvation limit (default: {DEFAULT_MAX_WAIT_MINUTES})")
+    args = parser.parse_args()
+
+    recordings_dir = Path(args.dir).expanduser()
+    if not recordings_dir.exists():
+        print(f"Error: Recordings directory not found: {recordings_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    now = time.time()
+    ordered = schedule(scan_queue(recordings_dir), args.policy, now, args.max_wait_minutes * 60)
+    if not ordered:
+        print("No recordings queued.")
+        return
+    print(f"{len(ordered)} recording(s) queued, {args.policy} order:")
+    for position, recording in enumerate(ordered, start=1):
+        waited = (now - recording.queued_at) / 60
+        starving = " (starving)" if waited > args.max_wait_minutes else ""
+        print(f"{position:3}. {recording.name}: {recording.duration / 60:.1f} min audio, "
+              f"priority {recording.priority}, waiting {waited:.0f} min{starving}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Aggregation Benchmark
+
+Generates a synthetic BMW work CSV (1M rows by default) and compares the
+row-by-row loading and grouping the chart scripts used to do against the
+columnar loader and single-pass aggregation engine.
+
+Usage: python benchmark_aggregation.py [--rows 1000000] [--csv <existing.csv>]
+"""
+
+import argparse
+import csv
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from chart_aggregate import aggregate
+from chart_data import CATEGORY, INTEGER, load_table
+
+SCHEMA = {
+    'Domain': CATEGORY,
+    'Expertise': CATEGORY,
+    'Deliverable': CATEGORY,
+    'Estimation': INTEGER,
+}
+
+CUBES = {
+    'domain': ('Domain',),
+    'domain_expertise': ('Domain', 'Expertise'),
+    'deliverable': ('Deliverable',),
+    'deliverable_domain': ('Deliverable', 'Domain'),
+}
+
+DOMAINS = ['Editor', 'BehaviorTracking', 'EmailCore', 'Personalization', 'Reporting']
+EXPERTISE = ['HARD', 'MEDIUM', 'LIGHT', 'UNKNOWN']
+
+
+def generate_csv(path: Path, rows: int, deliverables: int = 40, seed: int = 42):
+    """Write a synthetic work CSV with the same columns as bmw-work.csv."""
+    rng = np.random.default_rng(seed)
+    columns = {
+        'Deliverable': np.array([f"Deliverable {i:03d}" for i in range(deliverables)])[rng.integers(0, deliverables, rows)],
+        'Domain': np.array(DOMAINS)[rng.integers(0, len(DOMAINS), rows)],
+        'Expertise': np.array(EXPERTISE)[rng.integers(0, len(EXPERTISE), rows)],
+        'Estimation': rng.integers(1, 10, rows),
+    }
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns.keys())
+        writer.writerows(zip(*(column.tolist() for column in columns.values())))
+
+
+def legacy_load_and_group(path: Path):
+    """csv.DictReader into a list of dicts, then one defaultdict pass per chart."""
+    work_items = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            row['Estimation'] = int(row['Estimation'])
+            work_items.append(row)
+
+    domain_totals = defaultdict(int)
+    for item in work_items:
+        domain_totals[item['Domain']] += item['Estimation']
+
+    domain_expertise = defaultdict(lambda: defaultdict(int))
+    for item in work_items:
+        domain_expertise[item['Domain']][item['Expertise']] += item['Estimation']
+
+    deliverable_totals = defaultdict(int)
+    for item in work_items:
+        deliverable_totals[item['Deliverable']] += item['Estimation']
+
+    deliverable_domain = defaultdict(lambda: defaultdict(int))
+    for item in work_items:
+        deliverable_domain[item['Deliverable']][item['Domain']] += item['Estimation']
+
+    return domain_totals, domain_expertise, deliverable_totals, deliverable_domain
+
+
+def timed(label, fn, repeat):
+    """Run fn repeat times and return (label, best seconds, result)."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return label, best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chart data loading and aggregation")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows to generate (default: 1000000)")
+    parser.add_argument("--csv", type=Path, help="Benchmark an existing work CSV instead of generating one")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.csv:
+            csv_path = args.csv
+        else:
+            csv_path = Path(tmp) / "bmw-work.csv"
+            print(f"📝 Generating {args.rows:,} rows...")
+            generate_csv(csv_path, args.rows)
+
+        print(f"📊 Benchmarking {csv_path} ({csv_path.stat().st_size / 1e6:.1f} MB)\n")
+
+        table = load_table(csv_path, SCHEMA)
+        weights = table['Estimation']
+
+        results = [
+            timed("Row-by-row load + 4 grouping passes", lambda: legacy_load_and_group(csv_path), 1),
+            timed("Columnar load (no cache)", lambda: load_table(csv_path, SCHEMA, use_cache=False), args.repeat),
+            timed("Columnar load (cached)", lambda: load_table(csv_path, SCHEMA), args.repeat),
+            timed("Single-pass aggregation (4 cubes)", lambda: aggregate(table, CUBES, weights=weights), args.repeat),
+        ]
+
+        # Both approaches must agree before their timings mean anything
+        legacy = results[0][2]
+        cubes = results[3][2]
+        assert dict(legacy[0]) == cubes['domain'].series()
+        assert dict(legacy[2]) == cubes['deliverable'].series()
+        for domain, expertise in legacy[1].items():
+            for level, total in expertise.items():
+                assert cubes['domain_expertise'].nested()[domain][level] == total
+
+        _, baseline, _ = results[0]
+        _, cached_load, _ = results[2]
+        _, aggregation, _ = results[3]
+
+        width = max(len(label) for label, _, _ in results)
+        for label, seconds, _ in results:
+            print(f"   {label:<{width}}  {seconds * 1000:10.1f} ms")
+
+        print(f"\n✓ Cached load + aggregation: {(cached_load + aggregation) * 1000:.1f} ms "
+              f"({baseline / (cached_load + aggregation):.0f}x faster than row-by-row)")
+
+
+if __name__ == '__main__':
+    main()
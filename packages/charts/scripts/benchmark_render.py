@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Render Benchmark
+
+Builds every chart of bmw-work.py and segmentation-incidents.py from the
+current CSVs and reports, per chart and output profile, the time spent saving
+the figure and the size of the file. Also compares writing all profiles from
+one figure build with building the figure again for each profile.
+
+Usage: python benchmark_render.py [--profile print --profile svg ...] [--repeat 3]
+"""
+
+import argparse
+import importlib.util
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+
+from chart_render import PROFILES, output_path_for, save_figure
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+def load_script(filename: str):
+    """Import a chart script by file name (they are not valid module names)."""
+    spec = importlib.util.spec_from_file_location(Path(filename).stem.replace('-', '_'), SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def chart_specs():
+    """Build the chart specs of both scripts from their CSVs."""
+    bmw = load_script('bmw-work.py')
+    incidents = load_script('segmentation-incidents.py')
+
+    for module in (bmw, incidents):
+        if not module.CSV_PATH.exists():
+            print(f"Error: CSV not found: {module.CSV_PATH}", file=sys.stderr)
+            sys.exit(1)
+
+    return [
+        *bmw.chart_specs(*bmw.aggregate_work(bmw.read_work_data())),
+        *incidents.chart_specs(*incidents.group_by_impact(incidents.read_incidents())),
+    ]
+
+
+def best_of(fn, repeat):
+    """Run fn repeat times and return (best seconds, last result)."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_chart(spec, profiles, repeat):
+    """Return (build seconds, {profile: (save seconds, bytes)}) for one chart."""
+    def build():
+        plt.close('all')
+        return spec.render(spec.data)
+
+    build_seconds, fig = best_of(build, repeat)
+
+    results = {}
+    for profile in profiles:
+        path = output_path_for(spec, profile)
+        save_seconds, _ = best_of(lambda: save_figure(fig, path, profile), repeat)
+        results[profile] = (save_seconds, path.stat().st_size)
+
+    plt.close('all')
+    return build_seconds, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chart render time and file size per output profile")
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=list(PROFILES),
+        help="Profile to benchmark; repeat for several (default: all)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    profiles = list(dict.fromkeys(args.profile or PROFILES))
+    specs = chart_specs()
+
+    print(f"📊 Benchmarking {len(specs)} charts x {len(profiles)} profiles (best of {args.repeat})\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        totals = {profile: [0.0, 0] for profile in profiles}
+        total_build = 0.0
+
+        for spec in specs:
+            spec = replace(spec, output_path=Path(tmp) / Path(spec.output_path).name)
+            build_seconds, results = benchmark_chart(spec, profiles, args.repeat)
+            total_build += build_seconds
+
+            print(f"{spec.name}  (figure build {build_seconds * 1000:.0f} ms)")
+            for profile, (save_seconds, size) in results.items():
+                print(f"   {profile:<12} {save_seconds * 1000:8.0f} ms {size / 1024:10.1f} KB")
+                totals[profile][0] += save_seconds
+                totals[profile][1] += size
+            print()
+
+    print("Totals per profile (save only):")
+    for profile, (save_seconds, size) in totals.items():
+        print(f"   {profile:<12} {save_seconds * 1000:8.0f} ms {size / 1024:10.1f} KB")
+
+    all_saves = sum(save_seconds for save_seconds, _ in totals.values())
+    one_build = total_build + all_saves
+    per_profile_builds = total_build * len(profiles) + all_saves
+    print(f"\n✓ All profiles from one figure build: {one_build * 1000:.0f} ms "
+          f"(vs {per_profile_builds * 1000:.0f} ms rebuilding the figure per profile)")
+
+
+if __name__ == '__main__':
+    main()
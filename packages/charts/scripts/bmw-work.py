@@ -8,12 +8,17 @@ Reads BMW work data and creates multiple visualizations:
 3. Estimation by Deliverable
 """
 
-import csv
+import argparse
 import matplotlib.pyplot as plt
 from pathlib import Path
 from collections import defaultdict
 import numpy as np
 
+from chart_aggregate import aggregate
+from chart_data import CATEGORY, INTEGER, load_table
+from chart_render import ChartSpec, add_render_arguments, run_charts
+from chart_watch import watch_charts
+
 # Paths
 REPO_ROOT = Path(__file__).parent.parent.parent.parent
 CSV_PATH = REPO_ROOT / "documents" / "charts" / "bmw-work.csv"
@@ -43,55 +48,56 @@ DOMAIN_COLORS = {
 }
 
 
-def read_work_data():
-    """Read work data from CSV file."""
-    work_items = []
-    with open(CSV_PATH, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            row['Estimation'] = int(row['Estimation'])
-            work_items.append(row)
-    return work_items
-
-
-def group_by_domain(work_items):
-    """Group estimation by domain."""
-    domain_totals = defaultdict(int)
-    for item in work_items:
-        domain_totals[item['Domain']] += item['Estimation']
-    return dict(sorted(domain_totals.items(), key=lambda x: x[1], reverse=True))
-
-
-def group_by_domain_and_expertise(work_items):
-    """Group estimation by domain and expertise."""
-    # Structure: {domain: {expertise: total}}
-    domain_expertise = defaultdict(lambda: defaultdict(int))
-    for item in work_items:
-        domain_expertise[item['Domain']][item['Expertise']] += item['Estimation']
-    return domain_expertise
-
-
-def group_by_deliverable(work_items):
-    """Group estimation by deliverable."""
-    deliverable_totals = defaultdict(int)
-    for item in work_items:
-        deliverable_totals[item['Deliverable']] += item['Estimation']
-    return dict(sorted(deliverable_totals.items(), key=lambda x: x[1], reverse=True))
-
-
-def group_by_deliverable_and_domain(work_items):
-    """Group estimation by deliverable and domain."""
-    # Structure: {deliverable: {domain: total}}
-    deliverable_domain = defaultdict(lambda: defaultdict(int))
-    for item in work_items:
-        deliverable_domain[item['Deliverable']][item['Domain']] += item['Estimation']
-    return deliverable_domain
+# CSV columns and their types
+WORK_SCHEMA = {
+    'Domain': CATEGORY,
+    'Expertise': CATEGORY,
+    'Deliverable': CATEGORY,
+    'Estimation': INTEGER,
+}
 
 
-def create_domain_chart(domain_totals):
-    """Create and save the estimation by domain chart."""
-    domains = list(domain_totals.keys())
-    estimations = list(domain_totals.values())
+def read_work_data():
+    """Read work data from CSV file as columns (cached between runs)."""
+    return load_table(CSV_PATH, WORK_SCHEMA)
+
+
+def aggregate_work(work_items):
+    """
+    Group estimation by domain, domain/expertise, deliverable and
+    deliverable/domain in a single pass over the work items.
+    """
+    cubes = aggregate(
+        work_items,
+        {
+            'domain': ('Domain',),
+            'domain_expertise': ('Domain', 'Expertise'),
+            'deliverable': ('Deliverable',),
+            'deliverable_domain': ('Deliverable', 'Domain'),
+        },
+        weights=work_items['Estimation'],
+    )
+
+    def by_total(series):
+        return dict(sorted(series.items(), key=lambda x: x[1], reverse=True))
+
+    return (
+        by_total(cubes['domain'].series()),
+        cubes['domain_expertise'].nested(),
+        by_total(cubes['deliverable'].series()),
+        cubes['deliverable_domain'].nested(),
+    )
+
+
+def domain_data(domain_totals):
+    """Build the domain chart data: total estimation per domain."""
+    return {'domains': list(domain_totals.keys()), 'estimations': list(domain_totals.values())}
+
+
+def render_domain_chart(data):
+    """Render the estimation by domain chart and return the figure."""
+    domains = data['domains']
+    estimations = data['estimations']
 
     fig, ax = plt.subplots(figsize=(12, 7))
 
@@ -117,19 +123,20 @@ def create_domain_chart(domain_totals):
     ax.set_ylim(0, max_val + max_val * 0.1)
 
     plt.tight_layout()
-    plt.savefig(OUTPUT_PATH_DOMAIN, dpi=300, bbox_inches='tight')
-    print(f"✓ Domain chart saved to: {OUTPUT_PATH_DOMAIN}")
+    return fig
+
 
-    # Statistics
-    total = sum(estimations)
+def print_domain_statistics(data):
+    """Print statistics for the domain chart."""
+    total = sum(data['estimations'])
     print(f"\n📊 Domain Statistics:")
     print(f"   Total estimation: {total} team weeks")
-    for domain, est in domain_totals.items():
+    for domain, est in zip(data['domains'], data['estimations']):
         print(f"   {domain}: {est} team weeks ({est/total*100:.1f}%)")
 
 
-def create_domain_expertise_chart(domain_expertise):
-    """Create and save the estimation by domain stacked by expertise chart."""
+def domain_expertise_data(domain_expertise):
+    """Build the domain/expertise chart data: estimation per domain, stacked by expertise."""
     # Sort domains by total estimation
     domain_totals = {
         domain: sum(expertise.values())
@@ -137,6 +144,20 @@ def create_domain_expertise_chart(domain_expertise):
     }
     domains = sorted(domain_totals.keys(), key=lambda x: domain_totals[x], reverse=True)
 
+    return {
+        'domains': domains,
+        'stacks': {
+            expertise: [domain_expertise[domain].get(expertise, 0) for domain in domains]
+            for expertise in EXPERTISE_ORDER
+        },
+        'totals': [domain_totals[domain] for domain in domains],
+    }
+
+
+def render_domain_expertise_chart(data):
+    """Render the estimation by domain stacked by expertise chart and return the figure."""
+    domains = data['domains']
+
     fig, ax = plt.subplots(figsize=(12, 7))
 
     x = np.arange(len(domains))
@@ -147,7 +168,7 @@ def create_domain_expertise_chart(domain_expertise):
     bars_dict = {}
 
     for expertise in EXPERTISE_ORDER:
-        values = [domain_expertise[domain].get(expertise, 0) for domain in domains]
+        values = data['stacks'][expertise]
         config = EXPERTISE_CONFIG[expertise]
         bars_dict[expertise] = ax.bar(x, values, width, bottom=bottom,
                                        label=config['label'], color=config['color'], alpha=0.9)
@@ -166,7 +187,7 @@ def create_domain_expertise_chart(domain_expertise):
     ax.legend(loc='upper right', fontsize=9, framealpha=0.95)
 
     # Add total labels on top of bars
-    totals = [domain_totals[domain] for domain in domains]
+    totals = data['totals']
     for i, total in enumerate(totals):
         ax.text(i, total + 0.3, str(total), ha='center', va='bottom', fontsize=10, fontweight='bold')
 
@@ -174,23 +195,29 @@ def create_domain_expertise_chart(domain_expertise):
     ax.set_ylim(0, max_val + max_val * 0.1)
 
     plt.tight_layout()
-    plt.savefig(OUTPUT_PATH_DOMAIN_EXPERTISE, dpi=300, bbox_inches='tight')
-    print(f"✓ Domain/Expertise chart saved to: {OUTPUT_PATH_DOMAIN_EXPERTISE}")
+    return fig
+
 
-    # Statistics
+def print_domain_expertise_statistics(data):
+    """Print statistics for the domain/expertise chart."""
     print(f"\n📊 Domain/Expertise Statistics:")
-    total = sum(totals)
+    total = sum(data['totals'])
     print(f"   Total estimation: {total} team weeks")
     for expertise in EXPERTISE_ORDER:
-        exp_total = sum(domain_expertise[d].get(expertise, 0) for d in domains)
+        exp_total = sum(data['stacks'][expertise])
         if exp_total > 0:
             print(f"   {expertise}: {exp_total} team weeks ({exp_total/total*100:.1f}%)")
 
 
-def create_deliverable_chart(deliverable_totals):
-    """Create and save the estimation by deliverable chart."""
-    deliverables = list(deliverable_totals.keys())
-    estimations = list(deliverable_totals.values())
+def deliverable_data(deliverable_totals):
+    """Build the deliverable chart data: total estimation per deliverable."""
+    return {'deliverables': list(deliverable_totals.keys()), 'estimations': list(deliverable_totals.values())}
+
+
+def render_deliverable_chart(data):
+    """Render the estimation by deliverable chart and return the figure."""
+    deliverables = data['deliverables']
+    estimations = data['estimations']
 
     fig, ax = plt.subplots(figsize=(14, 7))
 
@@ -216,19 +243,20 @@ def create_deliverable_chart(deliverable_totals):
     ax.set_ylim(0, max_val + max_val * 0.1)
 
     plt.tight_layout()
-    plt.savefig(OUTPUT_PATH_DELIVERABLE, dpi=300, bbox_inches='tight')
-    print(f"✓ Deliverable chart saved to: {OUTPUT_PATH_DELIVERABLE}")
+    return fig
 
-    # Statistics
-    total = sum(estimations)
+
+def print_deliverable_statistics(data):
+    """Print statistics for the deliverable chart."""
+    total = sum(data['estimations'])
     print(f"\n📊 Deliverable Statistics:")
     print(f"   Total estimation: {total} team weeks")
-    for deliverable, est in deliverable_totals.items():
+    for deliverable, est in zip(data['deliverables'], data['estimations']):
         print(f"   {deliverable}: {est} team weeks ({est/total*100:.1f}%)")
 
 
-def create_deliverable_domain_chart(deliverable_domain):
-    """Create and save the estimation by deliverable stacked by domain chart."""
+def deliverable_domain_data(deliverable_domain):
+    """Build the deliverable/domain chart data: estimation per deliverable, stacked by domain."""
     # Sort deliverables by total estimation
     deliverable_totals = {
         deliverable: sum(domains.values())
@@ -247,6 +275,22 @@ def create_deliverable_domain_chart(deliverable_domain):
             domain_totals[domain] += est
     domain_order = sorted(all_domains, key=lambda x: domain_totals[x], reverse=True)
 
+    return {
+        'deliverables': deliverables,
+        'domains': domain_order,
+        'stacks': {
+            domain: [deliverable_domain[deliverable].get(domain, 0) for deliverable in deliverables]
+            for domain in domain_order
+        },
+        'totals': [deliverable_totals[deliverable] for deliverable in deliverables],
+        'domain_totals': [domain_totals[domain] for domain in domain_order],
+    }
+
+
+def render_deliverable_domain_chart(data):
+    """Render the estimation by deliverable stacked by domain chart and return the figure."""
+    deliverables = data['deliverables']
+
     fig, ax = plt.subplots(figsize=(14, 7))
 
     x = np.arange(len(deliverables))
@@ -255,8 +299,8 @@ def create_deliverable_domain_chart(deliverable_domain):
     # Create stacked bars
     bottom = np.zeros(len(deliverables))
 
-    for domain in domain_order:
-        values = [deliverable_domain[deliverable].get(domain, 0) for deliverable in deliverables]
+    for domain in data['domains']:
+        values = data['stacks'][domain]
         color = DOMAIN_COLORS.get(domain, '#6b7280')
         ax.bar(x, values, width, bottom=bottom, label=domain, color=color, alpha=0.9)
         bottom += np.array(values)
@@ -274,7 +318,7 @@ def create_deliverable_domain_chart(deliverable_domain):
     ax.legend(loc='upper right', fontsize=9, framealpha=0.95)
 
     # Add total labels on top of bars
-    totals = [deliverable_totals[deliverable] for deliverable in deliverables]
+    totals = data['totals']
     for i, total in enumerate(totals):
         ax.text(i, total + 0.3, str(total), ha='center', va='bottom', fontsize=10, fontweight='bold')
 
@@ -282,47 +326,92 @@ def create_deliverable_domain_chart(deliverable_domain):
     ax.set_ylim(0, max_val + max_val * 0.1)
 
     plt.tight_layout()
-    plt.savefig(OUTPUT_PATH_DELIVERABLE_DOMAIN, dpi=300, bbox_inches='tight')
-    print(f"✓ Deliverable/Domain chart saved to: {OUTPUT_PATH_DELIVERABLE_DOMAIN}")
+    return fig
+
 
-    # Statistics
+def print_deliverable_domain_statistics(data):
+    """Print statistics for the deliverable/domain chart."""
     print(f"\n📊 Deliverable/Domain Statistics:")
-    total = sum(totals)
+    total = sum(data['totals'])
     print(f"   Total estimation: {total} team weeks")
-    for domain in domain_order:
-        dom_total = domain_totals[domain]
+    for domain, dom_total in zip(data['domains'], data['domain_totals']):
         print(f"   {domain}: {dom_total} team weeks ({dom_total/total*100:.1f}%)")
 
 
-def main():
+def chart_specs(domain_totals, domain_expertise, deliverable_totals, deliverable_domain):
+    """Build the specs for every chart from the precomputed aggregates."""
+    return [
+        ChartSpec(
+            name='domain',
+            heading="📈 Creating domain chart...",
+            label='Domain',
+            render=render_domain_chart,
+            statistics=print_domain_statistics,
+            data=domain_data(domain_totals),
+            output_path=OUTPUT_PATH_DOMAIN,
+        ),
+        ChartSpec(
+            name='domain-expertise',
+            heading="📊 Creating domain/expertise stacked chart...",
+            label='Domain/Expertise',
+            render=render_domain_expertise_chart,
+            statistics=print_domain_expertise_statistics,
+            data=domain_expertise_data(domain_expertise),
+            output_path=OUTPUT_PATH_DOMAIN_EXPERTISE,
+            config={'expertise': EXPERTISE_CONFIG, 'order': EXPERTISE_ORDER},
+        ),
+        ChartSpec(
+            name='deliverable',
+            heading="📊 Creating deliverable chart...",
+            label='Deliverable',
+            render=render_deliverable_chart,
+            statistics=print_deliverable_statistics,
+            data=deliverable_data(deliverable_totals),
+            output_path=OUTPUT_PATH_DELIVERABLE,
+        ),
+        ChartSpec(
+            name='deliverable-domain',
+            heading="📊 Creating deliverable/domain stacked chart...",
+            label='Deliverable/Domain',
+            render=render_deliverable_domain_chart,
+            statistics=print_deliverable_domain_statistics,
+            data=deliverable_domain_data(deliverable_domain),
+            output_path=OUTPUT_PATH_DELIVERABLE_DOMAIN,
+            config={'domain_colors': DOMAIN_COLORS},
+        ),
+    ]
+
+
+def generate_charts(args, pool=None):
+    """Load, group and render all charts. Returns {chart name: render seconds} for rendered charts."""
     print("📊 Generating BMW Work Charts...\n")
 
     # Read data
     work_items = read_work_data()
-    print(f"✓ Read {len(work_items)} work items from CSV")
+    print(f"✓ Read {len(work_items['Estimation'])} work items from CSV")
 
     # Group data
-    domain_totals = group_by_domain(work_items)
-    domain_expertise = group_by_domain_and_expertise(work_items)
-    deliverable_totals = group_by_deliverable(work_items)
-    deliverable_domain = group_by_deliverable_and_domain(work_items)
+    domain_totals, domain_expertise, deliverable_totals, deliverable_domain = aggregate_work(work_items)
 
     print(f"✓ Grouped data by domain, expertise, and deliverable\n")
 
     # Create charts
-    print("📈 Creating domain chart...")
-    create_domain_chart(domain_totals)
-
-    print("\n📊 Creating domain/expertise stacked chart...")
-    create_domain_expertise_chart(domain_expertise)
+    durations = run_charts(chart_specs(domain_totals, domain_expertise, deliverable_totals, deliverable_domain),
+                           args.workers, CSV_PATH, args.force, pool, args.profile)
 
-    print("\n📊 Creating deliverable chart...")
-    create_deliverable_chart(deliverable_totals)
+    print("\n✅ All charts generated successfully!")
+    return durations
 
-    print("\n📊 Creating deliverable/domain stacked chart...")
-    create_deliverable_domain_chart(deliverable_domain)
 
-    print("\n✅ All charts generated successfully!")
+def main():
+    parser = argparse.ArgumentParser(description="Generate BMW work charts")
+    add_render_arguments(parser)
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_charts([CSV_PATH], lambda pool: generate_charts(args, pool), args.workers)
+    else:
+        generate_charts(args)
 
 
 if __name__ == '__main__':
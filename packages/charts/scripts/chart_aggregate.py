@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Single-pass group-by aggregation shared by the chart scripts.
+
+All requested group-by cubes are derived from one joint cube over the union of
+their dimensions, which is computed with a single bincount over the combined
+categorical codes. Charts then take roll-ups or slices of the cubes instead of
+walking the rows again.
+
+Timestamps are grouped by day, and day cubes are rebucketed into weeks,
+months, quarters or years with datetime64 arithmetic, so any number of time
+granularities can be charted from one pass over the rows.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from math import prod
+
+import numpy as np
+
+from chart_data import Categorical
+
+
+@dataclass
+class Cube:
+    """Aggregated values over one or more categorical dimensions."""
+    dims: tuple
+    labels: dict
+    values: np.ndarray
+
+    def sum(self, *dims):
+        """Roll up to the given dimensions, summing over the others."""
+        drop = tuple(i for i, dim in enumerate(self.dims) if dim not in dims)
+        kept = tuple(dim for dim in self.dims if dim in dims)
+        values = self.values.sum(axis=drop) if drop else self.values
+        cube = Cube(kept, {dim: self.labels[dim] for dim in kept}, values)
+        return cube.transpose(*dims)
+
+    def transpose(self, *dims):
+        """Reorder the dimensions."""
+        axes = [self.dims.index(dim) for dim in dims]
+        return Cube(tuple(dims), self.labels, self.values.transpose(axes))
+
+    def select(self, dim, label):
+        """Slice out one label of a dimension, dropping that dimension."""
+        axis = self.dims.index(dim)
+        index = list(self.labels[dim]).index(label)
+        kept = tuple(d for d in self.dims if d != dim)
+        return Cube(kept, {d: self.labels[d] for d in kept}, np.take(self.values, index, axis=axis))
+
+    def series(self):
+        """A 1-dimensional cube as {label: value}, in label order."""
+        (dim,) = self.dims
+        return {str(label): value.item() for label, value in zip(self.labels[dim], self.values)}
+
+    def nested(self):
+        """A 2-dimensional cube as {outer label: {inner label: value}}, in label order."""
+        outer, inner = self.dims
+        return {
+            str(outer_label): {str(inner_label): value.item() for inner_label, value in zip(self.labels[inner], row)}
+            for outer_label, row in zip(self.labels[outer], self.values)
+        }
+
+
+def aggregate(dimensions: dict, cubes: dict, weights=None, mask=None):
+    """
+    Compute several group-by cubes in one pass over the rows.
+
+    dimensions maps dimension names to Categorical columns, cubes maps cube
+    names to tuples of dimension names, and weights (optional) are summed per
+    group; without weights rows are counted. Rows where mask is False, or where
+    any dimension has a negative code, are skipped.
+
+    Labels that never occur in the selected rows are dropped, and the remaining
+    labels are ordered by first appearance in the data (the iteration order of a
+    dict filled row by row).
+    """
+    names = list(dict.fromkeys(dim for dims in cubes.values() for dim in dims))
+    columns = [dimensions[name] for name in names]
+
+    keep = np.ones(len(columns[0]), dtype=bool) if mask is None else np.asarray(mask, dtype=bool).copy()
+    for column in columns:
+        keep &= column.codes >= 0
+
+    codes = [column.codes[keep] for column in columns]
+    shape = tuple(len(column.categories) for column in columns)
+    flat = np.ravel_multi_index(codes, shape) if codes[0].size else np.zeros(0, dtype=np.intp)
+
+    if weights is None:
+        values = np.bincount(flat, minlength=prod(shape))
+    else:
+        weights = np.asarray(weights)[keep]
+        values = np.bincount(flat, weights=weights, minlength=prod(shape))
+        if np.issubdtype(weights.dtype, np.integer):
+            values = np.rint(values).astype(np.int64)
+    values = values.reshape(shape)
+
+    # Keep only labels that occur, in order of first appearance
+    row_numbers = np.arange(len(flat))
+    orders = []
+    for dim_codes, size in zip(codes, shape):
+        first_index = np.full(size, len(flat))
+        np.minimum.at(first_index, dim_codes, row_numbers)
+        present = np.flatnonzero(first_index < len(flat))
+        orders.append(present[np.argsort(first_index[present], kind='stable')])
+
+    joint = Cube(
+        tuple(names),
+        {name: column.categories[order] for name, column, order in zip(names, columns, orders)},
+        values[np.ix_(*orders)],
+    )
+
+    return {cube_name: joint.sum(*dims) for cube_name, dims in cubes.items()}
+
+
+# Time bucket sizes understood by rebucket()
+BUCKETS = ('week', 'month', 'quarter', 'year')
+
+
+def day_column(times):
+    """Categorical of calendar days for datetime64 values (code -1 for NaT)."""
+    days = times.astype('datetime64[D]')
+    valid = ~np.isnat(days)
+    if not valid.any():
+        return Categorical(np.full(len(days), -1, dtype=np.int32), np.array([], dtype='datetime64[D]'))
+
+    ordinals = days.astype(np.int64)
+    first, last = ordinals[valid].min(), ordinals[valid].max()
+    codes = np.where(valid, ordinals - first, -1).astype(np.int32)
+    return Categorical(codes, np.arange(first, last + 1).astype('datetime64[D]'))
+
+
+def bucket_ordinals(days, bucket: str):
+    """Number each datetime64[D] value by its bucket (consecutive buckets get consecutive numbers)."""
+    if bucket == 'week':
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        return (days.astype('datetime64[D]').astype(np.int64) + 3) // 7
+    if bucket == 'month':
+        return days.astype('datetime64[M]').astype(np.int64)
+    if bucket == 'quarter':
+        return days.astype('datetime64[M]').astype(np.int64) // 3
+    if bucket == 'year':
+        return days.astype('datetime64[Y]').astype(np.int64)
+    raise ValueError(f"Unknown time bucket: {bucket} (expected one of: {', '.join(BUCKETS)})")
+
+
+def bucket_label(ordinal: int, bucket: str) -> str:
+    """Label a bucket number, e.g. '2024-W14', '2024-04', '2024-Q2' or '2024'."""
+    ordinal = int(ordinal)
+    if bucket == 'week':
+        monday = np.datetime64(ordinal * 7 - 3, 'D').astype(date)
+        year, week, _ = monday.isocalendar()
+        return f"{year}-W{week:02d}"
+    if bucket == 'month':
+        return str(np.datetime64(ordinal, 'M'))
+    if bucket == 'quarter':
+        return f"{ordinal // 4 + 1970}-Q{ordinal % 4 + 1}"
+    if bucket == 'year':
+        return str(ordinal + 1970)
+    raise ValueError(f"Unknown time bucket: {bucket} (expected one of: {', '.join(BUCKETS)})")
+
+
+def rebucket(cube: Cube, dim: str, bucket: str, start=None, end=None):
+    """
+    Sum a cube's day dimension into time buckets from start to end (inclusive).
+
+    start and end are dates (datetime64 or ISO strings) and default to the
+    first and last day in the cube. Every bucket in the range is present in the
+    result, with zeros where no rows fell; days outside the range are dropped.
+    """
+    days = np.asarray(cube.labels[dim]).astype('datetime64[D]')
+    ordinals = bucket_ordinals(days, bucket)
+
+    def bound(value, default):
+        if value is not None:
+            return int(bucket_ordinals(np.datetime64(value, 'D'), bucket))
+        return int(default(ordinals)) if ordinals.size else None
+
+    first = bound(start, np.min)
+    last = bound(end, np.max)
+    if first is None or last is None:
+        # No data to default the missing bound from: use the other one, or an empty range
+        first = last = first if first is not None else last
+    if first is None:
+        first, last = 0, -1
+    size = max(last - first + 1, 0)
+
+    axis = cube.dims.index(dim)
+    index = ordinals - first
+    inside = (index >= 0) & (index < size)
+
+    shape = list(cube.values.shape)
+    shape[axis] = size
+    values = np.zeros(shape, dtype=cube.values.dtype)
+    np.add.at(
+        np.moveaxis(values, axis, 0),
+        index[inside],
+        np.moveaxis(cube.values, axis, 0)[inside],
+    )
+
+    labels = dict(cube.labels)
+    labels[dim] = np.array([bucket_label(ordinal, bucket) for ordinal in range(first, first + size)], dtype=str)
+    return Cube(cube.dims, labels, values)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Columnar CSV loader shared by the chart scripts.
+
+Reads a CSV into NumPy arrays according to a column schema and caches the
+parsed result next to the CSV, so repeated chart runs skip parsing entirely
+until the CSV changes.
+"""
+
+import csv
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+# Column types understood by load_table()
+DATETIME = 'datetime'
+CATEGORY = 'category'
+INTEGER = 'integer'
+STRING = 'string'
+
+CACHE_DIR_NAME = '.cache'
+CACHE_VERSION = 1
+
+
+@dataclass
+class Categorical:
+    """A string column stored as integer codes into a sorted array of categories."""
+    codes: np.ndarray
+    categories: np.ndarray
+
+    def __len__(self):
+        return len(self.codes)
+
+    def values(self):
+        """Decode back to an array of strings."""
+        return self.categories[self.codes]
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_column(values, column_type):
+    """Convert a list of CSV strings into a NumPy column."""
+    if column_type == CATEGORY:
+        # Factorize with a dict (much cheaper than sorting strings), then
+        # renumber so codes index into sorted categories
+        lookup = {}
+        codes = np.fromiter((lookup.setdefault(value.strip(), len(lookup)) for value in values),
+                            dtype=np.int32, count=len(values))
+        categories = np.array(sorted(lookup), dtype=str)
+        renumber = np.empty(len(lookup), dtype=np.int32)
+        renumber[[lookup[category] for category in categories.tolist()]] = np.arange(len(lookup), dtype=np.int32)
+        return Categorical(renumber[codes], categories)
+
+    raw = np.array(values, dtype=str)
+
+    if column_type == DATETIME:
+        # Timestamps are ISO 8601 in UTC; numpy does not accept the 'Z' suffix
+        return np.char.rstrip(raw, 'Z').astype('datetime64[s]')
+    if column_type == INTEGER:
+        return raw.astype(np.int64)
+    return raw
+
+
+def parse_csv(csv_path: Path, schema: dict):
+    """Parse the schema's columns from a CSV file."""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        try:
+            header = next(reader, [])
+            rows = []
+            for row in reader:
+                # Blank lines are skipped, as csv.DictReader does
+                if not row:
+                    continue
+                if len(row) != len(header):
+                    raise ValueError(f"{csv_path.name} line {reader.line_num} has {len(row)} fields, "
+                                     f"expected {len(header)}")
+                rows.append(row)
+        except csv.Error as e:
+            raise ValueError(f"{csv_path.name} line {reader.line_num}: {e}") from e
+
+    missing = [name for name in schema if name not in header]
+    if missing:
+        raise ValueError(f"{csv_path.name} is missing columns: {', '.join(missing)}")
+
+    columns = list(zip(*rows)) if rows else [()] * len(header)
+    return {
+        name: parse_column(list(columns[header.index(name)]), column_type)
+        for name, column_type in schema.items()
+    }
+
+
+def cache_path_for(csv_path: Path) -> Path:
+    return csv_path.parent / CACHE_DIR_NAME / f"{csv_path.stem}.npz"
+
+
+def write_cache(path: Path, table: dict, key: dict):
+    """Write the table as an uncompressed .npz archive (one array per column)."""
+    arrays = {'__key__': np.array(json.dumps(key))}
+    for name, column in table.items():
+        if isinstance(column, Categorical):
+            arrays[f"{name}::codes"] = column.codes
+            arrays[f"{name}::categories"] = column.categories
+        else:
+            arrays[name] = column
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp.npz')
+    np.savez(tmp_path, **arrays)
+    tmp_path.replace(path)
+
+
+def read_cache(path: Path):
+    """Read a cached table. Returns (table, key) or (None, None) if unusable."""
+    try:
+        with np.load(path, allow_pickle=False) as archive:
+            key = json.loads(str(archive['__key__']))
+            table = {}
+            for name in archive.files:
+                if name == '__key__' or name.endswith('::categories'):
+                    continue
+                if name.endswith('::codes'):
+                    column = name[:-len('::codes')]
+                    table[column] = Categorical(archive[name], archive[f"{column}::categories"])
+                else:
+                    table[name] = archive[name]
+        return table, key
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+
+def load_table(csv_path: Path, schema: dict, use_cache: bool = True):
+    """
+    Load the schema's columns from a CSV as NumPy arrays.
+
+    schema maps column names to DATETIME, CATEGORY, INTEGER or STRING.
+    The parsed table is cached and reused while the CSV's mtime and size are
+    unchanged; if they changed but the content hash did not, the cache is
+    still reused and its key refreshed.
+    """
+    csv_path = Path(csv_path)
+    stat = csv_path.stat()
+    key = {
+        'version': CACHE_VERSION,
+        'schema': schema,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+    }
+
+    if not use_cache:
+        return parse_csv(csv_path, schema)
+
+    cache_path = cache_path_for(csv_path)
+    cached, cached_key = read_cache(cache_path) if cache_path.exists() else (None, None)
+
+    if cached is not None:
+        same_schema = cached_key.get('version') == CACHE_VERSION and cached_key.get('schema') == schema
+        if same_schema and cached_key.get('mtime_ns') == stat.st_mtime_ns and cached_key.get('size') == stat.st_size:
+            return cached
+
+    key['sha256'] = file_sha256(csv_path)
+
+    if cached is not None and same_schema and cached_key.get('sha256') == key['sha256']:
+        # Touched but not modified: refresh the key so the next run takes the fast path
+        write_cache(cache_path, cached, key)
+        return cached
+
+    table = parse_csv(csv_path, schema)
+    write_cache(cache_path, table, key)
+    return table
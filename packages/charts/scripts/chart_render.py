@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Chart render scheduler shared by the chart scripts.
+
+Each chart is described by a ChartSpec holding the plain data it needs
+(precomputed from the aggregates), a module-level render function that builds
+the figure, and its output path. Each figure is built once and saved in every
+selected output profile (print PNG, screen PNG/WebP, SVG, thumbnail). Specs
+are rendered concurrently in a process pool on the headless Agg backend, and
+their messages and statistics are printed afterwards in spec order so the
+console output stays deterministic.
+
+A manifest next to the CSV cache records, per chart, the hashes of the input
+CSV, the chart definition, the plotted data and the rendered file, so charts
+whose inputs have not changed are skipped on the next run. When the CSV changes,
+only charts whose plotted data changed are rendered again.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+import matplotlib
+
+# Charts are only written to files; never start a GUI backend
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from chart_data import CACHE_DIR_NAME, file_sha256  # noqa: E402
+
+MANIFEST_VERSION = 3
+
+# Output profiles: file name suffix (replacing '.png' in the chart's output
+# path) and savefig options. 'print' is the chart's original output.
+PROFILES = {
+    'print': {'suffix': '.png', 'format': 'png', 'dpi': 300},
+    'screen': {'suffix': '.screen.png', 'format': 'png', 'dpi': 100},
+    'screen-webp': {'suffix': '.screen.webp', 'format': 'webp', 'dpi': 100},
+    'svg': {'suffix': '.svg', 'format': 'svg', 'metadata': {'Date': None}},
+    'thumbnail': {'suffix': '.thumb.png', 'format': 'png', 'dpi': 30},
+}
+DEFAULT_PROFILES = ('print',)
+
+# Stable SVG element ids, so unchanged charts produce identical files
+plt.rcParams['svg.hashsalt'] = 'chart_render'
+
+
+@dataclass
+class ChartSpec:
+    """Everything needed to render one chart and report on it."""
+    name: str
+    heading: str
+    label: str
+    render: object
+    statistics: object
+    data: dict
+    output_path: Path
+    # Chart settings that live outside the render function (colors, order, labels, date range)
+    config: dict = field(default_factory=dict)
+
+
+def output_path_for(spec: ChartSpec, profile: str) -> Path:
+    """Where a chart is saved in the given output profile."""
+    output_path = Path(spec.output_path)
+    return output_path.with_name(output_path.stem + PROFILES[profile]['suffix'])
+
+
+def save_figure(fig, path: Path, profile: str):
+    options = {key: value for key, value in PROFILES[profile].items() if key != 'suffix'}
+    fig.savefig(path, bbox_inches='tight', **options)
+
+
+def render_spec(spec: ChartSpec, profiles=DEFAULT_PROFILES) -> float:
+    """Build one chart's figure, save it in every profile and return the time it took in seconds."""
+    start = time.perf_counter()
+    try:
+        fig = spec.render(spec.data)
+        for profile in profiles:
+            save_figure(fig, output_path_for(spec, profile), profile)
+    finally:
+        plt.close('all')
+    return time.perf_counter() - start
+
+
+def render_workers(workers: int = None) -> int:
+    """Resolve the --workers option: one per CPU by default."""
+    return max(1, workers or os.cpu_count() or 1)
+
+
+def render_charts(specs, workers: int = None, pool: ProcessPoolExecutor = None, profiles=DEFAULT_PROFILES):
+    """
+    Render chart specs, in a process pool when more than one worker is used.
+
+    A long-lived pool can be passed in (watch mode) so its workers keep
+    matplotlib imported between runs. Returns the render time in seconds for
+    each spec, in spec order.
+    """
+    if not specs:
+        return []
+
+    render = partial(render_spec, profiles=tuple(profiles))
+
+    if pool is not None and len(specs) > 1:
+        return list(pool.map(render, specs))
+
+    workers = min(len(specs), render_workers(workers))
+    if pool is not None or workers == 1:
+        return [render(spec) for spec in specs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render, specs))
+
+
+def manifest_path_for(csv_path: Path) -> Path:
+    return csv_path.parent / CACHE_DIR_NAME / f"{csv_path.stem}.manifest.json"
+
+
+def read_manifest(path: Path) -> dict:
+    """Read a render manifest. Returns an empty manifest if missing or unusable."""
+    try:
+        manifest = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('charts', {})
+
+
+def write_manifest(path: Path, charts: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps({'version': MANIFEST_VERSION, 'charts': charts}, indent=2, sort_keys=True) + '\n',
+                        encoding='utf-8')
+    tmp_path.replace(path)
+
+
+def json_hash(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def chart_hashes(spec: ChartSpec) -> dict:
+    """Hash the chart definition (config and render function source) and its plotted data."""
+    return {
+        'config': json_hash({'config': spec.config, 'render': inspect.getsource(spec.render)}),
+        'data': json_hash(spec.data),
+    }
+
+
+def output_hashes(spec: ChartSpec, profiles) -> dict:
+    """Hash the chart's file in each profile ({file name: sha256}, None if missing)."""
+    hashes = {}
+    for profile in profiles:
+        path = output_path_for(spec, profile)
+        hashes[path.name] = file_sha256(path) if path.exists() else None
+    return hashes
+
+
+def is_up_to_date(spec: ChartSpec, entry: dict, input_hash: str, hashes: dict, profiles) -> bool:
+    """
+    Whether the chart's definition and outputs (in every selected profile)
+    still match the manifest, and either the input CSV or (after an edit
+    elsewhere in the CSV) the chart's plotted data is unchanged.
+    """
+    if not entry or entry.get('config') != hashes['config']:
+        return False
+    if entry.get('input') != input_hash and entry.get('data') != hashes['data']:
+        return False
+    recorded = entry.get('outputs', {})
+    return all(
+        sha256 is not None and recorded.get(name) == sha256
+        for name, sha256 in output_hashes(spec, profiles).items()
+    )
+
+
+def run_charts(specs, workers: int = None, input_path: Path = None, force: bool = False,
+               pool: ProcessPoolExecutor = None, profiles=DEFAULT_PROFILES):
+    """
+    Render chart specs in the given output profiles, then print each chart's
+    result and statistics in spec order.
+
+    With input_path (the CSV the charts are built from), charts whose
+    definition, data and outputs are unchanged since the last run are skipped
+    unless force is set. Returns {chart name: render seconds} for the rendered
+    charts.
+    """
+    profiles = list(dict.fromkeys(profiles or DEFAULT_PROFILES))
+    stale = list(specs)
+    manifest = {}
+    hashes = {}
+
+    if input_path is not None:
+        manifest_path = manifest_path_for(Path(input_path))
+        manifest = read_manifest(manifest_path)
+        input_hash = file_sha256(Path(input_path))
+        hashes = {spec.name: chart_hashes(spec) for spec in specs}
+        if not force:
+            stale = [
+                spec for spec in specs
+                if not is_up_to_date(spec, manifest.get(spec.name), input_hash, hashes[spec.name], profiles)
+            ]
+
+    durations = dict(zip((spec.name for spec in stale), render_charts(stale, workers, pool, profiles)))
+
+    if input_path is not None and stale:
+        for spec in stale:
+            # Only the profiles just rendered are current; files of other profiles may be stale
+            manifest[spec.name] = {
+                'input': input_hash,
+                **hashes[spec.name],
+                'outputs': output_hashes(spec, profiles),
+            }
+        write_manifest(manifest_path, manifest)
+
+    for i, spec in enumerate(specs):
+        if i > 0:
+            print()
+        print(spec.heading)
+        for profile in profiles:
+            if spec.name in durations:
+                print(f"✓ {spec.label} chart saved to: {output_path_for(spec, profile)}")
+            else:
+                print(f"✓ {spec.label} chart up to date: {output_path_for(spec, profile)}")
+        spec.statistics(spec.data)
+
+    skipped = [spec.name for spec in specs if spec.name not in durations]
+    if skipped:
+        print(f"\n⏭️  Skipped {len(skipped)} of {len(specs)} charts (unchanged since last render): {', '.join(skipped)}")
+        print("   Use --force to re-render them")
+
+    return durations
+
+
+def add_render_arguments(parser):
+    """Add the render options shared by the chart scripts to an argparse parser."""
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of charts rendered in parallel (default: one per CPU, 1 renders in-process)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=list(PROFILES),
+        help="Output profile; repeat to write several formats from one figure build (default: print). "
+             "print: 300 dpi PNG, screen: 100 dpi PNG, screen-webp: 100 dpi WebP, svg, thumbnail: 30 dpi PNG"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every chart even if its inputs are unchanged"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay running and re-render charts whenever the input CSV changes"
+    )
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Watch mode shared by the chart scripts.
+
+Keeps the interpreter (matplotlib, NumPy, font cache) and the render workers
+resident, waits for the chart CSVs to change and regenerates the charts each
+time. On Linux the CSV directories are watched with inotify (through ctypes, so
+no extra dependency is needed); elsewhere the CSVs are polled for changes.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from chart_render import render_workers
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')
+
+# Editors and exports often write a file in several steps; wait this long for quiet
+DEBOUNCE_SECONDS = 0.2
+POLL_INTERVAL_SECONDS = 0.5
+
+
+class InotifyWatcher:
+    """Report writes and renames into the directories of the watched files."""
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.paths = {path.resolve() for path in paths}
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.directories = {}
+        for directory in {path.parent for path in self.paths}:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+            self.directories[wd] = directory
+
+    def read(self, timeout):
+        """Return the watched paths changed within timeout seconds (None blocks)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        buffer = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(buffer):
+            wd, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0').decode()
+            offset += length
+            path = self.directories.get(wd, Path()) / name
+            if path in self.paths:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback for platforms without inotify: compare mtime and size periodically."""
+
+    def __init__(self, paths):
+        self.paths = {path.resolve() for path in paths}
+        self.state = {path: self.stat(path) for path in self.paths}
+
+    @staticmethod
+    def stat(path):
+        try:
+            stat = path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def read(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                current = self.stat(path)
+                if current != self.state[path]:
+                    self.state[path] = current
+                    if current is not None:
+                        changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            remaining = POLL_INTERVAL_SECONDS if deadline is None else deadline - time.monotonic()
+            time.sleep(max(min(remaining, POLL_INTERVAL_SECONDS), 0))
+
+    def close(self):
+        pass
+
+
+def open_watcher(paths):
+    """Watch with inotify where available, otherwise poll."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths)
+
+
+def wait_for_changes(watcher):
+    """Block until a watched file changes, then collect changes until writes settle."""
+    changed = set()
+    while not changed:
+        # Events for other files in the directory (e.g. the rendered PNGs) come back empty
+        changed = watcher.read(None)
+    while True:
+        more = watcher.read(DEBOUNCE_SECONDS)
+        if not more:
+            return changed
+        changed |= more
+
+
+def print_timings(durations, total_seconds):
+    """Print the render time of each re-rendered chart and the whole regeneration."""
+    print(f"\n⏱️  Regenerated in {total_seconds * 1000:.0f} ms")
+    for name, seconds in durations.items():
+        print(f"   {name}: {seconds * 1000:.0f} ms")
+    if not durations:
+        print("   No chart data changed, nothing re-rendered")
+
+
+def watch_charts(csv_paths, generate, workers: int = None):
+    """
+    Generate the charts, then regenerate them every time one of csv_paths changes.
+
+    generate(pool) loads, aggregates and renders, returning {chart name: render
+    seconds} for the charts it rendered. Runs until interrupted.
+    """
+    csv_paths = [Path(path) for path in csv_paths]
+    watcher = open_watcher(csv_paths)
+    workers = render_workers(workers)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def regenerate():
+        start = time.perf_counter()
+        try:
+            durations = generate(pool)
+        except (OSError, ValueError, KeyError) as e:
+            # A CSV caught mid-edit: replaced while being read (OSError), ragged rows or
+            # unparsable values (ValueError from chart_data.parse_csv), or columns a chart
+            # expects but the half-saved data lacks (KeyError); keep watching and retry on the next change
+            print(f"Error: Could not regenerate charts: {e}", file=sys.stderr)
+            return
+        print_timings(durations, time.perf_counter() - start)
+
+    try:
+        regenerate()
+        names = ', '.join(path.name for path in csv_paths)
+        print(f"\n👀 Watching {names} for changes (Ctrl+C to stop)...")
+
+        while True:
+            changed = wait_for_changes(watcher)
+            print(f"\n🔄 {', '.join(sorted(path.name for path in changed))} changed\n")
+            regenerate()
+            print(f"\n👀 Watching {names} for changes...")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
@@ -3,109 +3,137 @@
 Segmentation Incidents Visualization
 
 Reads segmentation incidents data and creates a stacked bar chart showing
-the number of incidents per quarter from Q2 2024 to Q4 2025,
-separated by impact level (H, M, L).
+the number of incidents per time bucket, separated by impact level (H, M, L).
+By default the chart covers Q2 2024 to Q4 2025 in quarters; --bucket, --start
+and --end choose other bucket sizes and ranges.
+
+Usage: python segmentation-incidents.py [--bucket quarter] [--bucket month ...]
+                                        [--start 2024-04-01] [--end 2025-12-31] [--watch]
 """
 
-import csv
+import argparse
+import sys
 import matplotlib.pyplot as plt
-from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
 import numpy as np
 
+from chart_aggregate import BUCKETS, aggregate, day_column, rebucket
+from chart_data import CATEGORY, DATETIME, Categorical, load_table
+from chart_render import ChartSpec, add_render_arguments, run_charts
+from chart_watch import watch_charts
+
 # Paths
 REPO_ROOT = Path(__file__).parent.parent.parent.parent
 CSV_PATH = REPO_ROOT / "documents" / "charts" / "segmentation-incidents.csv"
 OUTPUT_PATH_TIMELINE = REPO_ROOT / "documents" / "charts" / "segmentation-incidents-timeline.png"
 OUTPUT_PATH_PRIORITY = REPO_ROOT / "documents" / "charts" / "segmentation-incidents-priority.png"
 
-def read_incidents():
-    """Read incidents from CSV file."""
-    incidents = []
-    with open(CSV_PATH, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            incidents.append(row)
-    return incidents
-
-def get_max_impact(incident):
-    """Get the maximum impact level from CL and SeSe impacts."""
-    cl_impact = incident.get('CL impact', '-').strip()
-    sese_impact = incident.get('SeSe impact', '-').strip()
+# CSV columns and their types
+INCIDENT_SCHEMA = {
+    'time': DATETIME,
+    'CL impact': CATEGORY,
+    'SeSe impact': CATEGORY,
+    'Priority': CATEGORY,
+}
+
+# Impact levels from highest to lowest
+IMPACT_LEVELS = ['H', 'M', 'L']
+
+# Default timeline: quarters from Q2 2024 to Q4 2025
+TIMELINE_BUCKET = 'quarter'
+TIMELINE_START = '2024-04-01'
+TIMELINE_END = '2025-12-31'
+
+# Above this many buckets, tick labels are thinned and bar totals left out
+MAX_LABELLED_BUCKETS = 24
 
+def read_incidents():
+    """Read incidents from CSV file as columns (cached between runs)."""
+    return load_table(CSV_PATH, INCIDENT_SCHEMA)
+
+def impact_rank(column):
+    """Rank each row's impact: 3 for H, 2 for M, 1 for L, 0 for none."""
+    category_ranks = np.array([
+        len(IMPACT_LEVELS) - IMPACT_LEVELS.index(c) if c in IMPACT_LEVELS else 0
+        for c in column.categories
+    ], dtype=np.int8)
+    return category_ranks[column.codes]
+
+def get_max_impact(incidents):
+    """Get the maximum impact level from CL and SeSe impacts for every incident (code -1 if neither)."""
     # Priority: H > M > L
-    impacts = [cl_impact, sese_impact]
-    if 'H' in impacts:
-        return 'H'
-    elif 'M' in impacts:
-        return 'M'
-    elif 'L' in impacts:
-        return 'L'
-    return None
-
-def get_quarter(date):
-    """Get quarter string from date (e.g., '2024-Q3')."""
-    quarter = (date.month - 1) // 3 + 1
-    return f"{date.year}-Q{quarter}"
-
-def group_by_quarter_and_impact(incidents):
-    """Group incidents by quarter and impact level."""
-    # Structure: {quarter: {impact_level: count}}
-    quarterly_impact_counts = defaultdict(lambda: {'H': 0, 'M': 0, 'L': 0})
-
-    for incident in incidents:
-        # Parse the timestamp
-        timestamp = datetime.fromisoformat(incident['time'].replace('Z', '+00:00'))
-        # Get quarter
-        quarter = get_quarter(timestamp)
-
-        # Get maximum impact
-        max_impact = get_max_impact(incident)
-        if max_impact:
-            quarterly_impact_counts[quarter][max_impact] += 1
-
-    return quarterly_impact_counts
-
-def group_by_priority_and_impact(incidents):
-    """Group incidents by priority and impact level."""
-    # Structure: {priority: {impact_level: count}}
-    priority_impact_counts = defaultdict(lambda: {'H': 0, 'M': 0, 'L': 0})
-
-    for incident in incidents:
-        priority = incident.get('Priority', '-').strip()
-        max_impact = get_max_impact(incident)
-        if max_impact and priority != '-':
-            priority_impact_counts[priority][max_impact] += 1
-
-    return priority_impact_counts
-
-def create_timeline_chart(quarterly_impact_counts):
-    """Create and save the timeline stacked bar chart."""
-    # Generate all quarters from Q2 2024 to Q4 2025
-    quarters = []
-    for year in [2024, 2025]:
-        start_q = 2 if year == 2024 else 1
-        end_q = 4
-        for q in range(start_q, end_q + 1):
-            quarters.append(f"{year}-Q{q}")
+    ranks = np.maximum(impact_rank(incidents['CL impact']), impact_rank(incidents['SeSe impact']))
+    codes = np.where(ranks > 0, len(IMPACT_LEVELS) - ranks, -1).astype(np.int32)
+    return Categorical(codes, np.array(IMPACT_LEVELS))
+
+def group_by_impact(incidents, buckets=(TIMELINE_BUCKET,), start=TIMELINE_START, end=TIMELINE_END):
+    """
+    Group incidents by time bucket and impact level, and by priority and impact
+    level, in a single pass over the incidents.
+
+    Incidents are counted per day, then rolled up into each requested bucket
+    size between start and end (None for the first/last incident), with empty
+    buckets included.
+    """
+    cubes = aggregate(
+        {
+            'day': day_column(incidents['time']),
+            'priority': incidents['Priority'],
+            'impact': get_max_impact(incidents),
+        },
+        {
+            'day_impact': ('day', 'impact'),
+            'priority_impact': ('priority', 'impact'),
+        },
+    )
+
+    def with_all_levels(nested):
+        return {key: {level: counts.get(level, 0) for level in IMPACT_LEVELS} for key, counts in nested.items()}
+
+    # Structure: {bucket size: {bucket: {impact_level: count}}}, buckets in time order
+    timeline_impact_counts = {
+        bucket: with_all_levels(rebucket(cubes['day_impact'], 'day', bucket, start, end).nested())
+        for bucket in buckets
+    }
+
+    # Structure: {priority: {impact_level: count}}, without incidents that have no priority
+    priority_impact_counts = {
+        priority: counts
+        for priority, counts in with_all_levels(cubes['priority_impact'].nested()).items()
+        if priority not in ('-', '')
+    }
+
+    return timeline_impact_counts, priority_impact_counts
+
+def timeline_data(bucket, bucket_impact_counts):
+    """Build the timeline chart data: incident counts per time bucket and impact level."""
+    buckets = list(bucket_impact_counts.keys())
 
     high_counts = []
     medium_counts = []
     low_counts = []
 
-    for quarter in quarters:
-        counts = quarterly_impact_counts.get(quarter, {'H': 0, 'M': 0, 'L': 0})
+    for counts in bucket_impact_counts.values():
         high_counts.append(counts['H'])
         medium_counts.append(counts['M'])
         low_counts.append(counts['L'])
 
+    return {'bucket': bucket, 'buckets': buckets, 'high': high_counts, 'medium': medium_counts, 'low': low_counts}
+
+def render_timeline_chart(data):
+    """Render the timeline stacked bar chart and return the figure."""
+    buckets = data['buckets']
+    high_counts = data['high']
+    medium_counts = data['medium']
+    low_counts = data['low']
+
     # Create the plot
     fig, ax = plt.subplots(figsize=(14, 7))
 
     # X positions for bars
-    x = np.arange(len(quarters))
+    x = np.arange(len(buckets))
     width = 0.6
+    dense = len(buckets) > MAX_LABELLED_BUCKETS
 
     # Create stacked bar chart
     bar1 = ax.bar(x, high_counts, width, label='High', color='#ef4444', alpha=0.9)
@@ -116,16 +144,21 @@ def create_timeline_chart(quarterly_impact_counts):
     bar3 = ax.bar(x, low_counts, width, bottom=low_bottom, label='Low', color='#22c55e', alpha=0.9)
 
     # Customize the plot
-    ax.set_xlabel('Quarter', fontsize=12, fontweight='bold')
+    ax.set_xlabel(data['bucket'].title(), fontsize=12, fontweight='bold')
     ax.set_ylabel('Number of Incidents', fontsize=12, fontweight='bold')
     ax.set_title('Segmentation Service Incidents by Impact Level', fontsize=16, fontweight='bold', pad=20)
 
-    # Set x-axis ticks and labels
-    ax.set_xticks(x)
-    ax.set_xticklabels(quarters, rotation=0, ha='center')
+    # Set x-axis ticks and labels (thinned out when there are too many buckets to read)
+    if dense:
+        step = -(-len(buckets) // MAX_LABELLED_BUCKETS)
+        ax.set_xticks(x[::step])
+        ax.set_xticklabels(buckets[::step], rotation=90, ha='center', fontsize=8)
+    else:
+        ax.set_xticks(x)
+        ax.set_xticklabels(buckets, rotation=0, ha='center')
 
     # Set y-axis to show only integers and add padding at top
-    max_total = max([h + m + l for h, m, l in zip(high_counts, medium_counts, low_counts)])
+    max_total = max([h + m + l for h, m, l in zip(high_counts, medium_counts, low_counts)], default=0)
     ax.set_ylim(0, max_total + 1)  # Add padding of 1 unit at top
     ax.yaxis.set_major_locator(plt.MaxNLocator(integer=True))
 
@@ -145,39 +178,46 @@ def create_timeline_chart(quarterly_impact_counts):
     # Add total count labels on top of bars
     for i, (h, m, l) in enumerate(zip(high_counts, medium_counts, low_counts)):
         total = h + m + l
-        if total > 0:
+        if total > 0 and not dense:
             ax.text(i, total + 0.15, str(total), ha='center', va='bottom',
                    fontsize=10, fontweight='bold')
 
     # Tight layout
     plt.tight_layout()
 
-    # Save the chart
-    plt.savefig(OUTPUT_PATH_TIMELINE, dpi=300, bbox_inches='tight')
-    print(f"✓ Timeline chart saved to: {OUTPUT_PATH_TIMELINE}")
+    return fig
+
+def print_timeline_statistics(data):
+    """Print statistics for the timeline chart."""
+    bucket = data['bucket']
+    buckets = data['buckets']
+    high_counts = data['high']
+    medium_counts = data['medium']
+    low_counts = data['low']
 
-    # Show statistics
     total_high = sum(high_counts)
     total_medium = sum(medium_counts)
     total_low = sum(low_counts)
     total_incidents = total_high + total_medium + total_low
-    quarters_with_incidents = sum(1 for h, m, l in zip(high_counts, medium_counts, low_counts) if h + m + l > 0)
+    buckets_with_incidents = sum(1 for h, m, l in zip(high_counts, medium_counts, low_counts) if h + m + l > 0)
 
     print(f"\n📊 Statistics:")
     print(f"   Total incidents: {total_incidents}")
+    if total_incidents == 0:
+        return
     print(f"   High impact: {total_high} ({total_high/total_incidents*100:.1f}%)")
     print(f"   Medium impact: {total_medium} ({total_medium/total_incidents*100:.1f}%)")
     print(f"   Low impact: {total_low} ({total_low/total_incidents*100:.1f}%)")
-    print(f"   Quarters with incidents: {quarters_with_incidents}/{len(quarters)}")
+    print(f"   {bucket.title()}s with incidents: {buckets_with_incidents}/{len(buckets)}")
 
-    # Find peak quarter
+    # Find peak bucket
     totals = [h + m + l for h, m, l in zip(high_counts, medium_counts, low_counts)]
     if max(totals) > 0:
         peak_idx = totals.index(max(totals))
-        print(f"   Peak quarter: {quarters[peak_idx]} ({max(totals)} incidents)")
+        print(f"   Peak {bucket}: {buckets[peak_idx]} ({max(totals)} incidents)")
 
-def create_priority_chart(priority_impact_counts):
-    """Create and save the priority-based stacked bar chart."""
+def priority_data(priority_impact_counts):
+    """Build the priority chart data: incident counts per priority and impact level."""
     # Sort priorities (P1, P2, P3, etc.)
     priorities = sorted(priority_impact_counts.keys())
 
@@ -191,6 +231,15 @@ def create_priority_chart(priority_impact_counts):
         medium_counts.append(counts['M'])
         low_counts.append(counts['L'])
 
+    return {'priorities': priorities, 'high': high_counts, 'medium': medium_counts, 'low': low_counts}
+
+def render_priority_chart(data):
+    """Render the priority-based stacked bar chart and return the figure."""
+    priorities = data['priorities']
+    high_counts = data['high']
+    medium_counts = data['medium']
+    low_counts = data['low']
+
     # Create the plot
     fig, ax = plt.subplots(figsize=(10, 7))
 
@@ -236,11 +285,15 @@ def create_priority_chart(priority_impact_counts):
     # Tight layout
     plt.tight_layout()
 
-    # Save the chart
-    plt.savefig(OUTPUT_PATH_PRIORITY, dpi=300, bbox_inches='tight')
-    print(f"✓ Priority chart saved to: {OUTPUT_PATH_PRIORITY}")
+    return fig
+
+def print_priority_statistics(data):
+    """Print statistics for the priority chart."""
+    priorities = data['priorities']
+    high_counts = data['high']
+    medium_counts = data['medium']
+    low_counts = data['low']
 
-    # Show statistics
     total_high = sum(high_counts)
     total_medium = sum(medium_counts)
     total_low = sum(low_counts)
@@ -252,27 +305,92 @@ def create_priority_chart(priority_impact_counts):
         total = high_counts[i] + medium_counts[i] + low_counts[i]
         print(f"   {priority}: {total} incidents (H:{high_counts[i]}, M:{medium_counts[i]}, L:{low_counts[i]})")
 
-def main():
+def timeline_spec(bucket, bucket_impact_counts):
+    """Build the timeline chart spec for one bucket size (the default one keeps the plain name)."""
+    if bucket == TIMELINE_BUCKET:
+        name, heading, label, output_path = 'timeline', "📈 Creating timeline chart...", 'Timeline', OUTPUT_PATH_TIMELINE
+    else:
+        name = f"timeline-{bucket}"
+        heading = f"📈 Creating {bucket}ly timeline chart..."
+        label = f"{bucket.title()}ly timeline"
+        output_path = OUTPUT_PATH_TIMELINE.with_name(f"segmentation-incidents-timeline-{bucket}.png")
+
+    return ChartSpec(
+        name=name,
+        heading=heading,
+        label=label,
+        render=render_timeline_chart,
+        statistics=print_timeline_statistics,
+        data=timeline_data(bucket, bucket_impact_counts),
+        output_path=output_path,
+        config={'impact_levels': IMPACT_LEVELS, 'max_labelled_buckets': MAX_LABELLED_BUCKETS},
+    )
+
+def chart_specs(timeline_impact_counts, priority_impact_counts):
+    """Build the specs for every chart from the precomputed aggregates."""
+    return [
+        *(timeline_spec(bucket, counts) for bucket, counts in timeline_impact_counts.items()),
+        ChartSpec(
+            name='priority',
+            heading="📊 Creating priority chart...",
+            label='Priority',
+            render=render_priority_chart,
+            statistics=print_priority_statistics,
+            data=priority_data(priority_impact_counts),
+            output_path=OUTPUT_PATH_PRIORITY,
+            config={'impact_levels': IMPACT_LEVELS},
+        ),
+    ]
+
+def generate_charts(args, buckets, start, end, pool=None):
+    """Load, group and render all charts. Returns {chart name: render seconds} for rendered charts."""
     print("📊 Generating Segmentation Incidents Charts...\n")
 
     # Read data
     incidents = read_incidents()
-    print(f"✓ Read {len(incidents)} incidents from CSV")
+    print(f"✓ Read {len(incidents['time'])} incidents from CSV")
 
-    # Group by quarter and impact
-    quarterly_impact_counts = group_by_quarter_and_impact(incidents)
-    print(f"✓ Grouped incidents by quarter and impact level")
-
-    # Group by priority and impact
-    priority_impact_counts = group_by_priority_and_impact(incidents)
+    # Group by time bucket and impact, and by priority and impact
+    timeline_impact_counts, priority_impact_counts = group_by_impact(incidents, buckets, start, end)
+    print(f"✓ Grouped incidents by {', '.join(buckets)} and impact level")
     print(f"✓ Grouped incidents by priority and impact level\n")
 
     # Create charts
-    print("📈 Creating timeline chart...")
-    create_timeline_chart(quarterly_impact_counts)
+    return run_charts(chart_specs(timeline_impact_counts, priority_impact_counts), args.workers, CSV_PATH, args.force,
+                      pool, args.profile)
 
-    print("\n📊 Creating priority chart...")
-    create_priority_chart(priority_impact_counts)
+def main():
+    parser = argparse.ArgumentParser(description="Generate segmentation incidents charts")
+    parser.add_argument(
+        "--bucket",
+        action="append",
+        choices=BUCKETS,
+        help=f"Timeline bucket size; repeat to render several timelines from one load (default: {TIMELINE_BUCKET})"
+    )
+    parser.add_argument(
+        "--start",
+        default=TIMELINE_START,
+        help=f"First day of the timeline, YYYY-MM-DD or 'auto' for the first incident (default: {TIMELINE_START})"
+    )
+    parser.add_argument(
+        "--end",
+        default=TIMELINE_END,
+        help=f"Last day of the timeline, YYYY-MM-DD or 'auto' for the last incident (default: {TIMELINE_END})"
+    )
+    add_render_arguments(parser)
+    args = parser.parse_args()
+
+    buckets = list(dict.fromkeys(args.bucket or [TIMELINE_BUCKET]))
+    try:
+        start, end = (None if value == 'auto' else np.datetime64(value, 'D') for value in (args.start, args.end))
+    except ValueError as e:
+        print(f"Error: Invalid timeline date: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.watch:
+        watch_charts([CSV_PATH], lambda pool: generate_charts(args, buckets, start, end, pool), args.workers)
+    else:
+        generate_charts(args, buckets, start, end)
 
 if __name__ == '__main__':
     main()
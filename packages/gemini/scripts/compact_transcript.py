@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Compact a formatted meeting transcript into speaker-turn aligned chunks.
+Non-interactive CLI tool that reads the Markdown produced by formatTranscript.sh
+and writes a compact plain-text version for upload to Gemini File Search.
+
+Usage: python compact_transcript.py --file <transcript.md> [--output <path>] [--max-tokens 400]
+"""
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+
+# Default chunk size, counted in whitespace-separated tokens (the unit used by
+# the File Search white space chunker)
+DEFAULT_MAX_TOKENS_PER_CHUNK = 400
+
+# Matches lines written by formatTranscript.sh: **Speaker** `MM:SS` - text
+TURN_PATTERN = re.compile(r'^\*\*(?P<speaker>.+?)\*\* `(?P<time>\d+:\d{2})` - (?P<text>.*)$')
+FRONTMATTER_PATTERN = re.compile(r'^(?P<key>[a-z_]+):\s*(?P<value>.*)$')
+
+
+@dataclass
+class Turn:
+    speaker: str
+    time: str
+    text: str
+
+    def to_line(self) -> str:
+        return f"{self.speaker} [{self.time}]: {self.text}"
+
+
+def parse_transcript(markdown: str):
+    """Parse frontmatter fields and speaker turns from a formatted transcript."""
+    frontmatter = {}
+    turns = []
+
+    lines = markdown.splitlines()
+    body_start = 0
+    if lines and lines[0].strip() == '---':
+        for i, line in enumerate(lines[1:], 1):
+            if line.strip() == '---':
+                body_start = i + 1
+                break
+            match = FRONTMATTER_PATTERN.match(line)
+            if match:
+                frontmatter[match.group('key')] = match.group('value').strip()
+
+    for line in lines[body_start:]:
+        match = TURN_PATTERN.match(line.strip())
+        if not match:
+            continue
+        text = ' '.join(match.group('text').split())
+        if text:
+            turns.append(Turn(match.group('speaker'), match.group('time'), text))
+
+    return frontmatter, turns
+
+
+def count_tokens(text: str) -> int:
+    """Count whitespace-separated tokens."""
+    return len(text.split())
+
+
+def build_chunks(turns, max_tokens: int = DEFAULT_MAX_TOKENS_PER_CHUNK):
+    """Group consecutive turns into chunks that never split a turn unless it alone exceeds max_tokens."""
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for turn in turns:
+        line = turn.to_line()
+        tokens = count_tokens(line)
+
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append('\n'.join(current))
+            current = []
+            current_tokens = 0
+
+        if tokens > max_tokens:
+            # A single monologue longer than a chunk: split it on word
+            # boundaries, repeating the speaker/time prefix on each part
+            words = turn.text.split()
+            prefix = f"{turn.speaker} [{turn.time}]:"
+            step = max(1, max_tokens - count_tokens(prefix))
+            for i in range(0, len(words), step):
+                chunks.append(f"{prefix} {' '.join(words[i:i + step])}")
+            continue
+
+        current.append(line)
+        current_tokens += tokens
+
+    if current:
+        chunks.append('\n'.join(current))
+
+    return chunks
+
+
+def compact_transcript(markdown: str, meeting_name: str, max_tokens: int = DEFAULT_MAX_TOKENS_PER_CHUNK) -> str:
+    """
+    Return the compact, chunked text for a formatted transcript.
+
+    Chunks end at turn boundaries, but the File Search white space chunker cuts
+    every max_tokens whitespace tokens regardless of line breaks, so a stored
+    chunk can start inside a turn. Every line carries its speaker and MM:SS, so
+    only the partial first line of such a chunk lacks them.
+    """
+    frontmatter, turns = parse_transcript(markdown)
+
+    header_fields = [f"Meeting: {meeting_name}"]
+    for key in ('date', 'language', 'duration'):
+        if frontmatter.get(key):
+            header_fields.append(f"{key.capitalize()}: {frontmatter[key]}")
+
+    chunks = build_chunks(turns, max_tokens)
+    return ' | '.join(header_fields) + '\n\n' + '\n\n'.join(chunks) + '\n'
+
+
+def report_reduction(meeting_name: str, original: str, compacted: str):
+    """Print byte and token reduction between the original and compacted transcript."""
+    original_bytes = len(original.encode('utf-8'))
+    compacted_bytes = len(compacted.encode('utf-8'))
+    original_tokens = count_tokens(original)
+    compacted_tokens = count_tokens(compacted)
+
+    def percent(before, after):
+        return (1 - after / before) * 100 if before else 0.0
+
+    print(f"Compacted '{meeting_name}':")
+    print(f"  Bytes:  {original_bytes} -> {compacted_bytes} ({percent(original_bytes, compacted_bytes):.1f}% smaller)")
+    print(f"  Tokens: {original_tokens} -> {compacted_tokens} ({percent(original_tokens, compacted_tokens):.1f}% fewer)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compact a formatted transcript into speaker-turn aligned chunks"
+    )
+    parser.add_argument(
+        "--file",
+        required=True,
+        help="Path to transcript markdown file"
+    )
+    parser.add_argument(
+        "--name",
+        help="Meeting name (defaults to the file name)"
+    )
+    parser.add_argument(
+        "--output",
+        help="Output path (defaults to stdout)"
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=DEFAULT_MAX_TOKENS_PER_CHUNK,
+        help=f"Maximum whitespace tokens per chunk (default: {DEFAULT_MAX_TOKENS_PER_CHUNK})"
+    )
+
+    args = parser.parse_args()
+
+    path = Path(args.file)
+    if not path.exists():
+        print(f"Error: File not found: {args.file}", file=sys.stderr)
+        sys.exit(1)
+
+    meeting_name = args.name or path.stem
+    original = path.read_text(encoding='utf-8')
+    compacted = compact_transcript(original, meeting_name, args.max_tokens)
+
+    if args.output:
+        Path(args.output).write_text(compacted, encoding='utf-8')
+        report_reduction(meeting_name, original, compacted)
+    else:
+        sys.stdout.write(compacted)
+
+
+if __name__ == "__main__":
+    main()
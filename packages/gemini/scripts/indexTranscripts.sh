@@ -0,0 +1,19 @@
+#!/bin/bash
+
+# Wrapper script to update the local full-text transcript index
+# Usage: ./indexTranscripts.sh [transcriptions_dir]
+
+TRANSCRIPTIONS_DIR="${1:-$HOME/Obsidian/magic/Transcriptions}"
+
+# Check if transcriptions directory exists
+if [ ! -d "$TRANSCRIPTIONS_DIR" ]; then
+    echo "Error: Transcriptions directory not found: $TRANSCRIPTIONS_DIR"
+    exit 1
+fi
+
+# Get the directory where this script is located
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Call Python script using uv (must run from the script directory for uv to find the venv)
+cd "$SCRIPT_DIR"
+uv run transcript_index.py update --dir "$TRANSCRIPTIONS_DIR"
@@ -3,16 +3,25 @@
 Query Gemini File Search knowledge base with a question.
 Non-interactive CLI tool that takes a question and outputs the answer.
 
-Usage: python query_knowledge_base.py --question "Your question here"
+Usage: python query_knowledge_base.py --question "Your question here" [--stream] [--timing]
+       [--meeting <name>] [--since YYYY-MM-DD] [--until YYYY-MM-DD] [--type <type>]
+       [--local-prefilter [--local-meetings 5]]
+       python query_knowledge_base.py --questions-file questions.txt [--output answers.jsonl]
+       [--concurrency 8] [--retries 3]
 """
 
 import argparse
+import asyncio
+import json
 import os
+import random
 import sys
+import time
+from datetime import datetime
 
 try:
     from google import genai
-    from google.genai import types
+    from google.genai import errors, types
 except ImportError:
     print("Error: google-genai package not installed", file=sys.stderr)
     print("Run: uv sync", file=sys.stderr)
@@ -20,6 +29,13 @@ except ImportError:
 
 
 STORE_DISPLAY_NAME = "meeting_transcripts"
+MODEL = "gemini-2.5-flash"
+
+# Batch mode defaults
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 def get_store(client):
@@ -33,103 +49,227 @@ def get_store(client):
     sys.exit(1)
 
 
-def query_knowledge_base(question: str):
-    """Query the knowledge base with a question."""
-    # Get API key
+def get_store_name(client):
+    """Get the resource name of the meeting transcripts store."""
+    store = get_store(client)
+
+    # Extract store name (handle both string and object)
+    if isinstance(store, str):
+        return store
+    elif hasattr(store, 'name'):
+        return store.name
+
+    print(f"Error: Unexpected store type: {type(store)}", file=sys.stderr)
+    sys.exit(1)
+
+
+def get_client():
+    """Create a Gemini client from GOOGLE_API_KEY."""
     api_key = os.environ.get("GOOGLE_API_KEY")
     if not api_key:
         print("Error: GOOGLE_API_KEY environment variable not set", file=sys.stderr)
         print("Get your API key from: https://aistudio.google.com/apikey", file=sys.stderr)
         sys.exit(1)
 
+    return genai.Client(api_key=api_key)
+
+
+def build_config(store_name: str, metadata_filter: str = None):
+    """Build the File Search generation config."""
+    return types.GenerateContentConfig(
+        tools=[
+            types.Tool(
+                file_search=types.FileSearch(
+                    file_search_store_names=[store_name],
+                    metadata_filter=metadata_filter
+                )
+            )
+        ]
+    )
+
+
+def parse_date(value: str) -> int:
+    """Convert a YYYY-MM-DD date to the YYYYMMDD number stored as meeting_date metadata."""
     try:
-        # Initialize client
-        client = genai.Client(api_key=api_key)
+        return int(datetime.strptime(value, '%Y-%m-%d').strftime('%Y%m%d'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD")
+
+
+def build_metadata_filter(meetings=None, since: int = None, until: int = None, doc_type: str = None):
+    """Build a File Search metadata filter (AIP-160 syntax) from the scoping options."""
+    conditions = []
+    if meetings:
+        names = []
+        for meeting in meetings:
+            escaped = meeting.replace('\\', '\\\\').replace('"', '\\"')
+            names.append(f'meeting_name = "{escaped}"')
+        conditions.append(names[0] if len(names) == 1 else f"({' OR '.join(names)})")
+    if doc_type:
+        conditions.append(f'type = "{doc_type}"')
+    if since is not None:
+        conditions.append(f'meeting_date >= {since}')
+    if until is not None:
+        conditions.append(f'meeting_date <= {until}')
+
+    return ' AND '.join(conditions) if conditions else None
+
+
+def pick_local_meetings(question: str, limit: int):
+    """Use the local full-text index to pick the meetings most likely to answer a question."""
+    import transcript_index
+
+    if not transcript_index.DB_PATH.exists():
+        print("Warning: Local transcript index not found, searching all meetings", file=sys.stderr)
+        print("Run: uv run transcript_index.py update", file=sys.stderr)
+        return None
+
+    query = transcript_index.to_fts_query(question)
+    if not query:
+        return None
+
+    db = transcript_index.connect(transcript_index.DB_PATH)
+    meetings = [hit['meeting_name'] for hit in transcript_index.search_meetings(db, query, limit)]
+    db.close()
+
+    if not meetings:
+        print("Warning: No local matches, searching all meetings", file=sys.stderr)
+        return None
+
+    print(f"Searching {len(meetings)} meetings from local index: {', '.join(meetings)}", file=sys.stderr)
+    return meetings
+
+
+def print_grounding(candidate):
+    """Print grounding supports and deduplicated citations for a response candidate."""
+    if not (hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata):
+        return
+
+    grounding_metadata = candidate.grounding_metadata
+
+    # Show grounding supports (which parts of answer are supported by which citations)
+    if hasattr(grounding_metadata, 'grounding_supports') and grounding_metadata.grounding_supports:
+        print("Grounding:")
+        for support in grounding_metadata.grounding_supports:
+            if hasattr(support, 'segment') and support.segment:
+                segment_text = support.segment.text if hasattr(support.segment, 'text') else ''
+                indices = support.grounding_chunk_indices if hasattr(support, 'grounding_chunk_indices') else []
+
+                if indices:
+                    # Convert to 1-based indices for display
+                    citation_nums = [str(i + 1) for i in indices]
+                    print(f'→ "{segment_text}" [Citations {", ".join(citation_nums)}]')
+        print()
+
+    # Output unique citations
+    citations = collect_citations(candidate)
+    if citations:
+        print("Citations:")
+        print()
 
-        # Get store
-        store = get_store(client)
+        for citation in citations:
+            indices_str = ', '.join(str(i) for i in citation['indices'])
+            print(f"Citation {indices_str} ({citation['title']}):")
 
-        # Extract store name (handle both string and object)
-        if isinstance(store, str):
-            store_name = store
-        elif hasattr(store, 'name'):
-            store_name = store.name
-        else:
-            print(f"Error: Unexpected store type: {type(store)}", file=sys.stderr)
-            sys.exit(1)
+            # Format the text for better readability (keep speaker format)
+            print(citation['text'])
+            print()
+
+
+def collect_citations(candidate):
+    """Return citations for a response candidate, deduplicated by text content."""
+    if not (hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata):
+        return []
+
+    grounding_metadata = candidate.grounding_metadata
+    if not (hasattr(grounding_metadata, 'grounding_chunks') and grounding_metadata.grounding_chunks):
+        return []
+
+    # Deduplicate citations by text content
+    seen_texts = {}
+    for i, chunk in enumerate(grounding_metadata.grounding_chunks, 1):
+        if hasattr(chunk, 'retrieved_context') and chunk.retrieved_context:
+            context = chunk.retrieved_context
+            title = context.title if hasattr(context, 'title') else 'Unknown'
+            text = context.text if hasattr(context, 'text') else ''
+
+            # Check if we've seen this exact text before
+            if text in seen_texts:
+                # Add this index to the existing citation
+                seen_texts[text]['indices'].append(i)
+                continue
+
+            # New unique citation
+            seen_texts[text] = {'title': title, 'indices': [i]}
+
+    return [
+        {'indices': info['indices'], 'title': info['title'], 'text': text}
+        for text, info in seen_texts.items()
+    ]
+
+
+def query_knowledge_base(question: str, stream: bool = False, timing: bool = False,
+                         metadata_filter: str = None):
+    """Query the knowledge base with a question."""
+    client = get_client()
+
+    try:
+        store_name = get_store_name(client)
+        config = build_config(store_name, metadata_filter)
 
         # Query with File Search
         # Note: Use gemini-2.5-flash as it supports File Search
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=question,
-            config=types.GenerateContentConfig(
-                tools=[
-                    types.Tool(
-                        file_search=types.FileSearch(
-                            file_search_store_names=[store_name]
-                        )
-                    )
-                ]
+        start = time.perf_counter()
+        first_token_at = None
+
+        if stream:
+            # Print tokens as they arrive; grounding metadata is only complete
+            # on the final chunk(s), so keep the last candidate that carries it
+            grounded_candidate = None
+            for chunk in client.models.generate_content_stream(
+                model=MODEL,
+                contents=question,
+                config=config,
+            ):
+                if chunk.text:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    print(chunk.text, end='', flush=True)
+
+                if chunk.candidates and len(chunk.candidates) > 0:
+                    candidate = chunk.candidates[0]
+                    if hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata:
+                        grounded_candidate = candidate
+            print()
+            print()
+        else:
+            response = client.models.generate_content(
+                model=MODEL,
+                contents=question,
+                config=config,
             )
-        )
+            first_token_at = time.perf_counter()
 
-        # Output answer
-        print(response.text)
-        print()
+            # Output answer
+            print(response.text)
+            print()
+
+            grounded_candidate = None
+            if response.candidates and len(response.candidates) > 0:
+                grounded_candidate = response.candidates[0]
+
+        finished_at = time.perf_counter()
 
         # Output grounding and citations
-        if response.candidates and len(response.candidates) > 0:
-            candidate = response.candidates[0]
-            if hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata:
-                grounding_metadata = candidate.grounding_metadata
-
-                # Show grounding supports (which parts of answer are supported by which citations)
-                if hasattr(grounding_metadata, 'grounding_supports') and grounding_metadata.grounding_supports:
-                    print("Grounding:")
-                    for support in grounding_metadata.grounding_supports:
-                        if hasattr(support, 'segment') and support.segment:
-                            segment_text = support.segment.text if hasattr(support.segment, 'text') else ''
-                            indices = support.grounding_chunk_indices if hasattr(support, 'grounding_chunk_indices') else []
-
-                            if indices:
-                                # Convert to 1-based indices for display
-                                citation_nums = [str(i + 1) for i in indices]
-                                print(f'→ "{segment_text}" [Citations {", ".join(citation_nums)}]')
-                    print()
-
-                # Check if we have grounding chunks
-                if hasattr(grounding_metadata, 'grounding_chunks') and grounding_metadata.grounding_chunks:
-                    chunks = grounding_metadata.grounding_chunks
-
-                    print("Citations:")
-                    print()
-
-                    # Deduplicate citations by text content
-                    seen_texts = {}
-                    for i, chunk in enumerate(chunks, 1):
-                        if hasattr(chunk, 'retrieved_context') and chunk.retrieved_context:
-                            context = chunk.retrieved_context
-                            title = context.title if hasattr(context, 'title') else 'Unknown'
-                            text = context.text if hasattr(context, 'text') else ''
-
-                            # Check if we've seen this exact text before
-                            if text in seen_texts:
-                                # Add this index to the existing citation
-                                seen_texts[text]['indices'].append(i)
-                                continue
-
-                            # New unique citation
-                            seen_texts[text] = {'title': title, 'indices': [i]}
-
-                    # Output unique citations
-                    for text, info in seen_texts.items():
-                        indices_str = ', '.join(str(i) for i in info['indices'])
-                        print(f"Citation {indices_str} ({info['title']}):")
-
-                        # Format the text for better readability (keep speaker format)
-                        print(text)
-                        print()
+        if grounded_candidate is not None:
+            print_grounding(grounded_candidate)
+
+        if timing:
+            print("Timing:")
+            if first_token_at is not None:
+                print(f"  Time to first token: {(first_token_at - start) * 1000:.0f} ms")
+            print(f"  Total: {(finished_at - start) * 1000:.0f} ms")
+            print()
 
         sys.exit(0)
 
@@ -138,18 +278,209 @@ def query_knowledge_base(question: str):
         sys.exit(1)
 
 
+def read_questions(path: str):
+    """Read one question per line, skipping blank lines and # comments."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [line.strip() for line in f]
+    except OSError as e:
+        print(f"Error: Could not read questions file: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    return [line for line in lines if line and not line.startswith('#')]
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits and server-side errors are worth retrying; bad requests are not."""
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (asyncio.TimeoutError, ConnectionError))
+
+
+async def answer_question(client, config, index: int, question: str, semaphore, retries: int):
+    """Answer one question through the async client, retrying transient errors with backoff."""
+    result = {'index': index, 'question': question}
+    attempt = 0
+
+    async with semaphore:
+        # Latency is measured from when the request may start, not from queueing
+        start = time.perf_counter()
+        while True:
+            attempt += 1
+            try:
+                response = await client.aio.models.generate_content(
+                    model=MODEL,
+                    contents=question,
+                    config=config,
+                )
+                result['answer'] = response.text
+                result['citations'] = (
+                    collect_citations(response.candidates[0]) if response.candidates else []
+                )
+                break
+            except Exception as e:
+                if attempt > retries or not is_retryable(e):
+                    result['error'] = str(e)
+                    break
+
+                # Exponential backoff with jitter so throttled requests spread out
+                delay = RETRY_BASE_DELAY * 2 ** (attempt - 1) * (1 + random.random())
+                print(f"Retrying question {index} in {delay:.1f}s ({e})", file=sys.stderr)
+                await asyncio.sleep(delay)
+
+    result['attempts'] = attempt
+    result['latency_ms'] = round((time.perf_counter() - start) * 1000)
+    return result
+
+
+async def run_batch(questions, output, concurrency: int, retries: int, metadata_filter: str = None):
+    """Answer all questions concurrently, writing JSONL records as they complete."""
+    client = get_client()
+    store_name = get_store_name(client)
+    config = build_config(store_name, metadata_filter)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    start = time.perf_counter()
+    tasks = [
+        answer_question(client, config, index, question, semaphore, retries)
+        for index, question in enumerate(questions, 1)
+    ]
+
+    failed = 0
+    slowest_ms = 0
+    for next_result in asyncio.as_completed(tasks):
+        result = await next_result
+        if 'error' in result:
+            failed += 1
+        slowest_ms = max(slowest_ms, result['latency_ms'])
+
+        output.write(json.dumps(result, ensure_ascii=False) + '\n')
+        output.flush()
+
+    wall_ms = (time.perf_counter() - start) * 1000
+    print(f"Answered {len(questions) - failed}/{len(questions)} questions in {wall_ms:.0f} ms "
+          f"(slowest question: {slowest_ms} ms)", file=sys.stderr)
+
+    return failed
+
+
+def query_batch(questions_file: str, output_path: str = None, concurrency: int = DEFAULT_CONCURRENCY,
+                retries: int = DEFAULT_RETRIES, metadata_filter: str = None):
+    """Run every question in a file and write answers as JSONL."""
+    questions = read_questions(questions_file)
+    if not questions:
+        print(f"Error: No questions found in {questions_file}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if output_path:
+            with open(output_path, 'w', encoding='utf-8') as output:
+                failed = asyncio.run(run_batch(questions, output, concurrency, retries, metadata_filter))
+        else:
+            failed = asyncio.run(run_batch(questions, sys.stdout, concurrency, retries, metadata_filter))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    sys.exit(1 if failed else 0)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Query Gemini File Search knowledge base"
     )
-    parser.add_argument(
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument(
         "--question",
-        required=True,
         help="Question to ask about the meeting transcripts"
     )
+    mode.add_argument(
+        "--questions-file",
+        help="File with one question per line, answered concurrently and written as JSONL"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the answer as it is generated instead of waiting for the full response"
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Report time to first token and total response time"
+    )
+    parser.add_argument(
+        "--output",
+        help="JSONL output path for --questions-file (defaults to stdout)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum concurrent requests for --questions-file (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Retries per question on rate limit or server errors (default: {DEFAULT_RETRIES})"
+    )
+    parser.add_argument(
+        "--meeting",
+        help="Only search the transcript of this meeting"
+    )
+    parser.add_argument(
+        "--since",
+        type=parse_date,
+        help="Only search meetings on or after this date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--until",
+        type=parse_date,
+        help="Only search meetings on or before this date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--type",
+        dest="doc_type",
+        help="Only search documents of this type (e.g. meeting_transcript)"
+    )
+    parser.add_argument(
+        "--local-prefilter",
+        action="store_true",
+        help="Only search the meetings that best match the question in the local full-text index"
+    )
+    parser.add_argument(
+        "--local-meetings",
+        type=int,
+        default=5,
+        help="Number of meetings to pick with --local-prefilter (default: 5)"
+    )
 
     args = parser.parse_args()
-    query_knowledge_base(args.question)
+
+    if args.questions_file:
+        # Batch answers are written as JSONL with per-question timings, and the
+        # local prefilter picks meetings for a single question
+        for flag, value in (("--stream", args.stream), ("--timing", args.timing),
+                            ("--local-prefilter", args.local_prefilter)):
+            if value:
+                parser.error(f"{flag} cannot be used with --questions-file")
+
+    if args.concurrency < 1:
+        print("Error: --concurrency must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    meetings = [args.meeting] if args.meeting else None
+    if args.local_prefilter and not meetings and args.question:
+        meetings = pick_local_meetings(args.question, args.local_meetings)
+
+    metadata_filter = build_metadata_filter(meetings, args.since, args.until, args.doc_type)
+
+    if args.questions_file:
+        query_batch(args.questions_file, args.output, args.concurrency, args.retries, metadata_filter)
+        return
+
+    query_knowledge_base(args.question, stream=args.stream, timing=args.timing,
+                         metadata_filter=metadata_filter)
 
 
 if __name__ == "__main__":
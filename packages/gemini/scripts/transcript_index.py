@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Local full-text index of meeting transcripts.
+Keeps an SQLite FTS5 (BM25) index over the Obsidian Transcriptions folder at
+speaker-turn granularity, and searches it without any network access.
+
+Usage: python transcript_index.py update [--dir <transcriptions_dir>] [--db <path>]
+       python transcript_index.py search "query" [--limit 20] [--meetings] [--json]
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+from compact_transcript import parse_transcript
+
+
+TRANSCRIPTIONS_DIR = Path.home() / "Obsidian" / "magic" / "Transcriptions"
+DB_PATH = Path.home() / "Documents" / "recordings" / "transcripts.fts.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    meeting_name TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    speaker TEXT NOT NULL,
+    start_ms INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS turns_document_id ON turns(document_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+    text, speaker,
+    content='turns', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS turns_ai AFTER INSERT ON turns BEGIN
+    INSERT INTO turns_fts(rowid, text, speaker) VALUES (new.id, new.text, new.speaker);
+END;
+
+CREATE TRIGGER IF NOT EXISTS turns_ad AFTER DELETE ON turns BEGIN
+    INSERT INTO turns_fts(turns_fts, rowid, text, speaker) VALUES ('delete', old.id, old.text, old.speaker);
+END;
+"""
+
+# Words kept when turning a natural-language question into an FTS query
+QUERY_TERM_PATTERN = re.compile(r'\w{3,}')
+STOPWORDS = {
+    'the', 'and', 'for', 'are', 'was', 'were', 'who', 'what', 'when', 'where', 'which', 'why', 'how',
+    'did', 'does', 'about', 'with', 'that', 'this', 'from', 'have', 'has', 'any', 'all', 'our', 'you',
+}
+
+
+def connect(db_path: Path = DB_PATH):
+    """Open the index database, creating the schema if needed."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(db_path)
+    db.execute("PRAGMA foreign_keys = ON")
+    db.execute("PRAGMA journal_mode = WAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+def timestamp_to_ms(timestamp: str) -> int:
+    """Convert an MM:SS transcript timestamp to milliseconds."""
+    minutes, seconds = timestamp.split(':')
+    return (int(minutes) * 60 + int(seconds)) * 1000
+
+
+def update_index(db, transcriptions_dir: Path = TRANSCRIPTIONS_DIR):
+    """Index new and changed transcripts and drop deleted ones. Returns (added, updated, removed)."""
+    indexed = {
+        path: (doc_id, mtime_ns, size)
+        for doc_id, path, mtime_ns, size in db.execute("SELECT id, path, mtime_ns, size FROM documents")
+    }
+
+    added = updated = 0
+    seen = set()
+
+    for path in sorted(transcriptions_dir.glob("*.md")):
+        stat = path.stat()
+        key = str(path)
+        seen.add(key)
+
+        previous = indexed.get(key)
+        if previous and previous[1:] == (stat.st_mtime_ns, stat.st_size):
+            continue
+
+        _, turns = parse_transcript(path.read_text(encoding='utf-8'))
+
+        with db:
+            # By path, not the id read above: a concurrent update (another pipeline run) may have
+            # indexed this transcript since
+            db.execute("DELETE FROM documents WHERE path = ?", (key,))
+            if previous:
+                updated += 1
+            else:
+                added += 1
+
+            cursor = db.execute(
+                "INSERT INTO documents (path, meeting_name, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                (key, path.stem, stat.st_mtime_ns, stat.st_size),
+            )
+            db.executemany(
+                "INSERT INTO turns (document_id, speaker, start_ms, text) VALUES (?, ?, ?, ?)",
+                [(cursor.lastrowid, turn.speaker, timestamp_to_ms(turn.time), turn.text) for turn in turns],
+            )
+
+    removed = list(indexed.keys() - seen)
+    with db:
+        db.executemany("DELETE FROM documents WHERE path = ?", [(key,) for key in removed])
+
+    return added, updated, len(removed)
+
+
+def to_fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching any of its words (ranked by BM25)."""
+    terms = dict.fromkeys(
+        term.lower() for term in QUERY_TERM_PATTERN.findall(text) if term.lower() not in STOPWORDS
+    )
+    return ' OR '.join(f'"{term}"' for term in terms)
+
+
+def search(db, query: str, limit: int = 20):
+    """Return the best matching speaker turns for an FTS5 query."""
+    rows = db.execute(
+        """
+        SELECT d.meeting_name, t.speaker, t.start_ms,
+               snippet(turns_fts, 0, '[', ']', '…', 16),
+               bm25(turns_fts)
+        FROM turns_fts
+        JOIN turns t ON t.id = turns_fts.rowid
+        JOIN documents d ON d.id = t.document_id
+        WHERE turns_fts MATCH ?
+        ORDER BY bm25(turns_fts)
+        LIMIT ?
+        """,
+        (query, limit),
+    )
+    return [
+        {'meeting_name': meeting, 'speaker': speaker, 'start_ms': start_ms, 'snippet': snippet, 'score': score}
+        for meeting, speaker, start_ms, snippet, score in rows
+    ]
+
+
+def search_meetings(db, query: str, limit: int = 10):
+    """Return meetings ranked by their best matching turn, with the number of matching turns."""
+    rows = db.execute(
+        """
+        WITH hits AS MATERIALIZED (
+            SELECT t.document_id, d.meeting_name, bm25(turns_fts) AS score
+            FROM turns_fts
+            JOIN turns t ON t.id = turns_fts.rowid
+            JOIN documents d ON d.id = t.document_id
+            WHERE turns_fts MATCH ?
+        )
+        SELECT meeting_name, MIN(score) AS best, COUNT(*)
+        FROM hits
+        GROUP BY document_id
+        ORDER BY best
+        LIMIT ?
+        """,
+        (query, limit),
+    )
+    return [{'meeting_name': meeting, 'score': score, 'matches': matches} for meeting, score, matches in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local full-text index of meeting transcripts"
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=DB_PATH,
+        help=f"Index database path (default: {DB_PATH})"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    update_parser = subparsers.add_parser("update", help="Index new and changed transcripts")
+    update_parser.add_argument(
+        "--dir",
+        type=Path,
+        default=TRANSCRIPTIONS_DIR,
+        help=f"Transcriptions directory (default: {TRANSCRIPTIONS_DIR})"
+    )
+
+    search_parser = subparsers.add_parser("search", help="Search indexed transcripts")
+    search_parser.add_argument(
+        "query",
+        help="Words to search for, or an FTS5 query with --raw"
+    )
+    search_parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Pass the query to FTS5 unchanged (phrases, AND/NOT, prefix*)"
+    )
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of results (default: 20)"
+    )
+    search_parser.add_argument(
+        "--meetings",
+        action="store_true",
+        help="List matching meetings instead of individual turns"
+    )
+    search_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output results as JSON lines"
+    )
+
+    args = parser.parse_args()
+    db = connect(args.db)
+
+    if args.command == "update":
+        if not args.dir.is_dir():
+            print(f"Error: Directory not found: {args.dir}", file=sys.stderr)
+            sys.exit(1)
+        added, updated, removed = update_index(db, args.dir)
+        print(f"Transcript index updated: {added} added, {updated} updated, {removed} removed")
+        sys.exit(0)
+
+    query = args.query if args.raw else to_fts_query(args.query)
+    if not query:
+        print("Error: Query has no searchable words", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.meetings:
+            results = search_meetings(db, query, args.limit)
+        else:
+            results = search(db, query, args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"Error: Invalid search query: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for result in results:
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False))
+        elif args.meetings:
+            print(f"{result['meeting_name']} ({result['matches']} matching turns)")
+        else:
+            print(f"{result['meeting_name']} @ {result['start_ms']} ms - {result['speaker']}: {result['snippet']}")
+
+    if not results and not args.json:
+        print("No matches found", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
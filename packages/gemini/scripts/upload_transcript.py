@@ -3,15 +3,19 @@
 Upload meeting transcript to Gemini File Search store.
 Non-interactive CLI tool that takes arguments and exits.
 
-Usage: python upload_transcript.py --file <path> --name <meeting_name>
+Usage: python upload_transcript.py --file <path> --name <meeting_name> [--raw] [--max-tokens 400]
 """
 
 import argparse
 import os
 import sys
+import tempfile
 import time
+from datetime import datetime
 from pathlib import Path
 
+from compact_transcript import DEFAULT_MAX_TOKENS_PER_CHUNK, compact_transcript, parse_transcript, report_reduction
+
 try:
     from google import genai
 except ImportError:
@@ -44,7 +48,34 @@ def get_or_create_store(client):
         raise
 
 
-def upload_transcript(file_path: str, meeting_name: str):
+def build_custom_metadata(meeting_name: str, frontmatter: dict):
+    """Build File Search custom metadata from the meeting name and transcript frontmatter."""
+    metadata = [
+        {"key": "meeting_name", "string_value": meeting_name},
+        {"key": "type", "string_value": "meeting_transcript"}
+    ]
+
+    # Dates are stored as YYYYMMDD numbers so queries can filter by range
+    try:
+        meeting_date = datetime.strptime(frontmatter.get('date', ''), '%Y-%m-%d')
+        metadata.append({"key": "meeting_date", "numeric_value": int(meeting_date.strftime('%Y%m%d'))})
+    except ValueError:
+        pass
+
+    if frontmatter.get('language') and frontmatter['language'] != 'null':
+        metadata.append({"key": "language", "string_value": frontmatter['language']})
+
+    try:
+        duration = float(frontmatter.get('duration', '').rstrip('s'))
+        metadata.append({"key": "duration_seconds", "numeric_value": duration})
+    except ValueError:
+        pass
+
+    return metadata
+
+
+def upload_transcript(file_path: str, meeting_name: str, compact: bool = True,
+                      max_tokens: int = DEFAULT_MAX_TOKENS_PER_CHUNK):
     """Upload transcript to Gemini File Search store."""
     # Validate file exists
     if not Path(file_path).exists():
@@ -74,19 +105,45 @@ def upload_transcript(file_path: str, meeting_name: str):
             print(f"Error: Unexpected store object type: {type(store)}", file=sys.stderr)
             sys.exit(1)
 
-        # Upload file (automatic chunking)
-        # Note: This is asynchronous - file will be indexed in the background
-        client.file_search_stores.upload_to_file_search_store(
-            file=file_path,
-            file_search_store_name=store_name,
-            config={
-                'display_name': meeting_name,
-                'custom_metadata': [
-                    {"key": "meeting_name", "string_value": meeting_name},
-                    {"key": "type", "string_value": "meeting_transcript"}
-                ]
+        original = Path(file_path).read_text(encoding='utf-8')
+        frontmatter, _ = parse_transcript(original)
+
+        config = {
+            'display_name': meeting_name,
+            'custom_metadata': build_custom_metadata(meeting_name, frontmatter)
+        }
+
+        if compact:
+            # Upload the compacted text with an explicit chunk size; the server
+            # cuts by token count, so its chunks can start inside a turn
+            compacted = compact_transcript(original, meeting_name, max_tokens)
+            report_reduction(meeting_name, original, compacted)
+
+            with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False) as f:
+                f.write(compacted)
+                upload_path = f.name
+
+            config['mime_type'] = 'text/plain'
+            config['chunking_config'] = {
+                'white_space_config': {
+                    'max_tokens_per_chunk': max_tokens,
+                    'max_overlap_tokens': 0,
+                }
             }
-        )
+        else:
+            # Upload file as-is (automatic chunking)
+            upload_path = file_path
+
+        # Note: This is asynchronous - file will be indexed in the background
+        try:
+            client.file_search_stores.upload_to_file_search_store(
+                file=upload_path,
+                file_search_store_name=store_name,
+                config=config
+            )
+        finally:
+            if upload_path != file_path:
+                os.unlink(upload_path)
 
         # Success - file is uploaded and will be indexed shortly
         print(f"Transcript '{meeting_name}' uploaded successfully to knowledge base")
@@ -116,8 +173,20 @@ def main():
         help="Meeting name"
     )
 
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Upload the Markdown as-is with automatic chunking instead of compacted speaker-turn chunks"
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=DEFAULT_MAX_TOKENS_PER_CHUNK,
+        help=f"Maximum whitespace tokens per chunk (default: {DEFAULT_MAX_TOKENS_PER_CHUNK})"
+    )
+
     args = parser.parse_args()
-    upload_transcript(args.file, args.name)
+    upload_transcript(args.file, args.name, compact=not args.raw, max_tokens=args.max_tokens)
 
 
 if __name__ == "__main__":
@@ -18,8 +18,12 @@ TRANSCRIPTIONS_DIR="$HOME/Obsidian/magic/Transcriptions"
 # Files to delete
 MP3_FILE="$RECORDING_DIR/${MEETING_NAME}.mp3"
 WAV_FILE="$RECORDING_DIR/${MEETING_NAME}.wav"
+FLAC_FILE="$RECORDING_DIR/${MEETING_NAME}.flac"
+OPUS_FILE="$RECORDING_DIR/${MEETING_NAME}.opus"
 TRANSCRIPT_JSON="$RECORDING_DIR/${MEETING_NAME}_transcript.json"
 SPEAKER_MAP="$RECORDING_DIR/${MEETING_NAME}_speakers.json"
+SUMMARY_JSON="$RECORDING_DIR/${MEETING_NAME}.summary.json"
+PROGRESS_JSON="$RECORDING_DIR/${MEETING_NAME}.progress.json"
 MEETING_NOTE="$MEETINGS_DIR/${MEETING_NAME}.md"
 TRANSCRIPT_PAGE="$TRANSCRIPTIONS_DIR/${MEETING_NAME}.md"
 
@@ -46,6 +50,26 @@ if [ -f "$WAV_FILE" ]; then
     ((DELETED_COUNT++))
 fi
 
+# Delete archived audio (see archive_recordings.py)
+for ARCHIVE_FILE in "$FLAC_FILE" "$OPUS_FILE"; do
+    if [ -f "$ARCHIVE_FILE" ]; then
+        rm "$ARCHIVE_FILE"
+        echo "✓ Deleted archived audio: $(basename "$ARCHIVE_FILE")"
+        DELETED_FILES+=("$(basename "$ARCHIVE_FILE")")
+        ((DELETED_COUNT++))
+    fi
+done
+
+# Delete a leftover transcription upload (see convertToMp3.sh), e.g. from a failed transcription
+for SPEECH_FILE in "$RECORDING_DIR/.transcription/${MEETING_NAME}".{ogg,flac}; do
+    if [ -f "$SPEECH_FILE" ]; then
+        rm "$SPEECH_FILE"
+        echo "✓ Deleted transcription upload: .transcription/$(basename "$SPEECH_FILE")"
+        DELETED_FILES+=(".transcription/$(basename "$SPEECH_FILE")")
+        ((DELETED_COUNT++))
+    fi
+done
+
 # Delete transcript JSON
 if [ -f "$TRANSCRIPT_JSON" ]; then
     rm "$TRANSCRIPT_JSON"
@@ -62,6 +86,24 @@ if [ -f "$SPEAKER_MAP" ]; then
     ((DELETED_COUNT++))
 fi
 
+# Delete pipeline progress snapshot (left behind by a failed run)
+if [ -f "$PROGRESS_JSON" ]; then
+    rm "$PROGRESS_JSON"
+    echo "✓ Deleted pipeline progress: ${MEETING_NAME}.progress.json"
+    DELETED_FILES+=("${MEETING_NAME}.progress.json")
+    ((DELETED_COUNT++))
+fi
+
+# Delete recording summary and drop it from recordings.index.json
+if [ -f "$SUMMARY_JSON" ]; then
+    SUMMARY_SCRIPT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/../../transcription/scripts/recording_summary.py"
+    if python3 "$SUMMARY_SCRIPT" remove "$MEETING_NAME" --dir "$RECORDING_DIR" > /dev/null; then
+        echo "✓ Deleted recording summary: ${MEETING_NAME}.summary.json"
+        DELETED_FILES+=("${MEETING_NAME}.summary.json")
+        ((DELETED_COUNT++))
+    fi
+fi
+
 # Delete Obsidian meeting note
 if [ -f "$MEETING_NOTE" ]; then
     rm "$MEETING_NOTE"
@@ -30,6 +30,7 @@ OLD_WAV="$RECORDING_DIR/${OLD_NAME}.wav"
 NEW_WAV="$RECORDING_DIR/${NEW_NAME}.wav"
 OLD_TRANSCRIPT_JSON="$RECORDING_DIR/${OLD_NAME}_transcript.json"
 NEW_TRANSCRIPT_JSON="$RECORDING_DIR/${NEW_NAME}_transcript.json"
+OLD_SUMMARY_JSON="$RECORDING_DIR/${OLD_NAME}.summary.json"
 
 # Check if old meeting note exists
 if [ ! -f "$OLD_MEETING_NOTE" ]; then
@@ -51,11 +52,25 @@ if [ -f "$OLD_WAV" ]; then
     echo "✓ Renamed WAV: ${OLD_NAME}.wav -> ${NEW_NAME}.wav"
 fi
 
+# Archived audio (see archive_recordings.py)
+for EXT in flac opus; do
+    if [ -f "$RECORDING_DIR/${OLD_NAME}.$EXT" ]; then
+        mv "$RECORDING_DIR/${OLD_NAME}.$EXT" "$RECORDING_DIR/${NEW_NAME}.$EXT"
+        echo "✓ Renamed archived audio: ${OLD_NAME}.$EXT -> ${NEW_NAME}.$EXT"
+    fi
+done
+
 if [ -f "$OLD_TRANSCRIPT_JSON" ]; then
     mv "$OLD_TRANSCRIPT_JSON" "$NEW_TRANSCRIPT_JSON"
     echo "✓ Renamed transcript JSON: ${OLD_NAME}_transcript.json -> ${NEW_NAME}_transcript.json"
 fi
 
+# Move the recording summary and its recordings.index.json entry to the new name
+if [ -f "$OLD_SUMMARY_JSON" ]; then
+    SUMMARY_SCRIPT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/../../transcription/scripts/recording_summary.py"
+    python3 "$SUMMARY_SCRIPT" rename "$OLD_NAME" "$NEW_NAME" --dir "$RECORDING_DIR"
+fi
+
 echo ""
 
 # Step 2: Rename and update transcript page
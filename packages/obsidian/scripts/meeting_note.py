@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Create or update an Obsidian meeting note in a single atomic write.
+
+The note gets the same layout createMeetingNote.sh always produced:
+frontmatter (date, time, end_time, language, audio link, tags), a title, a
+Transcript section linking the transcript page, and Notes / Action Items /
+Attendees sections. All changes are applied to the text in memory and the
+file is only replaced (write to a temporary file, fsync, rename) when
+something changed, so repeated calls - Airflow retries, re-processing a
+recording - leave the note and anything the user added to it untouched.
+
+Used in-process by the process_batch_recordings DAG, and from the command line:
+
+Usage: python meeting_note.py <meeting_name> <language> [audio_path] [transcript_path] [end_time]
+                              [--vault ~/Obsidian/magic] [--created-at <ISO timestamp>]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+OBSIDIAN_VAULT = Path.home() / "Obsidian" / "magic"
+MEETINGS_DIRNAME = "Meetings"
+FRONTMATTER_DELIMITER = "---"
+NOTES_SECTIONS = ["## Notes", "", "", "## Action Items", "- [ ]", "", "## Attendees", ""]
+
+
+def new_note(meeting_name, language, created_at):
+    """Lines of a note that does not exist yet."""
+    return [
+        FRONTMATTER_DELIMITER,
+        f"date: {created_at.strftime('%Y-%m-%d')}",
+        f"time: {created_at.strftime('%H:%M:%S')}",
+        f"language: {language}",
+        "tags:",
+        "  - meeting",
+        FRONTMATTER_DELIMITER,
+        "",
+        f"# {meeting_name}",
+        "",
+    ]
+
+
+def frontmatter_end(lines):
+    """Index of the closing frontmatter delimiter, or None when the note has no frontmatter."""
+    if not lines or lines[0] != FRONTMATTER_DELIMITER:
+        return None
+    for index in range(1, len(lines)):
+        if lines[index] == FRONTMATTER_DELIMITER:
+            return index
+    return None
+
+
+def set_frontmatter_field(lines, key, value, after):
+    """Add key: value after the `after` field unless the key is already set. Returns True if added."""
+    end = frontmatter_end(lines)
+    if end is None:
+        return False
+    fields = lines[1:end]
+    if any(line.startswith(f"{key}:") for line in fields):
+        return False
+    position = next((i + 1 for i, line in enumerate(fields, start=1) if line.startswith(f"{after}:")), end)
+    lines.insert(position, f"{key}: {value}")
+    return True
+
+
+def add_transcript_link(lines, page_name):
+    """Link the transcript page in the Transcript section. Returns True if added."""
+    link = f"[[Transcriptions/{page_name}|{page_name}]]"
+    if any(f"Transcriptions/{page_name}" in line for line in lines):
+        return False
+    if "## Transcript" in lines:
+        position = lines.index("## Transcript") + 1
+        lines[position:position] = ["", link]
+    elif "## Notes" in lines:
+        position = lines.index("## Notes")
+        lines[position:position] = ["## Transcript", "", link, ""]
+    else:
+        lines.extend(["", "## Transcript", "", link, ""])
+    return True
+
+
+def update_note(meeting_name, language, audio_path=None, transcript_path=None, end_time=None,
+                created_at=None, vault_dir=OBSIDIAN_VAULT):
+    """
+    Create the meeting note if needed and add whatever links are given.
+
+    audio_path is linked in the frontmatter if the file exists; transcript_path
+    (a Transcriptions/<page>.md) is linked in the body. created_at (a datetime,
+    default now) only sets date/time of a new note. Returns (note path, list of
+    changes); the note is only written when the list is not empty.
+    """
+    note_path = Path(vault_dir) / MEETINGS_DIRNAME / f"{meeting_name}.md"
+    changes = []
+
+    if note_path.exists():
+        lines = note_path.read_text(encoding='utf-8').split("\n")
+        # split() leaves an empty last item for the trailing newline
+        if lines and lines[-1] == "":
+            lines.pop()
+    else:
+        lines = new_note(meeting_name, language, created_at or datetime.now())
+        changes.append("Created meeting note")
+
+    # Sections first, so the transcript link lands before Notes as it does when added later
+    if "## Notes" not in lines:
+        lines.extend([""] + NOTES_SECTIONS)
+        changes.append("Added notes sections to meeting note")
+
+    if audio_path and Path(audio_path).is_file():
+        if set_frontmatter_field(lines, "audio", f"\"[[{Path(audio_path).name}]]\"", after="language"):
+            changes.append("Added audio link to meeting note frontmatter")
+
+    if transcript_path and str(transcript_path).endswith(".md"):
+        if add_transcript_link(lines, Path(transcript_path).stem):
+            changes.append("Added transcript page link to meeting note body")
+
+    if end_time:
+        if set_frontmatter_field(lines, "end_time", end_time, after="time"):
+            changes.append("Added end time to meeting note frontmatter")
+
+    if changes:
+        write_atomic(note_path, "\n".join(lines) + "\n")
+    return note_path, changes
+
+
+def write_atomic(path, text):
+    """Replace path with text without ever leaving a partly written note in the vault."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or update an Obsidian meeting note")
+    parser.add_argument("meeting_name", help="Meeting name (note file name)")
+    parser.add_argument("language", help="Language code of the meeting")
+    parser.add_argument("audio_path", nargs="?", default="", help="Audio file to link in the frontmatter")
+    parser.add_argument("transcript_path", nargs="?", default="", help="Transcript page (.md) to link in the body")
+    parser.add_argument("end_time", nargs="?", default="", help="End time to add to the frontmatter")
+    parser.add_argument("--vault", default=str(OBSIDIAN_VAULT), help=f"Obsidian vault (default: {OBSIDIAN_VAULT})")
+    parser.add_argument("--created-at", help="Recording time for a new note's date/time (ISO format, default: now)")
+    args = parser.parse_args()
+
+    created_at = None
+    if args.created_at:
+        try:
+            # Recording metadata timestamps are UTC ("...Z"); notes use local time
+            created_at = datetime.fromisoformat(args.created_at.replace("Z", "+00:00")).astimezone()
+        except ValueError:
+            print(f"Error: Invalid --created-at timestamp: {args.created_at}", file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        note_path, changes = update_note(args.meeting_name, args.language, args.audio_path, args.transcript_path,
+                                         args.end_time, created_at, Path(args.vault).expanduser())
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for change in changes:
+        print(change)
+    print(f"Meeting note {'updated' if changes else 'unchanged'}: {note_path}")
+
+
+if __name__ == '__main__':
+    main()
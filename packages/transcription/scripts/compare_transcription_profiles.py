@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Compare transcripts of the archival MP3 against the mono 16 kHz transcription profiles.
+
+For each sample recording the first --minutes of the WAV are encoded as MP3
+(the current upload) and in each candidate profile, and every file is
+transcribed with transcribeAudio.sh. Each candidate transcript is aligned with
+the MP3 transcript to report:
+- word error rate (substitutions + deletions + insertions per MP3 word)
+- speaker agreement (share of aligned words with the same speaker, after
+  mapping the candidate's speaker labels onto the MP3's)
+- upload bytes and seconds against the MP3
+
+Samples are the WAV files given on the command line, or the --samples most
+recent WAVs in --dir. Exits 1 when any candidate exceeds --max-wer, so the
+check can gate a TRANSCRIPTION_PROFILE change.
+
+Usage: uv run compare_transcription_profiles.py [recording.wav ...] [--samples 3] [--minutes 10]
+                                              [--profiles opus flac] [--max-wer 0.05]
+"""
+
+import argparse
+import difflib
+import json
+import re
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from transcribe_segmented import PROFILES, UPLOAD_LINE
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+TRANSCRIBE_SCRIPT = SCRIPT_DIR / "transcribeAudio.sh"
+RECORDINGS_DIR = Path.home() / "Documents" / "recordings"
+REPORT_DIRNAME = ".transcription"
+
+WORD = re.compile(r"[\w']+")
+
+
+def encode(wav_path, output_path, profile, minutes):
+    """Encode the first minutes of a WAV with a profile."""
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', '-t', f"{minutes * 60:.0f}", '-i', str(wav_path),
+         *PROFILES[profile][1], str(output_path)],
+        capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Encoding {output_path.name} failed: {result.stderr.strip()}")
+
+
+def transcribe(audio_path, language):
+    """Run transcribeAudio.sh. Returns (transcript, uploaded bytes, upload seconds or None)."""
+    result = subprocess.run(['bash', str(TRANSCRIBE_SCRIPT), str(audio_path), language],
+                            capture_output=True, text=True)
+    transcript_path = audio_path.with_name(f"{audio_path.stem}_transcript.json")
+    if result.returncode != 0 or not transcript_path.exists():
+        output = (result.stdout + result.stderr).strip().splitlines()[-5:]
+        raise RuntimeError(f"Transcribing {audio_path.name} failed:\n" + "\n".join(output))
+    with open(transcript_path, 'r') as f:
+        transcript = json.load(f)
+    match = UPLOAD_LINE.search(result.stdout)
+    if match:
+        return transcript, int(float(match.group(1))), float(match.group(2))
+    return transcript, audio_path.stat().st_size, None
+
+
+def words(transcript):
+    """Normalised (word, speaker) pairs of a Speechmatics transcript."""
+    pairs = []
+    for item in transcript.get('results', []):
+        if item.get('type') != 'word' or not item.get('alternatives'):
+            continue
+        alternative = item['alternatives'][0]
+        for token in WORD.findall(alternative.get('content', '').lower()):
+            pairs.append((token, alternative.get('speaker', 'UU')))
+    return pairs
+
+
+def compare(reference, candidate):
+    """Word error rate and speaker agreement of candidate against reference (lists of (word, speaker))."""
+    ref_words = [word for word, _ in reference]
+    hyp_words = [word for word, _ in candidate]
+    matcher = difflib.SequenceMatcher(None, ref_words, hyp_words, autojunk=False)
+
+    errors = 0
+    speaker_pairs = Counter()
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for offset in range(i2 - i1):
+                speaker_pairs[(reference[i1 + offset][1], candidate[j1 + offset][1])] += 1
+        else:
+            # replace counts min() substitutions plus the length difference as deletions/insertions
+            errors += max(i2 - i1, j2 - j1)
+
+    # Greedy one-to-one mapping of candidate speaker labels onto reference labels
+    mapped_ref, mapped_hyp, agreeing = set(), set(), 0
+    for (ref_speaker, hyp_speaker), count in speaker_pairs.most_common():
+        if ref_speaker not in mapped_ref and hyp_speaker not in mapped_hyp:
+            mapped_ref.add(ref_speaker)
+            mapped_hyp.add(hyp_speaker)
+            agreeing += count
+    aligned = sum(speaker_pairs.values())
+
+    return {
+        'reference_words': len(ref_words),
+        'candidate_words': len(hyp_words),
+        'wer': round(errors / len(ref_words), 4) if ref_words else 0.0,
+        'speaker_agreement': round(agreeing / aligned, 4) if aligned else None,
+        'reference_speakers': len({speaker for _, speaker in reference}),
+        'candidate_speakers': len({speaker for _, speaker in candidate}),
+    }
+
+
+def compare_sample(wav_path, language, profiles, minutes, work_dir):
+    """Transcribe one sample in MP3 and every profile, and compare each profile to the MP3."""
+    names = ['mp3'] + [profile for profile in profiles if profile != 'mp3']
+    paths = {}
+    for profile in names:
+        paths[profile] = work_dir / f"{wav_path.stem}_{profile}.{PROFILES[profile][0]}"
+        encode(wav_path, paths[profile], profile, minutes)
+
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        results = dict(zip(names, pool.map(lambda profile: transcribe(paths[profile], language), names)))
+
+    reference, mp3_bytes, mp3_seconds = results['mp3']
+    reference_words = words(reference)
+    sample = {'wav': str(wav_path), 'mp3_bytes': mp3_bytes, 'mp3_upload_seconds': mp3_seconds, 'profiles': {}}
+    for profile in names[1:]:
+        transcript, uploaded, seconds = results[profile]
+        entry = compare(reference_words, words(transcript))
+        entry.update({
+            'bytes': uploaded,
+            'upload_seconds': seconds,
+            'bytes_saved_percent': round((1 - uploaded / mp3_bytes) * 100, 1) if mp3_bytes else None,
+        })
+        sample['profiles'][profile] = entry
+    return sample
+
+
+def language_of(wav_path):
+    """Language from the recording's transcript, metadata or summary, defaulting to English."""
+    # Metadata is <name>.meta.json while queued and <name>.meta.processing while claimed
+    for candidate in (wav_path.with_name(f"{wav_path.stem}_transcript.json"),
+                      wav_path.with_name(f"{wav_path.stem}.meta.json"),
+                      wav_path.with_name(f"{wav_path.stem}.meta.processing"),
+                      wav_path.with_name(f"{wav_path.stem}.summary.json")):
+        try:
+            with open(candidate, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        language = data.get('metadata', {}).get('transcription_config', {}).get('language') or data.get('language')
+        if language:
+            return language
+    return 'en'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare transcripts of the MP3 against mono 16 kHz profiles")
+    parser.add_argument("wav_files", nargs="*", help="Sample WAV recordings (default: most recent in --dir)")
+    parser.add_argument("--dir", default=str(RECORDINGS_DIR), help=f"Recordings directory (default: {RECORDINGS_DIR})")
+    parser.add_argument("--samples", type=int, default=3, help="Number of recent recordings to sample (default: 3)")
+    parser.add_argument("--minutes", type=float, default=10, help="Minutes transcribed per sample (default: 10)")
+    parser.add_argument("--profiles", nargs="+", choices=[p for p in PROFILES if p != 'mp3'], default=['opus', 'flac'],
+                        help="Profiles to compare against the MP3 (default: opus flac)")
+    parser.add_argument("--language", help="Language code (default: from each recording's transcript or metadata)")
+    parser.add_argument("--max-wer", type=float, default=0.05, help="Fail when a profile's WER exceeds this (default: 0.05)")
+    parser.add_argument("--output", help="Report path (default: <dir>/.transcription/profiles-<timestamp>.json)")
+    args = parser.parse_args()
+
+    recordings_dir = Path(args.dir).expanduser()
+    if args.wav_files:
+        samples = [Path(p).expanduser().resolve() for p in args.wav_files]
+        missing = [str(p) for p in samples if not p.exists()]
+        if missing:
+            print(f"Error: File(s) not found: {', '.join(missing)}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        if not recordings_dir.exists():
+            print(f"Error: Recordings directory not found: {recordings_dir}", file=sys.stderr)
+            sys.exit(1)
+        samples = sorted(recordings_dir.glob("*.wav"), key=lambda p: p.stat().st_mtime, reverse=True)[:args.samples]
+        if not samples:
+            print(f"Error: No WAV recordings in {recordings_dir}", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"Comparing {', '.join(args.profiles)} against MP3 on {len(samples)} sample(s), {args.minutes:g} min each...")
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'minutes': args.minutes,
+        'max_wer': args.max_wer,
+        'samples': [],
+    }
+    with tempfile.TemporaryDirectory(prefix="transcription-profiles-") as work_dir:
+        for wav_path in samples:
+            try:
+                sample = compare_sample(wav_path, args.language or language_of(wav_path),
+                                        args.profiles, args.minutes, Path(work_dir))
+            except RuntimeError as e:
+                print(f"Error: {wav_path.name}: {e}", file=sys.stderr)
+                sys.exit(1)
+            report['samples'].append(sample)
+
+            print(f"\n{wav_path.name} (MP3: {sample['mp3_bytes'] / 1024 ** 2:.1f} MB)")
+            for profile, entry in sample['profiles'].items():
+                agreement = f"{entry['speaker_agreement'] * 100:.1f}%" if entry['speaker_agreement'] is not None else "n/a"
+                print(f"  {profile:5} {entry['bytes'] / 1024 ** 2:7.1f} MB ({entry['bytes_saved_percent']}% smaller)  "
+                      f"WER {entry['wer'] * 100:5.2f}%  speakers {agreement} "
+                      f"({entry['candidate_speakers']} vs {entry['reference_speakers']})")
+
+    failures = [(sample['wav'], profile) for sample in report['samples']
+                for profile, entry in sample['profiles'].items() if entry['wer'] > args.max_wer]
+    report['passed'] = not failures
+
+    output_path = Path(args.output) if args.output else \
+        recordings_dir / REPORT_DIRNAME / f"profiles-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Report saved to: {output_path}")
+
+    if failures:
+        for wav, profile in failures:
+            print(f"Error: {profile} exceeds WER {args.max_wer:.2%} on {Path(wav).name}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ All profiles within WER {args.max_wer:.2%} of the MP3 transcripts")
+
+
+if __name__ == '__main__':
+    main()
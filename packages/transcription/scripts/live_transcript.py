@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Convert a live transcription JSONL into a batch <name>_transcript.json.
+
+record-live logs every Speechmatics real-time message to a JSONL file. The
+final AddTranscript messages carry the same word/punctuation results as a
+batch job, so they are folded into the json-v2 shape formatTranscript.sh,
+recording_summary.py and backend-audio read, instead of uploading the
+recording again.
+
+The live transcript is only used when it meets the quality bar:
+- coverage: the words reach at least --min-coverage of the WAV duration
+  (the connection stayed up until the recording stopped)
+- gaps: no stretch without words longer than --max-gap-minutes (no dropouts)
+- confidence: mean word confidence of at least --min-confidence
+- speakers: at least --min-speakers diarized speaker labels (live sessions
+  without diarization only have UU)
+
+Exits 0 after writing the transcript, and 1 (without writing) when the live
+transcript is missing, unreadable or below the bar, so callers can fall back
+to a batch job.
+
+Usage: python live_transcript.py <live.jsonl> <recording.wav> --language en [--output <transcript.json>]
+"""
+
+import argparse
+import json
+import struct
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from recording_summary import write_json_atomic
+
+# The WAV header parser is shared with the retention script of the audio package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "audio" / "scripts"))
+from archive_recordings import wav_duration  # noqa: E402
+
+UNKNOWN_SPEAKER = 'UU'
+DEFAULT_MIN_COVERAGE = 0.9
+DEFAULT_MAX_GAP_MINUTES = 5.0
+DEFAULT_MIN_CONFIDENCE = 0.8
+DEFAULT_MIN_SPEAKERS = 1
+
+
+def read_final_results(jsonl_path):
+    """Results of all AddTranscript messages, in time order. Returns (results, skipped line count)."""
+    results = {}
+    skipped = 0
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                # The last line is cut off when the recorder is killed mid-write
+                skipped += 1
+                continue
+            if message.get('message') != 'AddTranscript':
+                continue
+            for item in message.get('results', []):
+                alternatives = item.get('alternatives') or [{}]
+                key = (item.get('type'), item.get('start_time'), item.get('end_time'), alternatives[0].get('content'))
+                results.setdefault(key, item)
+    ordered = sorted(results.values(), key=lambda item: (item.get('start_time', 0), item.get('end_time', 0)))
+    return ordered, skipped
+
+
+def assess(results, duration):
+    """Quality measures of the live results against the recording duration."""
+    words = [item for item in results if item.get('type') == 'word']
+    confidences = [(item.get('alternatives') or [{}])[0].get('confidence') for item in words]
+    confidences = [c for c in confidences if c is not None]
+    speakers = {(item.get('alternatives') or [{}])[0].get('speaker') for item in words}
+    speakers = sorted(s for s in speakers if s and s != UNKNOWN_SPEAKER)
+
+    # Longest stretch without words, including before the first and after the last word
+    edges = [0.0] + [t for item in words for t in (item['start_time'], item['end_time'])] + [duration]
+    longest_gap = max(edges[i + 1] - edges[i] for i in range(0, len(edges) - 1, 2)) if duration else 0.0
+    last_word_end = words[-1]['end_time'] if words else 0.0
+
+    return {
+        'words': len(words),
+        'coverage': round(min(last_word_end / duration, 1.0), 4) if duration else 0.0,
+        'longest_gap_seconds': round(max(longest_gap, 0.0), 2),
+        'mean_confidence': round(sum(confidences) / len(confidences), 4) if confidences else None,
+        'speakers': speakers,
+    }
+
+
+def quality_problems(quality, min_coverage, max_gap_minutes, min_confidence, min_speakers):
+    """Reasons the live transcript falls short of the quality bar (empty when it passes)."""
+    problems = []
+    if not quality['words']:
+        return ["no final words"]
+    if quality['coverage'] < min_coverage:
+        problems.append(f"coverage {quality['coverage']:.0%} < {min_coverage:.0%}")
+    if quality['longest_gap_seconds'] > max_gap_minutes * 60:
+        problems.append(f"gap of {quality['longest_gap_seconds'] / 60:.1f} min > {max_gap_minutes:g} min")
+    if quality['mean_confidence'] is not None and quality['mean_confidence'] < min_confidence:
+        problems.append(f"mean confidence {quality['mean_confidence']:.2f} < {min_confidence:.2f}")
+    if len(quality['speakers']) < min_speakers:
+        problems.append(f"{len(quality['speakers'])} diarized speaker(s) < {min_speakers}")
+    return problems
+
+
+def build_transcript(name, language, results, duration, quality, created_at):
+    """json-v2 transcript of the live results, shaped like a batch job's."""
+    return {
+        'format': '2.9',
+        'job': {
+            'created_at': created_at,
+            'data_name': f"{name}.mp3",
+            'duration': round(duration, 2),
+            'id': f"live-{name}",
+        },
+        'metadata': {
+            'created_at': created_at,
+            'type': 'transcription',
+            'transcription_config': {
+                'language': language,
+                'diarization': 'speaker' if quality['speakers'] else 'none',
+            },
+            'source': 'live',
+            'live_quality': quality,
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a live transcription JSONL into a batch transcript")
+    parser.add_argument("jsonl", type=Path, help="Live transcription JSONL written by record-live")
+    parser.add_argument("wav", type=Path, help="Recording WAV file")
+    parser.add_argument("--language", required=True, help="Language code of the recording (e.g. en, de)")
+    parser.add_argument("--output", type=Path, help="Transcript path (default: <recording>_transcript.json)")
+    parser.add_argument("--min-coverage", type=float, default=DEFAULT_MIN_COVERAGE,
+                        help=f"Minimum share of the recording the words reach (default: {DEFAULT_MIN_COVERAGE})")
+    parser.add_argument("--max-gap-minutes", type=float, default=DEFAULT_MAX_GAP_MINUTES,
+                        help=f"Maximum time without words (default: {DEFAULT_MAX_GAP_MINUTES})")
+    parser.add_argument("--min-confidence", type=float, default=DEFAULT_MIN_CONFIDENCE,
+                        help=f"Minimum mean word confidence (default: {DEFAULT_MIN_CONFIDENCE})")
+    parser.add_argument("--min-speakers", type=int, default=DEFAULT_MIN_SPEAKERS,
+                        help=f"Minimum diarized speakers, 0 to accept undiarized transcripts (default: {DEFAULT_MIN_SPEAKERS})")
+    args = parser.parse_args()
+
+    for path in (args.jsonl, args.wav):
+        if not path.exists():
+            print(f"Error: File not found: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        duration = wav_duration(args.wav)
+        results, skipped = read_final_results(args.jsonl)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    quality = assess(results, duration)
+    confidence = f"{quality['mean_confidence']:.2f}" if quality['mean_confidence'] is not None else "n/a"
+    print(f"Live transcript: {quality['words']} words over {duration / 60:.1f} min, "
+          f"coverage {quality['coverage']:.0%}, longest gap {quality['longest_gap_seconds']:.0f}s, "
+          f"confidence {confidence}, speakers: {', '.join(quality['speakers']) or 'none'}")
+    if skipped:
+        print(f"Skipped {skipped} unreadable line(s)")
+
+    problems = quality_problems(quality, args.min_coverage, args.max_gap_minutes, args.min_confidence, args.min_speakers)
+    if problems:
+        print(f"Error: Live transcript below quality bar: {'; '.join(problems)}", file=sys.stderr)
+        sys.exit(1)
+
+    name = args.wav.stem
+    output_path = args.output or args.wav.with_name(f"{name}_transcript.json")
+    created_at = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    write_json_atomic(output_path, build_transcript(name, args.language, results, duration, quality, created_at))
+    print(f"✓ Transcript saved to: {output_path} (from live transcription, {len(results)} items)")
+
+
+if __name__ == '__main__':
+    main()
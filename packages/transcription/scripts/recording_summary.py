@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Compact recording metadata for listings.
+
+Reads a recording's full Speechmatics transcript once and writes a small
+<name>.summary.json sidecar next to it (duration, language, speakers, word
+count, file sizes and pipeline stage timestamps), then updates the
+consolidated recordings.index.json, so listings read one file instead of
+parsing every multi-megabyte _transcript.json.
+
+Sidecars and the index are written atomically (temporary file + rename), and
+index updates are serialized with a lock file so concurrent pipeline runs do
+not lose each other's entries.
+
+Usage: python recording_summary.py update <meeting_name> [--dir <recordings_dir>] [--metadata <meta.json>]
+       python recording_summary.py remove <meeting_name> [--dir <recordings_dir>]
+       python recording_summary.py rename <old_name> <new_name> [--dir <recordings_dir>]
+       python recording_summary.py backfill [--dir <recordings_dir>] [--force] [--workers N]
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+RECORDINGS_DIR = Path.home() / "Documents" / "recordings"
+INDEX_FILENAME = "recordings.index.json"
+LOCK_FILENAME = ".recordings.index.lock"
+SUMMARY_VERSION = 1
+
+# Files summarized per recording: key -> file name suffix
+RECORDING_FILES = {
+    'wav': '.wav',
+    'mp3': '.mp3',
+    'flac': '.flac',
+    'opus': '.opus',
+    'transcript': '_transcript.json',
+}
+AUDIO_SUFFIXES = ('.wav', '.mp3', '.flac', '.opus')
+
+
+def isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def summary_path_for(recordings_dir: Path, name: str) -> Path:
+    return recordings_dir / f"{name}.summary.json"
+
+
+def recording_files(recordings_dir: Path, name: str) -> dict:
+    """Size and modification time of each existing file of a recording."""
+    files = {}
+    for key, suffix in RECORDING_FILES.items():
+        try:
+            stat = (recordings_dir / f"{name}{suffix}").stat()
+        except FileNotFoundError:
+            continue
+        files[key] = {'size': stat.st_size, 'modified_at': isoformat(stat.st_mtime)}
+    return files
+
+
+def summarize_transcript(transcript_path: Path) -> dict:
+    """Extract the listing fields from a Speechmatics json-v2 transcript."""
+    with open(transcript_path, 'r', encoding='utf-8') as f:
+        transcript = json.load(f)
+
+    job = transcript.get('job', {})
+    metadata = transcript.get('metadata', {})
+    config = metadata.get('transcription_config', {})
+
+    speakers = set()
+    word_count = 0
+    for result in transcript.get('results', []):
+        if result.get('type') != 'word':
+            continue
+        word_count += 1
+        alternatives = result.get('alternatives') or [{}]
+        speaker = alternatives[0].get('speaker')
+        if speaker:
+            speakers.add(speaker)
+
+    return {
+        'duration': job.get('duration'),
+        'language': config.get('language'),
+        'diarization': config.get('diarization'),
+        'job_id': job.get('id'),
+        'transcript_created_at': metadata.get('created_at'),
+        'speakers': sorted(speakers),
+        'word_count': word_count,
+    }
+
+
+def build_summary(recordings_dir: Path, name: str, metadata: dict = None) -> dict:
+    """
+    Summary of one recording. metadata is the recording's .meta.json content
+    (as written by the record command), used for the language and recording
+    time when there is no transcript yet.
+    """
+    metadata = metadata or {}
+    files = recording_files(recordings_dir, name)
+    if not files:
+        raise FileNotFoundError(f"No recording files found for '{name}' in {recordings_dir}")
+
+    summary = {
+        'version': SUMMARY_VERSION,
+        'name': name,
+        'duration': None,
+        'language': metadata.get('language'),
+        'diarization': None,
+        'job_id': None,
+        'transcript_created_at': None,
+        'speakers': [],
+        'word_count': 0,
+    }
+    if 'transcript' in files:
+        transcript = summarize_transcript(recordings_dir / f"{name}{RECORDING_FILES['transcript']}")
+        summary.update({key: value for key, value in transcript.items() if value is not None})
+
+    summary['files'] = files
+    summary['stages'] = {
+        # Archived WAVs (archive_recordings.py) keep the WAV's modification time
+        'recorded_at': metadata.get('timestamp') or next(
+            (files[key]['modified_at'] for key in ('wav', 'flac', 'opus') if key in files), None),
+        'converted_at': files.get('mp3', {}).get('modified_at'),
+        'transcribed_at': files.get('transcript', {}).get('modified_at'),
+        'summarized_at': isoformat(datetime.now(timezone.utc).timestamp()),
+    }
+    return summary
+
+
+def write_json_atomic(path: Path, value):
+    """Write JSON to a temporary file in the same directory and rename it into place."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(value, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_json(path: Path):
+    """Read a JSON file, returning None if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def index_lock(recordings_dir: Path):
+    """Hold an exclusive lock on the index while reading, changing and writing it."""
+    with open(recordings_dir / LOCK_FILENAME, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def read_index(recordings_dir: Path) -> dict:
+    index = read_json(recordings_dir / INDEX_FILENAME)
+    if not isinstance(index, dict) or index.get('version') != SUMMARY_VERSION:
+        return {}
+    return index.get('recordings', {})
+
+
+def write_index(recordings_dir: Path, recordings: dict):
+    write_json_atomic(recordings_dir / INDEX_FILENAME, {
+        'version': SUMMARY_VERSION,
+        'updated_at': isoformat(datetime.now(timezone.utc).timestamp()),
+        'total': len(recordings),
+        'recordings': recordings,
+    })
+
+
+def update_index(recordings_dir: Path, changes: dict = None, removed=()):
+    """Apply summaries (name -> summary) and removals to the index in one atomic write."""
+    with index_lock(recordings_dir):
+        recordings = read_index(recordings_dir)
+        recordings.update(changes or {})
+        for name in removed:
+            recordings.pop(name, None)
+        write_index(recordings_dir, recordings)
+
+
+def update_recording(recordings_dir: Path, name: str, metadata: dict = None) -> dict:
+    """Write the sidecar of one recording and add it to the index."""
+    summary = build_summary(recordings_dir, name, metadata)
+    write_json_atomic(summary_path_for(recordings_dir, name), summary)
+    update_index(recordings_dir, {name: summary})
+    return summary
+
+
+def remove_recording(recordings_dir: Path, name: str) -> bool:
+    """Delete the sidecar of a recording and drop it from the index. Returns whether a sidecar existed."""
+    path = summary_path_for(recordings_dir, name)
+    existed = path.exists()
+    path.unlink(missing_ok=True)
+    update_index(recordings_dir, removed=[name])
+    return existed
+
+
+def rename_recording(recordings_dir: Path, old_name: str, new_name: str) -> dict:
+    """
+    Move a recording's sidecar and index entry to its new name after its files
+    were renamed. The transcript content is unchanged, so it is not parsed again
+    unless the old sidecar is missing.
+    """
+    old_path = summary_path_for(recordings_dir, old_name)
+    summary = read_json(old_path)
+    if not isinstance(summary, dict) or summary.get('version') != SUMMARY_VERSION:
+        summary = build_summary(recordings_dir, new_name)
+    else:
+        summary.update({'name': new_name, 'files': recording_files(recordings_dir, new_name)})
+    write_json_atomic(summary_path_for(recordings_dir, new_name), summary)
+    old_path.unlink(missing_ok=True)
+    update_index(recordings_dir, {new_name: summary}, removed=[old_name])
+    return summary
+
+
+def recording_names(recordings_dir: Path) -> list:
+    """Meeting names of all recordings with an audio file or a transcript."""
+    names = set()
+    for path in recordings_dir.iterdir():
+        if path.suffix.lower() in AUDIO_SUFFIXES:
+            names.add(path.stem)
+        elif path.name.endswith(RECORDING_FILES['transcript']):
+            names.add(path.name[:-len(RECORDING_FILES['transcript'])])
+    return sorted(names)
+
+
+def is_current(summary, recordings_dir: Path, name: str) -> bool:
+    """Whether a sidecar still describes the recording's files (same sizes and modification times)."""
+    return (
+        isinstance(summary, dict)
+        and summary.get('version') == SUMMARY_VERSION
+        and summary.get('files') == recording_files(recordings_dir, name)
+    )
+
+
+def backfill_one(recordings_dir: Path, name: str, force: bool):
+    """Return (name, summary, written) for one recording, rewriting its sidecar only if stale."""
+    path = summary_path_for(recordings_dir, name)
+    existing = read_json(path)
+    if not force and is_current(existing, recordings_dir, name):
+        return name, existing, False
+
+    # Keep the recording time from the pipeline run if the sidecar had one
+    stages = existing.get('stages', {}) if isinstance(existing, dict) else {}
+    recorded_at = stages.get('recorded_at')
+    summary = build_summary(recordings_dir, name, {'timestamp': recorded_at} if recorded_at else None)
+    write_json_atomic(path, summary)
+    return name, summary, True
+
+
+def backfill(recordings_dir: Path, force: bool = False, workers: int = None):
+    """Write missing or stale sidecars for every recording and bring the index up to date with them."""
+    names = recording_names(recordings_dir)
+    workers = min(len(names), max(1, workers or os.cpu_count() or 1))
+    summaries = {}
+    written = 0
+    failed = []
+
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+        futures = {name: pool.submit(backfill_one, recordings_dir, name, force) for name in names} if pool else {}
+        for name in names:
+            try:
+                _, summary, changed = futures[name].result() if pool else backfill_one(recordings_dir, name, force)
+            except (OSError, ValueError) as e:
+                failed.append((name, e))
+                continue
+            summaries[name] = summary
+            written += changed
+
+    # Merge into the current index instead of replacing it: pipeline runs may have
+    # updated entries while the sidecars were scanned, and those are kept if they
+    # still match the recording's files
+    with index_lock(recordings_dir):
+        recordings = read_index(recordings_dir)
+        for name, summary in summaries.items():
+            if not is_current(recordings.get(name), recordings_dir, name):
+                recordings[name] = summary
+        for name in set(recordings) - set(recording_names(recordings_dir)):
+            del recordings[name]
+        write_index(recordings_dir, recordings)
+    return len(names), written, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write recording summary sidecars and the recordings index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    update_parser = subparsers.add_parser("update", help="Summarize one recording and update the index")
+    update_parser.add_argument("name", help="Meeting name (recording file name without extension)")
+    update_parser.add_argument("--metadata", type=Path, help="The recording's metadata file (.meta.json or .processing)")
+
+    remove_parser = subparsers.add_parser("remove", help="Delete a recording's sidecar and drop it from the index")
+    remove_parser.add_argument("name", help="Meeting name")
+
+    rename_parser = subparsers.add_parser("rename", help="Move a sidecar and index entry to a renamed recording")
+    rename_parser.add_argument("old_name", help="Previous meeting name")
+    rename_parser.add_argument("new_name", help="New meeting name (files already renamed)")
+
+    backfill_parser = subparsers.add_parser("backfill", help="Summarize all existing recordings and update the index")
+    backfill_parser.add_argument("--force", action="store_true", help="Rewrite sidecars even if they are current")
+    backfill_parser.add_argument("--workers", type=int, default=None,
+                                 help="Transcripts parsed in parallel (default: one per CPU)")
+
+    for subparser in (update_parser, remove_parser, rename_parser, backfill_parser):
+        subparser.add_argument("--dir", type=Path, default=RECORDINGS_DIR,
+                               help=f"Recordings directory (default: {RECORDINGS_DIR})")
+
+    args = parser.parse_args()
+
+    if not args.dir.is_dir():
+        print(f"Error: Recordings directory not found: {args.dir}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "update":
+        metadata = None
+        if args.metadata:
+            metadata = read_json(args.metadata)
+            if metadata is None:
+                print(f"Warning: Could not read metadata file: {args.metadata}", file=sys.stderr)
+        try:
+            summary = update_recording(args.dir, args.name, metadata)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not summarize recording '{args.name}': {e}", file=sys.stderr)
+            sys.exit(1)
+        speakers = len(summary['speakers'])
+        print(f"✓ Summary written: {summary_path_for(args.dir, args.name)}")
+        print(f"   {summary['duration']} s, {summary['language']}, {summary['word_count']} words, {speakers} speaker(s)")
+        print(f"✓ Index updated: {args.dir / INDEX_FILENAME}")
+
+    elif args.command == "remove":
+        existed = remove_recording(args.dir, args.name)
+        print(f"✓ Removed '{args.name}' from the recordings index" + ("" if existed else " (no sidecar found)"))
+
+    elif args.command == "rename":
+        try:
+            rename_recording(args.dir, args.old_name, args.new_name)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not rename summary of '{args.old_name}': {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✓ Renamed summary: {args.old_name}.summary.json -> {args.new_name}.summary.json")
+
+    else:
+        total, written, failed = backfill(args.dir, args.force, args.workers)
+        print(f"✓ {written} of {total} sidecar(s) written, {total - written - len(failed)} already current")
+        print(f"✓ Index updated: {args.dir / INDEX_FILENAME} ({total - len(failed)} recordings)")
+        for name, error in failed:
+            print(f"Error: Could not summarize recording '{name}': {error}", file=sys.stderr)
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,28 +1,28 @@
 #!/bin/bash
 
 # Script to transcribe audio using Speechmatics with speaker diarization
-# Usage: ./transcribeAudio.sh <input_file.mp3> <language_code>
+# Usage: ./transcribeAudio.sh <input_file.mp3|.ogg|.flac> <language_code>
 # Output: Creates <input_file>_transcript.json in the same directory
 
 if [ $# -ne 2 ]; then
-    echo "Usage: $0 <input_file.mp3> <language_code>"
+    echo "Usage: $0 <input_file.mp3|.ogg|.flac> <language_code>"
     echo "Example: $0 recording.mp3 en"
     echo "Common language codes: en (English), es (Spanish), fr (French), de (German), it (Italian)"
     exit 1
 fi
 
-MP3_FILE="$1"
+AUDIO_FILE="$1"
 LANGUAGE="$2"
 
 # Check if input file exists
-if [ ! -f "$MP3_FILE" ]; then
-    echo "Error: File '$MP3_FILE' not found"
+if [ ! -f "$AUDIO_FILE" ]; then
+    echo "Error: File '$AUDIO_FILE' not found"
     exit 1
 fi
 
-# Validate file extension
-if [[ ! "$MP3_FILE" =~ \.mp3$ ]]; then
-    echo "Error: Input file must have .mp3 extension"
+# Validate file extension (the MP3, or the transcription derivative made by convertToMp3.sh)
+if [[ ! "$AUDIO_FILE" =~ \.(mp3|ogg|flac)$ ]]; then
+    echo "Error: Input file must have .mp3, .ogg or .flac extension"
     exit 1
 fi
 
@@ -48,20 +48,27 @@ if [ -z "$SPEECHMATICS_API_KEY" ]; then
     exit 1
 fi
 
+# Speechmatics batch API (override to point at a local or regional endpoint)
+SPEECHMATICS_API_URL="${SPEECHMATICS_API_URL:-https://asr.api.speechmatics.com/v2}"
+
 # Generate transcript filename (same name, add _transcript.json)
-TRANSCRIPT_FILE="${MP3_FILE%.mp3}_transcript.json"
+TRANSCRIPT_FILE="${AUDIO_FILE%.*}_transcript.json"
 
 echo "Uploading to Speechmatics for transcription..."
-echo "Input:    $MP3_FILE"
+echo "Input:    $AUDIO_FILE"
 echo "Language: $LANGUAGE"
 echo "Output:   $TRANSCRIPT_FILE"
 
-# Submit job with diarization enabled
-RESPONSE=$(curl -s -L -X POST 'https://asr.api.speechmatics.com/v2/jobs' \
+# Submit job with diarization enabled (curl appends the upload size and time as a last line)
+RESPONSE=$(curl -s -L -X POST "$SPEECHMATICS_API_URL/jobs" \
+    -w '\n%{size_upload} %{time_total}' \
     -H "Authorization: Bearer $SPEECHMATICS_API_KEY" \
-    -F "data_file=@$MP3_FILE" \
+    -F "data_file=@$AUDIO_FILE" \
     -F "config={\"type\":\"transcription\",\"transcription_config\":{\"language\":\"$LANGUAGE\",\"diarization\":\"speaker\"}}")
 
+UPLOAD_STATS=$(echo "$RESPONSE" | tail -n 1)
+RESPONSE=$(echo "$RESPONSE" | sed '$d')
+
 # Extract job ID
 JOB_ID=$(echo "$RESPONSE" | jq -r '.id')
 
@@ -72,11 +79,12 @@ if [ "$JOB_ID" = "null" ] || [ -z "$JOB_ID" ]; then
 fi
 
 echo "Job submitted successfully. Job ID: $JOB_ID"
+echo "Upload: ${UPLOAD_STATS% *} bytes in ${UPLOAD_STATS#* } s"
 echo "Waiting for transcription to complete..."
 
 # Poll for job completion
 while true; do
-    STATUS_RESPONSE=$(curl -s -X GET "https://asr.api.speechmatics.com/v2/jobs/$JOB_ID" \
+    STATUS_RESPONSE=$(curl -s -X GET "$SPEECHMATICS_API_URL/jobs/$JOB_ID" \
         -H "Authorization: Bearer $SPEECHMATICS_API_KEY")
 
     STATUS=$(echo "$STATUS_RESPONSE" | jq -r '.job.status')
@@ -95,7 +103,7 @@ done
 
 # Retrieve transcript
 echo "Downloading transcript..."
-curl -s -X GET "https://asr.api.speechmatics.com/v2/jobs/$JOB_ID/transcript" \
+curl -s -X GET "$SPEECHMATICS_API_URL/jobs/$JOB_ID/transcript" \
     -H "Authorization: Bearer $SPEECHMATICS_API_KEY" \
     -o "$TRANSCRIPT_FILE"
 
@@ -0,0 +1,39 @@
+#!/bin/bash
+
+# Script to transcribe a recording, reusing its live transcription when good enough
+# Usage: ./transcribeRecording.sh <input_file.wav> <language_code> [live_transcript.jsonl]
+# Output: Creates <input_file>_transcript.json in the same directory
+# The live JSONL (from record-live) is converted when it meets the quality bar
+# (LIVE_TRANSCRIPT_MIN_COVERAGE, LIVE_TRANSCRIPT_MAX_GAP_MINUTES,
+# LIVE_TRANSCRIPT_MIN_CONFIDENCE, LIVE_TRANSCRIPT_MIN_SPEAKERS); otherwise the
+# recording is sent to Speechmatics with transcribeSegmented.sh
+
+if [ $# -lt 2 ] || [ $# -gt 3 ]; then
+    echo "Usage: $0 <input_file.wav> <language_code> [live_transcript.jsonl]"
+    echo "Example: $0 recording.wav en ~/Documents/live-transcriptions/recording.jsonl"
+    exit 1
+fi
+
+WAV_FILE="$1"
+LANGUAGE="$2"
+LIVE_JSONL="${3:-}"
+
+# Get the directory where this script is located
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+if [ -n "$LIVE_JSONL" ]; then
+    echo "Checking live transcription: $LIVE_JSONL"
+    if python3 "$SCRIPT_DIR/live_transcript.py" "$LIVE_JSONL" "$WAV_FILE" \
+        --language "$LANGUAGE" \
+        --min-coverage "${LIVE_TRANSCRIPT_MIN_COVERAGE:-0.9}" \
+        --max-gap-minutes "${LIVE_TRANSCRIPT_MAX_GAP_MINUTES:-5}" \
+        --min-confidence "${LIVE_TRANSCRIPT_MIN_CONFIDENCE:-0.8}" \
+        --min-speakers "${LIVE_TRANSCRIPT_MIN_SPEAKERS:-1}"; then
+        # The transcription upload made by convertToMp3.sh is not needed
+        rm -f "$(dirname "$WAV_FILE")/.transcription/$(basename "${WAV_FILE%.wav}")".{ogg,flac}
+        exit 0
+    fi
+    echo "Falling back to batch transcription..."
+fi
+
+bash "$SCRIPT_DIR/transcribeSegmented.sh" "$WAV_FILE" "$LANGUAGE"
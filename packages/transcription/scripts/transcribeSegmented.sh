@@ -0,0 +1,41 @@
+#!/bin/bash
+
+# Script to transcribe a recording as parallel Speechmatics jobs split at silences
+# Usage: ./transcribeSegmented.sh <input_file.wav> <language_code>
+# Output: Creates <input_file>_transcript.json in the same directory
+# Recordings up to TRANSCRIBE_MAX_SEGMENT_MINUTES (default 15) are sent as one job
+# Audio is uploaded in TRANSCRIPTION_PROFILE: opus (default), flac or mp3
+
+if [ $# -ne 2 ]; then
+    echo "Usage: $0 <input_file.wav> <language_code>"
+    echo "Example: $0 recording.wav en"
+    exit 1
+fi
+
+WAV_FILE="$1"
+LANGUAGE="$2"
+
+# Check if input file exists
+if [ ! -f "$WAV_FILE" ]; then
+    echo "Error: File '$WAV_FILE' not found"
+    exit 1
+fi
+
+# Validate file extension
+if [[ ! "$WAV_FILE" =~ \.wav$ ]]; then
+    echo "Error: Input file must have .wav extension"
+    exit 1
+fi
+
+# Absolute path, since the Python script runs from the script directory
+WAV_FILE="$(cd "$(dirname "$WAV_FILE")" && pwd)/$(basename "$WAV_FILE")"
+
+# Get the directory where this script is located
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Call Python script using uv (must run from the script directory for uv to find the venv)
+cd "$SCRIPT_DIR"
+uv run transcribe_segmented.py "$WAV_FILE" "$LANGUAGE" \
+    --max-segment-minutes "${TRANSCRIBE_MAX_SEGMENT_MINUTES:-15}" \
+    --workers "${TRANSCRIBE_WORKERS:-4}" \
+    --profile "${TRANSCRIPTION_PROFILE:-opus}"
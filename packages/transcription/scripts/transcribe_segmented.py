@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Transcribe a long recording as parallel Speechmatics jobs split at silences.
+
+Memory-maps the WAV, computes frame energies block by block and cuts the
+recording at the longest pauses so that no segment exceeds the maximum length.
+Each segment is encoded with the transcription profile (mono 16 kHz Opus by
+default) and transcribed with transcribeAudio.sh, with up to --workers
+segments in flight. The segment transcripts are stitched into
+one Speechmatics json-v2 <name>_transcript.json next to the WAV:
+- word and punctuation times are shifted by the segment's start time
+- speaker labels (S1, S2, ...) are assigned per segment by Speechmatics, so
+  each segment's speakers are matched to the speakers seen so far by voice
+  (long-term average spectrum and median pitch) and relabelled consistently
+
+Recordings no longer than one segment are sent as one job, using the
+transcription derivative convertToMp3.sh wrote to .transcription/ (or the MP3).
+Bytes and time spent uploading, compared with the MP3, are printed and
+appended to .transcription/uploads.jsonl.
+
+Usage: python transcribe_segmented.py <recording.wav> <language> [--max-segment-minutes 15] [--workers 4]
+                                      [--profile opus|flac|mp3]
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import struct
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from recording_summary import write_json_atomic
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+TRANSCRIBE_SCRIPT = SCRIPT_DIR / "transcribeAudio.sh"
+SPEECH_DIRNAME = ".transcription"
+UPLOADS_LOG = "uploads.jsonl"
+
+# Transcription encode profiles (same settings as convertToMp3.sh): (extension, ffmpeg arguments)
+PROFILES = {
+    'opus': ('ogg', ['-ac', '1', '-ar', '16000', '-codec:a', 'libopus', '-b:a', '32k', '-application', 'voip']),
+    'flac': ('flac', ['-ac', '1', '-ar', '16000', '-codec:a', 'flac', '-sample_fmt', 's16']),
+    'mp3': ('mp3', ['-codec:a', 'libmp3lame', '-qscale:a', '2']),
+}
+DEFAULT_PROFILE = 'opus'
+# Printed by transcribeAudio.sh after submitting a job
+UPLOAD_LINE = re.compile(r"^Upload: ([\d.]+) bytes in ([\d.]+) s$", re.MULTILINE)
+
+FRAME_SECONDS = 0.02
+BLOCK_SECONDS = 60
+DEFAULT_MAX_SEGMENT_MINUTES = 15
+DEFAULT_WORKERS = 4
+# A pause counts as silence when it stays this far above the noise floor
+SILENCE_MARGIN_DB = 10
+MIN_SILENCE_SECONDS = 0.4
+
+# Speaker matching
+PROFILE_SECONDS = 60
+PROFILE_BANDS = 32
+PROFILE_WINDOW = 2048
+PITCH_RANGE_HZ = (60, 400)
+DEFAULT_SPEAKER_THRESHOLD = 0.6
+UNKNOWN_SPEAKER = "UU"
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def open_wav(path):
+    """Memory-map the sample data of a PCM or float WAV. Returns (samples[frames, channels], sample_rate)."""
+    with open(path, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f"{path} is not a WAV file")
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                body = f.read(size + size % 2)
+                format_tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', body[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE:
+                    format_tag = struct.unpack('<H', body[24:26])[0]
+                fmt = (format_tag, channels, sample_rate, bits)
+            elif chunk_id == b'data':
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + size % 2, os.SEEK_CUR)
+
+    if fmt is None:
+        raise ValueError(f"{path} has no fmt chunk")
+    format_tag, channels, sample_rate, bits = fmt
+    dtypes = {(WAVE_FORMAT_IEEE_FLOAT, 32): '<f4', (WAVE_FORMAT_IEEE_FLOAT, 64): '<f8',
+              (WAVE_FORMAT_PCM, 16): '<i2', (WAVE_FORMAT_PCM, 32): '<i4'}
+    if (format_tag, bits) not in dtypes:
+        raise ValueError(f"Unsupported WAV format {format_tag} with {bits} bits")
+
+    # Recordings stopped abruptly can have a wrong data size; trust the file size
+    frame_bytes = channels * bits // 8
+    frames = (os.path.getsize(path) - offset) // frame_bytes
+    samples = np.memmap(path, dtype=dtypes[(format_tag, bits)], mode='r', offset=offset, shape=(frames, channels))
+    return samples, sample_rate
+
+
+def to_mono(block):
+    """Float mono mix of a block of samples, scaled to [-1, 1]."""
+    mono = block.mean(axis=1, dtype=np.float64)
+    if np.issubdtype(block.dtype, np.integer):
+        mono /= np.iinfo(block.dtype).max
+    return mono
+
+
+def frame_energy_db(samples, sample_rate):
+    """Energy in dBFS of consecutive FRAME_SECONDS frames, computed block by block."""
+    hop = int(sample_rate * FRAME_SECONDS)
+    block_frames = hop * int(BLOCK_SECONDS / FRAME_SECONDS)
+    energies = []
+    for start in range(0, len(samples) - hop + 1, block_frames):
+        mono = to_mono(samples[start:start + block_frames])
+        usable = len(mono) - len(mono) % hop
+        power = np.square(mono[:usable]).reshape(-1, hop).mean(axis=1)
+        energies.append(10 * np.log10(power + 1e-12))
+    return np.concatenate(energies) if energies else np.zeros(0)
+
+
+def find_silences(energy_db, margin_db=SILENCE_MARGIN_DB, min_seconds=MIN_SILENCE_SECONDS):
+    """Pauses as (start, end) seconds: runs of frames within margin_db of the noise floor."""
+    if not len(energy_db):
+        return []
+    threshold = np.percentile(energy_db, 10) + margin_db
+    quiet = np.concatenate(([False], energy_db < threshold, [False]))
+    edges = np.flatnonzero(np.diff(quiet.astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+    keep = (ends - starts) * FRAME_SECONDS >= min_seconds
+    return [(start * FRAME_SECONDS, end * FRAME_SECONDS) for start, end in zip(starts[keep], ends[keep])]
+
+
+def plan_segments(duration, silences, energy_db, max_seconds):
+    """
+    Split [0, duration] into segments of at most max_seconds. Each cut goes in the middle
+    of the longest pause in the last third of the window, or anywhere that leaves both
+    sides at least a third of max_seconds, and falls back to the quietest frame.
+    """
+    min_seconds = max_seconds / 3
+    segments = []
+    start = 0.0
+    while duration - start > max_seconds:
+        high = min(start + max_seconds, duration - min_seconds)
+        for low in (start + 2 * min_seconds, start + min_seconds):
+            candidates = [(end - begin, (begin + end) / 2) for begin, end in silences
+                          if low <= (begin + end) / 2 <= high]
+            if candidates:
+                cut = max(candidates)[1]
+                break
+        else:
+            first, last = int(low / FRAME_SECONDS), int(high / FRAME_SECONDS)
+            cut = (first + int(np.argmin(energy_db[first:last + 1]))) * FRAME_SECONDS
+        segments.append((start, float(cut)))
+        start = float(cut)
+    segments.append((start, duration))
+    return segments
+
+
+def encode_segment(wav_path, start, end, output_path, profile):
+    """Encode one segment of the WAV with a transcription profile."""
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', '-ss', f"{start:.3f}", '-t', f"{end - start:.3f}", '-i', str(wav_path),
+         *PROFILES[profile][1], str(output_path)],
+        capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Encoding {output_path.name} failed: {result.stderr.strip()}")
+
+
+def transcribe_file(audio_path, language):
+    """Run transcribeAudio.sh on an audio file. Returns (transcript, {'bytes', 'seconds'} uploaded)."""
+    result = subprocess.run(['bash', str(TRANSCRIBE_SCRIPT), str(audio_path), language],
+                            capture_output=True, text=True)
+    transcript_path = audio_path.with_name(f"{audio_path.stem}_transcript.json")
+    if result.returncode != 0 or not transcript_path.exists():
+        output = (result.stdout + result.stderr).strip().splitlines()[-5:]
+        raise RuntimeError(f"Transcribing {audio_path.name} failed:\n" + "\n".join(output))
+    with open(transcript_path, 'r') as f:
+        transcript = json.load(f)
+    match = UPLOAD_LINE.search(result.stdout)
+    upload = {'bytes': int(float(match.group(1))), 'seconds': float(match.group(2))} if match else \
+        {'bytes': audio_path.stat().st_size, 'seconds': None}
+    return transcript, upload
+
+
+def report_uploads(wav_path, profile, uploads, duration):
+    """Print upload bytes and time against uploading the MP3, and append them to the uploads log."""
+    mp3_path = wav_path.with_suffix('.mp3')
+    uploaded = sum(upload['bytes'] for upload in uploads)
+    timed = [upload for upload in uploads if upload['seconds'] is not None]
+    seconds = sum(upload['seconds'] for upload in timed) if timed else None
+    mp3_bytes = mp3_path.stat().st_size if mp3_path.exists() else None
+
+    entry = {
+        'name': wav_path.stem,
+        'timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'profile': profile,
+        'audio_seconds': round(duration, 2),
+        'jobs': len(uploads),
+        'uploaded_bytes': uploaded,
+        'upload_seconds': round(seconds, 3) if seconds is not None else None,
+        'mp3_bytes': mp3_bytes,
+    }
+    message = f"Uploaded {uploaded / 1024 ** 2:.1f} MB ({profile}, {len(uploads)} job(s))"
+    if seconds is not None:
+        message += f" in {seconds:.1f} s"
+    if mp3_bytes and uploaded:
+        entry['saved_bytes'] = mp3_bytes - uploaded
+        ratio = 1 - uploaded / mp3_bytes
+        message += f"; the MP3 is {mp3_bytes / 1024 ** 2:.1f} MB ({abs(ratio) * 100:.0f}% {'smaller' if ratio >= 0 else 'larger'}"
+        if seconds:
+            # At the same throughput the MP3 would have taken proportionally longer
+            entry['estimated_saved_seconds'] = round(seconds * (mp3_bytes / uploaded - 1), 3)
+            message += f", about {abs(entry['estimated_saved_seconds']):.1f} s {'less' if ratio >= 0 else 'more'} uploading"
+        message += ")"
+    print(message)
+
+    log_path = wav_path.parent / SPEECH_DIRNAME / UPLOADS_LOG
+    log_path.parent.mkdir(exist_ok=True)
+    with open(log_path, 'a') as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def speaker_intervals(results):
+    """Word time ranges per speaker label, relative to the segment."""
+    intervals = {}
+    for item in results:
+        alternatives = item.get('alternatives') or [{}]
+        speaker = alternatives[0].get('speaker')
+        if item.get('type') == 'word' and speaker and speaker != UNKNOWN_SPEAKER:
+            intervals.setdefault(speaker, []).append((item['start_time'], item['end_time']))
+    return intervals
+
+
+def voice_profile(samples, sample_rate, intervals):
+    """
+    Voice profile of one speaker: mean-normalised log band energies (long-term average
+    spectrum) and median pitch over up to PROFILE_SECONDS of their longest words.
+    Returns (bands, pitch_hz or None, seconds) or None if there is too little audio.
+    """
+    windows = []
+    seconds = 0.0
+    for start, end in sorted(intervals, key=lambda interval: interval[0] - interval[1]):
+        first, last = int(start * sample_rate), min(int(end * sample_rate), len(samples))
+        count = max(last - first, 0) // PROFILE_WINDOW
+        if count:
+            mono = to_mono(samples[first:first + count * PROFILE_WINDOW])
+            windows.append(mono.reshape(count, PROFILE_WINDOW))
+            seconds += count * PROFILE_WINDOW / sample_rate
+        if seconds >= PROFILE_SECONDS:
+            break
+    if not windows:
+        return None
+
+    frames = np.vstack(windows) * np.hanning(PROFILE_WINDOW)
+    power = np.square(np.abs(np.fft.rfft(frames, axis=1)))
+    frequencies = np.fft.rfftfreq(PROFILE_WINDOW, 1 / sample_rate)
+    edges = np.geomspace(80, min(8000, sample_rate / 2), PROFILE_BANDS + 1)
+    band_index = np.digitize(frequencies, edges) - 1
+    valid = (band_index >= 0) & (band_index < PROFILE_BANDS)
+    bands = np.bincount(band_index[valid], weights=power.mean(axis=0)[valid], minlength=PROFILE_BANDS)
+    bands = np.log10(bands + 1e-12)
+    bands -= bands.mean()
+
+    # Pitch from the autocorrelation peak of voiced windows
+    autocorrelation = np.fft.irfft(power, axis=1)
+    min_lag, max_lag = int(sample_rate / PITCH_RANGE_HZ[1]), int(sample_rate / PITCH_RANGE_HZ[0])
+    lags = autocorrelation[:, min_lag:max_lag]
+    peaks = lags.argmax(axis=1)
+    strength = lags[np.arange(len(lags)), peaks] / np.maximum(autocorrelation[:, 0], 1e-12)
+    voiced = strength > 0.3
+    pitch = float(np.median(sample_rate / (peaks[voiced] + min_lag))) if voiced.any() else None
+    return bands, pitch, seconds
+
+
+def profile_similarity(a, b):
+    """Cosine similarity of band profiles, reduced by the pitch difference in octaves."""
+    similarity = float(np.dot(a[0], b[0]) / (np.linalg.norm(a[0]) * np.linalg.norm(b[0]) + 1e-12))
+    if a[1] and b[1]:
+        similarity -= abs(math.log2(a[1] / b[1]))
+    return similarity
+
+
+class SpeakerRegistry:
+    """Recording-wide speakers; matches each segment's local labels against them."""
+
+    def __init__(self, threshold=DEFAULT_SPEAKER_THRESHOLD):
+        self.threshold = threshold
+        self.profiles = {}
+
+    def new_label(self):
+        return f"S{len(self.profiles) + 1}"
+
+    def reconcile(self, local_profiles, order):
+        """Map local labels (in order of first appearance) to recording-wide labels."""
+        pairs = sorted(((profile_similarity(profile, known), local, label)
+                        for local, profile in local_profiles.items() if profile
+                        for label, known in self.profiles.items() if known), reverse=True)
+        mapping = {}
+        for similarity, local, label in pairs:
+            if similarity < self.threshold:
+                break
+            if local not in mapping and label not in mapping.values():
+                mapping[local] = label
+
+        for local in order:
+            profile = local_profiles.get(local)
+            if local not in mapping:
+                mapping[local] = self.new_label()
+                self.profiles[mapping[local]] = profile
+            elif profile:
+                self.profiles[mapping[local]] = merge_profiles(self.profiles[mapping[local]], profile)
+        return mapping
+
+
+def merge_profiles(known, profile):
+    """Duration-weighted average of two profiles."""
+    if known is None:
+        return profile
+    (bands_a, pitch_a, seconds_a), (bands_b, pitch_b, seconds_b) = known, profile
+    total = seconds_a + seconds_b
+    bands = (bands_a * seconds_a + bands_b * seconds_b) / total
+    pitches = [(pitch, seconds) for pitch, seconds in ((pitch_a, seconds_a), (pitch_b, seconds_b)) if pitch]
+    pitch = sum(pitch * seconds for pitch, seconds in pitches) / sum(seconds for _, seconds in pitches) if pitches else None
+    return bands, pitch, total
+
+
+def stitch(name, segments, transcripts, samples, sample_rate, duration, threshold):
+    """Merge segment transcripts into one json-v2 transcript of the whole recording."""
+    registry = SpeakerRegistry(threshold)
+    results = []
+    for (start, end), transcript in zip(segments, transcripts):
+        segment_results = transcript.get('results', [])
+        intervals = speaker_intervals(segment_results)
+        segment_samples = samples[int(start * sample_rate):int(end * sample_rate)]
+        local_profiles = {speaker: voice_profile(segment_samples, sample_rate, spans)
+                          for speaker, spans in intervals.items()}
+        order = [speaker for speaker in dict.fromkeys(
+            (item.get('alternatives') or [{}])[0].get('speaker') for item in segment_results)
+            if speaker and speaker != UNKNOWN_SPEAKER]
+        mapping = registry.reconcile(local_profiles, order)
+
+        for item in segment_results:
+            item = dict(item)
+            for key in ('start_time', 'end_time'):
+                if key in item:
+                    item[key] = round(item[key] + start, 3)
+            item['alternatives'] = [
+                {**alternative, 'speaker': mapping.get(alternative.get('speaker'), alternative.get('speaker'))}
+                if 'speaker' in alternative else alternative
+                for alternative in item.get('alternatives', [])
+            ]
+            results.append(item)
+
+    first = transcripts[0]
+    job = dict(first.get('job', {}))
+    job['data_name'] = f"{name}.mp3"
+    job['duration'] = round(duration) if isinstance(job.get('duration'), int) else round(duration, 2)
+    return {
+        **{key: value for key, value in first.items() if key not in ('job', 'results')},
+        'job': job,
+        'segments': [
+            {'start_time': round(start, 3), 'end_time': round(end, 3), 'job_id': transcript.get('job', {}).get('id')}
+            for (start, end), transcript in zip(segments, transcripts)
+        ],
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe a long recording as parallel segments split at silences")
+    parser.add_argument("wav", type=Path, help="Recording WAV file")
+    parser.add_argument("language", help="Language code (e.g. en, de)")
+    parser.add_argument("--max-segment-minutes", type=float, default=DEFAULT_MAX_SEGMENT_MINUTES,
+                        help=f"Maximum segment length (default: {DEFAULT_MAX_SEGMENT_MINUTES})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Segments transcribed at once (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--speaker-threshold", type=float, default=DEFAULT_SPEAKER_THRESHOLD,
+                        help=f"Minimum voice similarity to treat speakers in two segments as the same "
+                             f"(default: {DEFAULT_SPEAKER_THRESHOLD})")
+    parser.add_argument("--profile", choices=PROFILES, default=DEFAULT_PROFILE,
+                        help=f"Encode profile of the uploaded audio (default: {DEFAULT_PROFILE})")
+    parser.add_argument("--dry-run", action="store_true", help="Print the segment plan without transcribing")
+    args = parser.parse_args()
+
+    wav_path = args.wav.resolve()
+    if not wav_path.exists() or wav_path.suffix != '.wav':
+        print(f"Error: WAV file not found: {args.wav}", file=sys.stderr)
+        sys.exit(1)
+    if args.max_segment_minutes <= 0 or args.workers < 1:
+        print("Error: --max-segment-minutes and --workers must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    name = wav_path.stem
+    output_path = wav_path.with_name(f"{name}_transcript.json")
+    try:
+        samples, sample_rate = open_wav(wav_path)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    duration = len(samples) / sample_rate
+    max_seconds = args.max_segment_minutes * 60
+    energy_db = frame_energy_db(samples, sample_rate)
+    silences = find_silences(energy_db)
+    segments = plan_segments(duration, silences, energy_db, max_seconds)
+
+    print(f"Recording: {wav_path} ({duration / 60:.1f} min, {len(silences)} pauses)")
+    for i, (start, end) in enumerate(segments, 1):
+        print(f"  Segment {i}: {start:8.2f}s - {end:8.2f}s ({(end - start) / 60:.1f} min)")
+    if args.dry_run:
+        sys.exit(0)
+
+    extension = PROFILES[args.profile][0]
+    mp3_path = wav_path.with_suffix('.mp3')
+    speech_path = wav_path.parent / SPEECH_DIRNAME / f"{name}.{extension}"
+    upload_path = speech_path if args.profile != 'mp3' and speech_path.exists() else mp3_path
+
+    if len(segments) == 1 and upload_path.exists():
+        # Short recording: one job on the file made by convertToMp3.sh
+        try:
+            transcript, upload = transcribe_file(upload_path, args.language)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        transcript['job']['data_name'] = mp3_path.name
+        write_json_atomic(output_path, transcript)
+        uploads = [upload]
+    else:
+        with tempfile.TemporaryDirectory(prefix=f".{name}.segments-", dir=wav_path.parent) as work_dir:
+            def run(index, segment):
+                segment_path = Path(work_dir) / f"{name}_part{index:02d}.{extension}"
+                encode_segment(wav_path, *segment, segment_path, args.profile)
+                result = transcribe_file(segment_path, args.language)
+                print(f"  ✓ Segment {index} transcribed ({segment[1] - segment[0]:.0f}s)")
+                return result
+
+            print(f"Transcribing {len(segments)} segments, {args.workers} at a time...")
+            try:
+                with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                    transcripts, uploads = zip(*pool.map(run, range(1, len(segments) + 1), segments))
+            except RuntimeError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+
+        transcript = stitch(name, segments, transcripts, samples, sample_rate, duration, args.speaker_threshold)
+        write_json_atomic(output_path, transcript)
+
+    # The derivative is only needed until the transcript exists
+    if speech_path.exists():
+        speech_path.unlink()
+        speech_path.with_name(f"{speech_path.stem}_transcript.json").unlink(missing_ok=True)
+    report_uploads(wav_path, args.profile, uploads, duration)
+    speakers = sorted({alternative.get('speaker') for item in transcript['results']
+                       for alternative in item.get('alternatives', []) if alternative.get('speaker')})
+    print(f"✓ Transcript saved to: {output_path} ({len(transcript['results'])} items, speakers: {', '.join(speakers)})")
+
+
+if __name__ == '__main__':
+    main()
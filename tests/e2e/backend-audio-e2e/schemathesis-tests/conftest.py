@@ -1,5 +1,12 @@
+import sys
+from pathlib import Path
+
 import pytest
 
+# Shared latency budget plugin: tests/e2e/latency locally, mounted at /latency in Docker
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "latency"))
+pytest_plugins = ["latency_budgets"]
+
 def pytest_addoption(parser):
     parser.addoption(
         "--base-url",
@@ -8,6 +15,36 @@ def pytest_addoption(parser):
         help="Base URL for the API under test"
     )
 
+    # Recordings benchmark options (test_recordings_scaling.py)
+    group = parser.getgroup("scale", "Recordings listing benchmark")
+    group.addoption("--recordings-dir", type=Path, default=Path("/data/recordings"),
+                    help="Directory to generate recordings into; the backend's RECORDINGS_DIR (default: /data/recordings)")
+    group.addoption("--scale-sizes", default="100,1000,10000",
+                    help="Comma-separated numbers of recordings to measure at (default: 100,1000,10000)")
+    group.addoption("--scale-list-requests", type=int, default=10,
+                    help="List requests measured per size (default: 10)")
+    group.addoption("--scale-get-requests", type=int, default=50,
+                    help="Get requests measured per size, for existing and for missing ids (default: 50)")
+    group.addoption("--scale-link-transcripts", action="store_true",
+                    help="Hard-link identical transcripts instead of writing copies (much less disk)")
+    group.addoption("--scale-report", type=Path, default=Path("recordings-scaling-report.json"),
+                    help="Where to write the JSON report (default: ./recordings-scaling-report.json)")
+    group.addoption("--scale-baseline", type=Path, default=None,
+                    help="Earlier JSON report to compare this run against")
+
 @pytest.fixture
 def base_url(request):
     return request.config.getoption("--base-url")
+
+@pytest.fixture
+def scale_config(request):
+    option = request.config.getoption
+    return {
+        "recordings_dir": option("--recordings-dir"),
+        "sizes": [int(size) for size in option("--scale-sizes").split(",") if size.strip()],
+        "list_requests": option("--scale-list-requests"),
+        "get_requests": option("--scale-get-requests"),
+        "link_transcripts": option("--scale-link-transcripts"),
+        "report": option("--scale-report"),
+        "baseline": option("--scale-baseline"),
+    }
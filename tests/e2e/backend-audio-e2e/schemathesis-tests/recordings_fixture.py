@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Synthetic recordings directory for backend-audio benchmarks.
+
+Populates a RECORDINGS_DIR the way the recording pipeline leaves it:
+<name>.wav (48 kHz stereo float32, as recorded), <name>.mp3 (converted) and
+<name>_transcript.json (Speechmatics json-v2 with word-level results), with
+file modification times spread back in time from the newest recording.
+
+Audio files are stubs: a valid header followed by a sparse hole, so their
+size matches the recording length without using disk space. Transcripts are
+full-size (about 2.5 words per second, 1.5 MB per hour of audio), because
+reading and parsing them is what the backend spends its time on. Recordings
+are numbered and generated deterministically, so growing a directory from 100
+to 1000 recordings only adds the missing ones.
+
+Usage: python recordings_fixture.py <recordings_dir> --count 1000 [--link-transcripts]
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# As recorded by recordAudio.sh: 48 kHz, stereo, 32-bit float
+WAV_SAMPLE_RATE = 48000
+WAV_CHANNELS = 2
+WAV_BYTES_PER_SAMPLE = 4
+# convertToMp3.sh uses LAME VBR -q:a 2, about 190 kbit/s
+MP3_BYTES_PER_SECOND = 190_000 // 8
+MP3_FRAME_HEADER = b'\xff\xfb\x90\x64'
+
+# Conversational speech, about 2.5 words per second including pauses
+WORD_SECONDS = (0.15, 0.45)
+PAUSE_SECONDS = (0.0, 0.1)
+SENTENCE_PAUSE_SECONDS = (0.2, 1.0)
+WORDS_PER_SENTENCE = (6, 18)
+SPEAKERS = ['S1', 'S2', 'S3', 'S4']
+LANGUAGES = {'en': 'English', 'de': 'German'}
+VOCABULARY = {
+    'en': ("we the decision should migrate service platform team release next week budget option risk "
+           "cluster latency deploy review agree pipeline customer data model vehicle segment incident "
+           "owner timeline question approach architecture backlog sprint estimate").split(),
+    'de': ("wir die Entscheidung sollten migrieren Dienst Plattform Team Release nächste Woche Budget "
+           "Option Risiko Cluster Latenz ausrollen prüfen einverstanden Pipeline Kunde Daten Modell "
+           "Fahrzeug Segment Störung Verantwortlich Zeitplan Frage Ansatz Architektur").split(),
+}
+
+# Transcript bodies are reused for recordings of the same language and length (in minutes)
+DURATION_STEP_SECONDS = 60
+
+NEWEST_RECORDING = datetime(2025, 6, 30, 17, 0, tzinfo=timezone.utc)
+HOURS_BETWEEN_RECORDINGS = 5
+
+
+def wav_header(data_bytes):
+    """RIFF/WAVE header for IEEE float PCM (format tag 3)."""
+    block_align = WAV_CHANNELS * WAV_BYTES_PER_SAMPLE
+    return (
+        b'RIFF' + struct.pack('<I', 36 + data_bytes) + b'WAVE'
+        + b'fmt ' + struct.pack('<IHHIIHH', 16, 3, WAV_CHANNELS, WAV_SAMPLE_RATE,
+                                WAV_SAMPLE_RATE * block_align, block_align, WAV_BYTES_PER_SAMPLE * 8)
+        + b'data' + struct.pack('<I', data_bytes)
+    )
+
+
+def write_stub(path, header, size):
+    """Write header and extend the file to size bytes as a sparse hole."""
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.truncate(max(size, len(header)))
+
+
+def transcript_results(language, duration, seed):
+    """Speechmatics json-v2 'results': words with speaker labels, sentences ending in punctuation."""
+    rng = random.Random(f"{seed}-{language}-{duration}")
+    vocabulary = VOCABULARY[language]
+    results = []
+    time = 0.0
+    speaker = SPEAKERS[0]
+
+    while time < duration:
+        if rng.random() < 0.3:
+            speaker = rng.choice(SPEAKERS)
+        for i in range(rng.randint(*WORDS_PER_SENTENCE)):
+            length = rng.uniform(*WORD_SECONDS)
+            content = rng.choice(vocabulary)
+            results.append({
+                'alternatives': [{
+                    'confidence': round(rng.uniform(0.6, 1.0), 2),
+                    'content': content if i else content.capitalize(),
+                    'language': language,
+                    'speaker': speaker,
+                }],
+                'end_time': round(time + length, 2),
+                'start_time': round(time, 2),
+                'type': 'word',
+            })
+            time += length + rng.uniform(*PAUSE_SECONDS)
+        end = round(min(time, duration), 2)
+        results.append({
+            'alternatives': [{'confidence': 1.0, 'content': '.', 'language': language, 'speaker': speaker}],
+            'attaches_to': 'previous',
+            'end_time': end,
+            'is_eos': True,
+            'start_time': end,
+            'type': 'punctuation',
+        })
+        time += rng.uniform(*SENTENCE_PAUSE_SECONDS)
+    return results
+
+
+def transcript_header(name, language, duration, created_at, rng):
+    """Job and metadata part of a Speechmatics json-v2 transcript (everything but results)."""
+    created = created_at.isoformat().replace('+00:00', 'Z')
+    return {
+        'format': '2.9',
+        'job': {
+            'created_at': created,
+            'data_name': f"{name}.mp3",
+            'duration': duration,
+            'id': ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(10)),
+        },
+        'metadata': {
+            'created_at': created,
+            'type': 'transcription',
+            'language_pack_info': {
+                'adapted': False,
+                'itn': True,
+                'language_description': LANGUAGES[language],
+                'word_delimiter': ' ',
+                'writing_direction': 'left-to-right',
+            },
+            'transcription_config': {
+                'diarization': 'speaker',
+                'language': language,
+                'operating_point': 'enhanced',
+            },
+        },
+    }
+
+
+class RecordingsFixture:
+    """Generates numbered synthetic recordings into one directory."""
+
+    def __init__(self, directory, seed=0, min_minutes=10, max_minutes=60, mp3_ratio=0.9,
+                 transcript_ratio=0.8, link_transcripts=False):
+        self.directory = Path(directory)
+        self.seed = seed
+        self.min_minutes = min_minutes
+        self.max_minutes = max_minutes
+        self.mp3_ratio = mp3_ratio
+        self.transcript_ratio = transcript_ratio
+        # Hard-link transcripts of the same language and length to one file (saves disk, hides read I/O)
+        self.link_transcripts = link_transcripts
+        self.bodies = {}
+        self.pool = {}
+
+    def recording(self, index):
+        """Name and properties of recording number index (deterministic)."""
+        rng = random.Random(f"{self.seed}-{index}")
+        recorded_at = NEWEST_RECORDING - timedelta(hours=index * HOURS_BETWEEN_RECORDINGS, minutes=rng.randint(0, 59))
+        minutes = rng.randint(self.min_minutes, self.max_minutes)
+        return {
+            'name': recorded_at.strftime('%Y%m%d_%H%M%S'),
+            'recorded_at': recorded_at,
+            'duration': minutes * DURATION_STEP_SECONDS + rng.randint(0, DURATION_STEP_SECONDS - 1),
+            'language': rng.choice(list(LANGUAGES)),
+            'has_mp3': rng.random() < self.mp3_ratio,
+            'has_transcript': rng.random() < self.transcript_ratio,
+            'rng': rng,
+        }
+
+    def results_json(self, language, duration):
+        """Serialized results array, shared by transcripts of the same language and length."""
+        key = (language, duration // DURATION_STEP_SECONDS)
+        if key not in self.bodies:
+            self.bodies[key] = json.dumps(transcript_results(language, key[1] * DURATION_STEP_SECONDS, self.seed))
+        return self.bodies[key]
+
+    def write_transcript(self, path, recording):
+        language, duration = recording['language'], recording['duration']
+        key = (language, duration // DURATION_STEP_SECONDS)
+        if self.link_transcripts and key in self.pool:
+            os.link(self.pool[key], path)
+            return
+
+        transcribed_at = recording['recorded_at'] + timedelta(seconds=duration + 300)
+        header = transcript_header(recording['name'], language, duration, transcribed_at, recording['rng'])
+        # Splice the cached results into the header JSON instead of re-serializing them
+        text = json.dumps(header)[:-1] + ', "results": ' + self.results_json(language, duration) + '}'
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(text, encoding='utf-8')
+        tmp_path.replace(path)
+        self.pool.setdefault(key, path)
+
+    def create(self, index):
+        """Write recording number index unless it exists. Returns the number of files written."""
+        recording = self.recording(index)
+        name = recording['name']
+        wav_path = self.directory / f"{name}.wav"
+        if wav_path.exists():
+            return 0
+
+        duration = recording['duration']
+        timestamp = recording['recorded_at'].timestamp()
+        written = []
+
+        if recording['has_transcript']:
+            path = self.directory / f"{name}_transcript.json"
+            self.write_transcript(path, recording)
+            written.append(path)
+        if recording['has_mp3']:
+            path = self.directory / f"{name}.mp3"
+            write_stub(path, MP3_FRAME_HEADER, duration * MP3_BYTES_PER_SECOND)
+            written.append(path)
+
+        data_bytes = duration * WAV_SAMPLE_RATE * WAV_CHANNELS * WAV_BYTES_PER_SAMPLE
+        # The WAV is written last: its presence marks the recording as complete
+        write_stub(wav_path, wav_header(data_bytes), 44 + data_bytes)
+        written.append(wav_path)
+
+        for path in written:
+            os.utime(path, (timestamp + duration, timestamp + duration))
+        return len(written)
+
+    def populate(self, count, progress=None):
+        """Make sure recordings 0..count-1 exist. Returns the number of files written."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for index in range(count):
+            written += self.create(index)
+            if progress and (index + 1) % 1000 == 0:
+                progress(index + 1, count)
+        return written
+
+    def audio_files(self):
+        """Names of the audio files in the directory (what listRecordings returns)."""
+        return sorted(
+            path.name for path in self.directory.iterdir()
+            if path.suffix.lower() in ('.wav', '.mp3')
+        )
+
+    def ids(self, count):
+        """Recording ids (base names) of recordings 0..count-1."""
+        return [self.recording(index)['name'] for index in range(count)]
+
+
+def directory_size(directory):
+    """Bytes allocated on disk (sparse audio stubs count only their header) and apparent size."""
+    allocated = apparent = 0
+    seen = set()
+    for path in Path(directory).iterdir():
+        stat = path.stat()
+        apparent += stat.st_size
+        if stat.st_ino not in seen:
+            seen.add(stat.st_ino)
+            allocated += stat.st_blocks * 512
+    return allocated, apparent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Populate a recordings directory with synthetic recordings")
+    parser.add_argument("directory", type=Path, help="Recordings directory (RECORDINGS_DIR of backend-audio)")
+    parser.add_argument("--count", type=int, required=True, help="Number of recordings the directory should hold")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for names, lengths and transcripts (default: 0)")
+    parser.add_argument("--min-minutes", type=int, default=10, help="Shortest recording (default: 10)")
+    parser.add_argument("--max-minutes", type=int, default=60, help="Longest recording (default: 60)")
+    parser.add_argument("--mp3-ratio", type=float, default=0.9,
+                        help="Share of recordings converted to MP3 (default: 0.9)")
+    parser.add_argument("--transcript-ratio", type=float, default=0.8,
+                        help="Share of recordings with a transcript (default: 0.8)")
+    parser.add_argument("--link-transcripts", action="store_true",
+                        help="Hard-link identical transcripts instead of writing copies (much less disk)")
+    args = parser.parse_args()
+
+    if args.count < 0 or not 0 < args.min_minutes <= args.max_minutes:
+        print("Error: --count must be >= 0 and 0 < --min-minutes <= --max-minutes", file=sys.stderr)
+        sys.exit(1)
+
+    fixture = RecordingsFixture(args.directory, args.seed, args.min_minutes, args.max_minutes,
+                                args.mp3_ratio, args.transcript_ratio, args.link_transcripts)
+
+    def progress(done, total):
+        print(f"   {done}/{total} recordings")
+
+    print(f"📁 Populating {args.directory} with {args.count} recordings...")
+    written = fixture.populate(args.count, progress)
+    allocated, apparent = directory_size(args.directory)
+    print(f"✓ Wrote {written} files; {len(fixture.audio_files())} audio files in the directory")
+    print(f"   {allocated / 1024 ** 2:.0f} MB on disk ({apparent / 1024 ** 3:.1f} GB apparent, audio stubs are sparse)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""
+Recordings listing benchmark for backend-audio.
+
+Grows a synthetic recordings directory (see recordings_fixture.py) through the
+configured sizes (100, 1000, 10000 recordings by default) and measures at each
+size:
+1. GET /api/recordings latency and response size
+2. GET /api/recordings/{id} latency for existing recordings
+3. GET /api/recordings/{id} latency for a missing recording (404)
+
+The backend must use the same directory as RECORDINGS_DIR; the benchmark
+checks that the listing matches the files it generated. Results are written as
+a JSON report; pass an earlier report with --scale-baseline to compare runs.
+
+Not part of the default e2e run. Example:
+    pytest test_recordings_scaling.py --base-url=http://localhost:13003 \\
+        --recordings-dir=/data/recordings --scale-sizes=100,1000,10000 \\
+        --scale-report=/reports/recordings-scaling.json -s
+"""
+
+import json
+import math
+import random
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from recordings_fixture import RecordingsFixture, directory_size
+
+# Id that never matches a generated recording (those are named YYYYMMDD_HHMMSS)
+MISSING_ID = "no-such-recording"
+REQUEST_TIMEOUT_SECONDS = 600
+
+# Metrics compared against a baseline report: (path, label)
+COMPARED_METRICS = [
+    (("list", "p50"), "List p50 (ms)"),
+    (("list", "p95"), "List p95 (ms)"),
+    (("get", "p50"), "Get p50 (ms)"),
+    (("get", "p95"), "Get p95 (ms)"),
+    (("get_missing", "p50"), "Get missing p50 (ms)"),
+]
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_ms(seconds):
+    """Latency summary in milliseconds."""
+    values = sorted(value * 1000 for value in seconds)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min": round(values[0], 3),
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def timed_get(session, url):
+    """GET url and return (seconds until the body is read, response)."""
+    start = time.perf_counter()
+    response = session.get(url, timeout=REQUEST_TIMEOUT_SECONDS)
+    _ = response.content
+    return time.perf_counter() - start, response
+
+
+def measure_size(session, base_url, fixture, size, config, rng):
+    """Grow the directory to size recordings and measure list and get latency."""
+    generate_start = time.perf_counter()
+    fixture.populate(size)
+    generate_seconds = time.perf_counter() - generate_start
+    audio_files = fixture.audio_files()
+    allocated, _ = directory_size(fixture.directory)
+
+    list_url = f"{base_url.rstrip('/')}/api/recordings"
+    # First request after growing the directory, reported separately from the repeated ones
+    first_seconds, response = timed_get(session, list_url)
+    assert response.status_code == 200, f"List failed with {response.status_code}: {response.text[:200]}"
+    listing = response.json()
+    list_bytes = len(response.content)
+    assert listing["total"] == len(audio_files), \
+        f"Backend lists {listing['total']} recordings, directory has {len(audio_files)} (same RECORDINGS_DIR?)"
+
+    list_seconds = []
+    for _ in range(config["list_requests"]):
+        seconds, response = timed_get(session, list_url)
+        assert response.status_code == 200
+        list_seconds.append(seconds)
+
+    ids = fixture.ids(size)
+    get_seconds = []
+    for recording_id in rng.choices(ids, k=config["get_requests"]):
+        seconds, response = timed_get(session, f"{list_url}/{recording_id}")
+        assert response.status_code == 200, f"Get {recording_id} failed with {response.status_code}"
+        assert response.json()["id"] == recording_id
+        get_seconds.append(seconds)
+
+    missing_seconds = []
+    for _ in range(config["get_requests"]):
+        seconds, response = timed_get(session, f"{list_url}/{MISSING_ID}")
+        assert response.status_code == 404
+        missing_seconds.append(seconds)
+
+    return {
+        "recordings": size,
+        "audio_files": len(audio_files),
+        "transcripts": sum(1 for recording in listing["recordings"] if recording["hasTranscript"]),
+        "disk_mb": round(allocated / 1024 ** 2, 1),
+        "generate_seconds": round(generate_seconds, 3),
+        "list_response_kb": round(list_bytes / 1024, 1),
+        "list_first_ms": round(first_seconds * 1000, 3),
+        "list": summarize_ms(list_seconds),
+        "get": summarize_ms(get_seconds),
+        "get_missing": summarize_ms(missing_seconds),
+    }
+
+
+def metric(result, path):
+    value = result
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def print_results(results):
+    print(f"\n{'recordings':>10} {'files':>7} {'list p50':>10} {'list p95':>10} {'list KB':>9} "
+          f"{'get p50':>9} {'get p95':>9} {'404 p50':>9}  (ms)")
+    for result in results:
+        print(f"{result['recordings']:>10} {result['audio_files']:>7} {result['list']['p50']:>10} "
+              f"{result['list']['p95']:>10} {result['list_response_kb']:>9} {result['get']['p50']:>9} "
+              f"{result['get']['p95']:>9} {result['get_missing']['p50']:>9}")
+
+    def growth(previous, result, key):
+        before, now = previous[key].get("p50"), result[key].get("p50")
+        return f"x{now / before:.1f}" if before and now is not None else "n/a"
+
+    for previous, result in zip(results, results[1:]):
+        print(f"   {previous['recordings']} -> {result['recordings']} recordings "
+              f"(x{result['recordings'] / previous['recordings']:g}): list p50 {growth(previous, result, 'list')}, "
+              f"get p50 {growth(previous, result, 'get')}")
+
+
+def print_comparison(report, baseline):
+    """Print each compared metric per size next to the baseline, with the relative change."""
+    print(f"\nCompared with baseline run ({baseline.get('timestamp')}):")
+    previous_sizes = {result["recordings"]: result for result in baseline.get("sizes", [])}
+    for result in report["sizes"]:
+        previous = previous_sizes.get(result["recordings"])
+        if previous is None:
+            continue
+        print(f"   {result['recordings']} recordings:")
+        for path, label in COMPARED_METRICS:
+            current, before = metric(result, path), metric(previous, path)
+            if current is None or before is None:
+                continue
+            change = (current - before) / before * 100 if before else 0.0
+            flag = " (worse)" if change >= 10 else ""
+            print(f"      {label:<22} {before:>12} -> {current:<12} {change:+.1f}%{flag}")
+
+
+def test_recordings_listing_scaling(base_url, scale_config):
+    """
+    Benchmark listing and getting recordings as the recordings directory grows.
+
+    Verifies at every size that:
+    1. The listing contains every generated audio file
+    2. Existing recordings are found by id, missing ones return 404
+    """
+    fixture = RecordingsFixture(scale_config["recordings_dir"], link_transcripts=scale_config["link_transcripts"])
+    rng = random.Random(0)
+    results = []
+
+    with requests.Session() as session:
+        for size in sorted(scale_config["sizes"]):
+            print(f"\n📁 {size} recordings...")
+            result = measure_size(session, base_url, fixture, size, scale_config, rng)
+            print(f"   generated in {result['generate_seconds']} s ({result['disk_mb']} MB on disk), "
+                  f"list p50 {result['list']['p50']} ms, get p50 {result['get']['p50']} ms")
+            results.append(result)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "base_url": base_url,
+        "config": {key: str(value) if key == "recordings_dir" else value
+                   for key, value in scale_config.items() if key not in ("report", "baseline")},
+        "sizes": results,
+    }
+    report_path = scale_config["report"]
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2) + "\n")
+
+    print_results(results)
+    print(f"Report written to {report_path}")
+    if scale_config["baseline"]:
+        print_comparison(report, json.loads(scale_config["baseline"].read_text()))
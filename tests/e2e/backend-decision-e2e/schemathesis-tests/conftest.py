@@ -1,5 +1,12 @@
+import sys
+from pathlib import Path
+
 import pytest
 
+# Shared latency budget plugin: tests/e2e/latency locally, mounted at /latency in Docker
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "latency"))
+pytest_plugins = ["latency_budgets"]
+
 def pytest_addoption(parser):
     parser.addoption(
         "--base-url",
@@ -1,8 +1,15 @@
 """
-Pytest configuration for configurable base URL.
+Pytest configuration for configurable base URL and load benchmark settings.
 """
+import sys
+from pathlib import Path
+
 import pytest
 
+# Shared latency budget plugin: tests/e2e/latency locally, mounted at /latency in Docker
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "latency"))
+pytest_plugins = ["latency_budgets"]
+
 
 def pytest_addoption(parser):
     """Add custom command line option for base URL."""
@@ -13,8 +20,42 @@ def pytest_addoption(parser):
         help="Base URL for the backend service (default: http://backend-socket:3001 for local Docker testing)",
     )
 
+    # Load benchmark options (test_socket_broadcast_load.py)
+    group = parser.getgroup("load", "Socket.IO fan-out load benchmark")
+    group.addoption("--load-clients", type=int, default=100, help="Concurrent Socket.IO clients (default: 100)")
+    group.addoption("--load-channels", type=int, default=10, help="Channels the clients are spread over (default: 10)")
+    group.addoption("--load-rate", type=float, default=100.0, help="Broadcasts published per second (default: 100)")
+    group.addoption("--load-duration", type=float, default=10.0, help="Seconds to publish for (default: 10)")
+    group.addoption("--load-drain", type=float, default=2.0,
+                    help="Seconds to wait for in-flight messages after publishing (default: 2)")
+    group.addoption("--load-transport", choices=["websocket", "polling"], default="websocket",
+                    help="Socket.IO transport used by the clients (default: websocket)")
+    group.addoption("--load-max-loss", type=float, default=0.0,
+                    help="Highest acceptable fraction of lost deliveries (default: 0)")
+    group.addoption("--load-report", type=Path, default=Path("socket-load-report.json"),
+                    help="Where to write the JSON report (default: ./socket-load-report.json)")
+    group.addoption("--load-baseline", type=Path, default=None,
+                    help="Earlier JSON report to compare this run against")
+
 
 @pytest.fixture(scope="session")
 def base_url(request):
     """Fixture to provide base URL to tests."""
     return request.config.getoption("--base-url")
+
+
+@pytest.fixture(scope="session")
+def load_config(request):
+    """Fixture to provide the load benchmark settings."""
+    option = request.config.getoption
+    return {
+        "clients": option("--load-clients"),
+        "channels": option("--load-channels"),
+        "rate": option("--load-rate"),
+        "duration": option("--load-duration"),
+        "drain": option("--load-drain"),
+        "transport": option("--load-transport"),
+        "max_loss": option("--load-max-loss"),
+        "report": option("--load-report"),
+        "baseline": option("--load-baseline"),
+    }
@@ -0,0 +1,273 @@
+"""
+Socket.IO fan-out load benchmark for backend-socket.
+
+Connects N async Socket.IO clients spread over M channels, publishes to
+/api/broadcast at a fixed rate and measures:
+1. End-to-end delivery latency percentiles (publish to client handler)
+2. Message loss and duplicates per subscribed client
+3. Server-side throughput (accepted broadcasts/s and deliveries/s) and HTTP latency
+
+Latency is measured from each message's scheduled publish time, so a backlog
+in the publisher or the server shows up as latency instead of being hidden.
+Results are written as a JSON report; pass an earlier report with
+--load-baseline to compare runs.
+
+Not part of the default e2e run. Example:
+    pytest test_socket_broadcast_load.py --base-url=http://localhost:13001 \\
+        --load-clients=500 --load-channels=20 --load-rate=200 --load-duration=30 \\
+        --load-report=/reports/socket-load.json -s
+"""
+
+import asyncio
+import json
+import math
+import time
+import uuid
+from datetime import datetime, timezone
+
+import aiohttp
+import socketio
+
+# Parallel connection attempts while the clients are being set up
+CONNECT_CONCURRENCY = 50
+
+# Metrics compared against a baseline report: (section, metric, label, lower is better)
+COMPARED_METRICS = [
+    ("delivery", ("latency_ms", "p50"), "Delivery latency p50 (ms)", True),
+    ("delivery", ("latency_ms", "p95"), "Delivery latency p95 (ms)", True),
+    ("delivery", ("latency_ms", "p99"), "Delivery latency p99 (ms)", True),
+    ("delivery", ("loss_ratio",), "Loss ratio", True),
+    ("delivery", ("deliveries_per_second",), "Deliveries/s", False),
+    ("publish", ("accepted_per_second",), "Accepted broadcasts/s", False),
+    ("publish", ("http_latency_ms", "p95"), "HTTP latency p95 (ms)", True),
+]
+
+
+def channel_name(index):
+    return f"load-channel-{index}"
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_ms(seconds):
+    """Latency summary in milliseconds."""
+    values = sorted(value * 1000 for value in seconds)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min": round(values[0], 3),
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(percentile(values, 50), 3),
+        "p90": round(percentile(values, 90), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+class Subscriber:
+    """One Socket.IO client listening on one channel."""
+
+    def __init__(self, channel, run_id):
+        self.channel = channel
+        self.run_id = run_id
+        self.latencies = []
+        self.seen = set()
+        self.duplicates = 0
+        self.last_received = None
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on(channel, self.on_message)
+
+    async def on_message(self, data):
+        received = time.perf_counter()
+        # Ignore broadcasts from other runs or other tests sharing the server
+        if not isinstance(data, dict) or data.get("run") != self.run_id:
+            return
+        if data["seq"] in self.seen:
+            self.duplicates += 1
+            return
+        self.seen.add(data["seq"])
+        self.latencies.append(received - data["sent_at"])
+        self.last_received = received
+
+
+async def connect_subscribers(base_url, config, run_id):
+    """Connect all clients, round-robin over the channels. Returns (connected, failed)."""
+    subscribers = [Subscriber(channel_name(i % config["channels"]), run_id) for i in range(config["clients"])]
+    semaphore = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+    async def connect(subscriber):
+        async with semaphore:
+            try:
+                await subscriber.sio.connect(base_url, transports=[config["transport"]], wait_timeout=10)
+                return True
+            except (socketio.exceptions.ConnectionError, asyncio.TimeoutError):
+                return False
+
+    results = await asyncio.gather(*(connect(subscriber) for subscriber in subscribers))
+    connected = [subscriber for subscriber, ok in zip(subscribers, results) if ok]
+    return connected, len(subscribers) - len(connected)
+
+
+async def publish(session, base_url, config, run_id):
+    """
+    Publish broadcasts round-robin over the channels at the configured rate.
+
+    Requests are started on schedule without waiting for earlier responses
+    (open loop). Returns one (seq, channel, status, HTTP seconds, clientCount)
+    tuple per broadcast.
+    """
+    url = f"{base_url.rstrip('/')}/api/broadcast"
+    total = int(config["rate"] * config["duration"])
+    interval = 1 / config["rate"]
+    results = []
+
+    async def send(seq, scheduled):
+        channel = channel_name(seq % config["channels"])
+        body = {"channel": channel, "payload": {"run": run_id, "seq": seq, "sent_at": scheduled}}
+        start = time.perf_counter()
+        try:
+            async with session.post(url, json=body) as response:
+                data = await response.json()
+                results.append((seq, channel, response.status, time.perf_counter() - start, data.get("clientCount")))
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            results.append((seq, channel, None, time.perf_counter() - start, None))
+
+    tasks = []
+    first = time.perf_counter() + 0.05
+    for seq in range(total):
+        scheduled = first + seq * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(seq, scheduled)))
+    await asyncio.gather(*tasks)
+
+    return results, first
+
+
+async def run_load(base_url, config):
+    """Run one load scenario and return the report."""
+    run_id = uuid.uuid4().hex
+
+    connect_start = time.perf_counter()
+    subscribers, failed_connections = await connect_subscribers(base_url, config, run_id)
+    connect_seconds = time.perf_counter() - connect_start
+
+    try:
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout, connector=aiohttp.TCPConnector(limit=100)) as session:
+            results, publish_start = await publish(session, base_url, config, run_id)
+            publish_seconds = time.perf_counter() - publish_start
+            await asyncio.sleep(config["drain"])
+    finally:
+        await asyncio.gather(*(subscriber.sio.disconnect() for subscriber in subscribers), return_exceptions=True)
+
+    subscribers_per_channel = {}
+    for subscriber in subscribers:
+        subscribers_per_channel[subscriber.channel] = subscribers_per_channel.get(subscriber.channel, 0) + 1
+
+    accepted = [result for result in results if result[2] == 200]
+    expected = sum(subscribers_per_channel.get(channel, 0) for _, channel, _, _, _ in accepted)
+    received = sum(len(subscriber.seen) for subscriber in subscribers)
+    latencies = [latency for subscriber in subscribers for latency in subscriber.latencies]
+    last_received = max((s.last_received for s in subscribers if s.last_received is not None), default=None)
+    delivery_seconds = (last_received - publish_start) if last_received else None
+    client_counts = sorted(count for *_, count in accepted if count is not None)
+
+    return {
+        "run_id": run_id,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "base_url": base_url,
+        "config": {key: value for key, value in config.items() if key not in ("report", "baseline")},
+        "clients": {
+            "connected": len(subscribers),
+            "failed": failed_connections,
+            "connect_seconds": round(connect_seconds, 3),
+            "server_client_count_p50": percentile(client_counts, 50),
+        },
+        "publish": {
+            "sent": len(results),
+            "accepted": len(accepted),
+            "failed": len(results) - len(accepted),
+            "seconds": round(publish_seconds, 3),
+            "accepted_per_second": round(len(accepted) / publish_seconds, 2) if publish_seconds else None,
+            "http_latency_ms": summarize_ms([seconds for _, _, _, seconds, _ in results]),
+        },
+        "delivery": {
+            "expected": expected,
+            "received": received,
+            "lost": expected - received,
+            "loss_ratio": round((expected - received) / expected, 6) if expected else 0.0,
+            "duplicates": sum(subscriber.duplicates for subscriber in subscribers),
+            "deliveries_per_second": round(received / delivery_seconds, 2) if delivery_seconds else None,
+            "latency_ms": summarize_ms(latencies),
+        },
+    }
+
+
+def metric(report, section, path):
+    value = report.get(section, {})
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def print_report(report):
+    clients, publish, delivery = report["clients"], report["publish"], report["delivery"]
+    latency = delivery["latency_ms"]
+    print(f"\nClients: {clients['connected']} connected, {clients['failed']} failed "
+          f"({clients['connect_seconds']} s to connect)")
+    print(f"Publish: {publish['accepted']}/{publish['sent']} accepted, {publish['accepted_per_second']} /s, "
+          f"HTTP p95 {publish['http_latency_ms'].get('p95')} ms")
+    print(f"Delivery: {delivery['received']}/{delivery['expected']} received "
+          f"(loss {delivery['loss_ratio']:.4%}, {delivery['duplicates']} duplicates), "
+          f"{delivery['deliveries_per_second']} /s")
+    print(f"Latency (ms): p50 {latency.get('p50')}  p95 {latency.get('p95')}  "
+          f"p99 {latency.get('p99')}  max {latency.get('max')}")
+
+
+def print_comparison(report, baseline):
+    """Print each compared metric next to the baseline, with the relative change."""
+    print(f"\nCompared with baseline run {baseline.get('run_id')} ({baseline.get('timestamp')}):")
+    for section, path, label, lower_is_better in COMPARED_METRICS:
+        current, previous = metric(report, section, path), metric(baseline, section, path)
+        if current is None or previous is None:
+            continue
+        change = (current - previous) / previous * 100 if previous else 0.0
+        worse = change > 0 if lower_is_better else change < 0
+        flag = " (worse)" if worse and abs(change) >= 10 else ""
+        print(f"   {label:<26} {previous:>12} -> {current:<12} {change:+.1f}%{flag}")
+
+
+def test_broadcast_fan_out_load(base_url, load_config):
+    """
+    Benchmark broadcast fan-out with many subscribers and a steady publish rate.
+
+    Verifies that:
+    1. All clients connect
+    2. All broadcasts are accepted
+    3. Lost deliveries stay within --load-max-loss
+    """
+    report = asyncio.run(run_load(base_url, load_config))
+
+    report_path = load_config["report"]
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2) + "\n")
+
+    print_report(report)
+    print(f"Report written to {report_path}")
+    if load_config["baseline"]:
+        print_comparison(report, json.loads(load_config["baseline"].read_text()))
+
+    assert report["clients"]["failed"] == 0, f"{report['clients']['failed']} client(s) failed to connect"
+    assert report["publish"]["failed"] == 0, f"{report['publish']['failed']} broadcast(s) were not accepted"
+    assert report["delivery"]["loss_ratio"] <= load_config["max_loss"], \
+        f"Lost {report['delivery']['lost']} of {report['delivery']['expected']} deliveries"
@@ -0,0 +1,172 @@
+"""
+Pytest plugin: per-operation latency budgets for the schemathesis e2e suites.
+
+Records the response time of every schemathesis API call (through the global
+after_call hook), then at the end of the session:
+1. Checks p50/p95 per operation against the budgets in latency-budgets.json
+2. Compares p50/p95 with a baseline report, flagging regressions beyond a tolerance
+3. Writes the measurements as a JSON report (usable as the next baseline)
+
+Any budget violation or regression fails the session.
+
+Budgets file (next to pytest.ini, or --latency-budgets):
+    {
+      "default": {"p50_ms": 100, "p95_ms": 500},
+      "operations": {"GET /api/recordings": {"p50_ms": 50, "p95_ms": 250}}
+    }
+
+Loaded from each suite's conftest.py; the directory is mounted at /latency in Docker.
+"""
+
+import json
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+import schemathesis
+
+DEFAULT_BUDGETS_FILE = "latency-budgets.json"
+
+# Regressions smaller than this are noise, whatever the relative change
+MIN_REGRESSION_MS = 5.0
+
+# {operation: [(seconds, status code), ...]}
+_samples = defaultdict(list)
+
+
+@schemathesis.hook
+def after_call(context, case, response):
+    """Record the response time of every API call made by the tests."""
+    elapsed = getattr(response, "elapsed", None)
+    if elapsed is not None:
+        _samples[case.operation.verbose_name].append((elapsed.total_seconds(), response.status_code))
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("latency", "Per-operation latency budgets")
+    group.addoption("--latency-budgets", type=Path, default=None,
+                    help=f"Budgets file (default: {DEFAULT_BUDGETS_FILE} in the test directory)")
+    group.addoption("--latency-report", type=Path, default=None,
+                    help="Write the measured latencies to this JSON report")
+    group.addoption("--latency-baseline", type=Path, default=None,
+                    help="Earlier JSON report to check for regressions against")
+    group.addoption("--latency-tolerance", type=float, default=0.25,
+                    help="Allowed slowdown relative to the baseline (default: 0.25 = 25%%)")
+    group.addoption("--latency-min-samples", type=int, default=5,
+                    help="Operations with fewer calls are reported but not checked (default: 5)")
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples):
+    """Per-operation latency summary in milliseconds."""
+    summary = {}
+    for operation, calls in sorted(samples.items()):
+        values = sorted(seconds * 1000 for seconds, _ in calls)
+        statuses = defaultdict(int)
+        for _, status in calls:
+            statuses[str(status)] += 1
+        summary[operation] = {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50), 3),
+            "p95_ms": round(percentile(values, 95), 3),
+            "max_ms": round(values[-1], 3),
+            "statuses": dict(sorted(statuses.items())),
+        }
+    return summary
+
+
+def load_budgets(path):
+    if path is None or not path.exists():
+        return {}, {}
+    budgets = json.loads(path.read_text())
+    return budgets.get("default", {}), budgets.get("operations", {})
+
+
+def check_budgets(summary, default, operations, min_samples):
+    """Return a message for every percentile over its budget."""
+    violations = []
+    for operation, stats in summary.items():
+        if stats["count"] < min_samples:
+            continue
+        budget = {**default, **operations.get(operation, {})}
+        for key in ("p50_ms", "p95_ms"):
+            if key in budget and stats[key] > budget[key]:
+                violations.append(f"{operation}: {key[:3]} {stats[key]:.1f} ms over budget of {budget[key]} ms")
+    return violations
+
+
+def check_regressions(summary, baseline, tolerance, min_samples):
+    """Return a message for every percentile slower than the baseline beyond the tolerance."""
+    regressions = []
+    for operation, stats in summary.items():
+        previous = baseline.get("operations", {}).get(operation)
+        if not previous or stats["count"] < min_samples:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            before, now = previous.get(key), stats[key]
+            if before is None:
+                continue
+            if now > before * (1 + tolerance) and now - before > MIN_REGRESSION_MS:
+                change = f" (+{(now / before - 1) * 100:.0f}%)" if before > 0 else ""
+                regressions.append(f"{operation}: {key[:3]} {before:.1f} -> {now:.1f} ms{change}")
+    return regressions
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if not _samples:
+        return
+
+    option = config.getoption
+    summary = summarize(_samples)
+    budgets_path = option("--latency-budgets") or Path(config.rootpath) / DEFAULT_BUDGETS_FILE
+    default, operations = load_budgets(budgets_path)
+    min_samples = option("--latency-min-samples")
+
+    failures = check_budgets(summary, default, operations, min_samples)
+
+    baseline_path = option("--latency-baseline")
+    if baseline_path is not None and baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        failures += check_regressions(summary, baseline, option("--latency-tolerance"), min_samples)
+
+    report_path = option("--latency-report")
+    if report_path is not None:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "operations": summary,
+            "failures": failures,
+        }
+        report_path.write_text(json.dumps(report, indent=2) + "\n")
+
+    config._latency_summary = (summary, failures, report_path)
+    if failures and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    result = getattr(config, "_latency_summary", None)
+    if result is None:
+        return
+
+    summary, failures, report_path = result
+    terminalreporter.section("latency per operation")
+    width = max(len(operation) for operation in summary)
+    terminalreporter.write_line(f"{'operation':<{width}} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for operation, stats in summary.items():
+        terminalreporter.write_line(
+            f"{operation:<{width}} {stats['count']:>6} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+            f"{stats['max_ms']:>9.1f}"
+        )
+    if report_path is not None:
+        terminalreporter.write_line(f"Latency report written to {report_path}")
+    for failure in failures:
+        terminalreporter.write_line(f"LATENCY FAILURE {failure}", red=True)
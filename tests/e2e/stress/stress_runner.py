@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Sustained-load stress runner for the e2e backends.
+
+Generates a pool of valid requests per operation from the same OpenAPI schema
+the schemathesis suites use, then drives a weighted mix of them against the
+backend with asyncio for a fixed duration at each concurrency stage
+(optionally capped at a target request rate). Reports per stage and operation:
+1. Throughput (requests/s)
+2. Latency percentiles and a histogram
+3. Error rate (5xx responses and transport failures) and status codes
+
+Running several stages (--concurrency 1,4,16,64) shows where throughput stops
+scaling, i.e. the saturation point of the backend. 4xx responses are expected
+for generated ids that do not exist and are not counted as errors.
+
+Requests that create, change or delete data are part of the mix by default, so
+only point the runner at a local test backend. Example:
+    python stress_runner.py --schema /schema/openapi.yaml --base-url http://localhost:13000 \\
+        --concurrency 1,4,16,64 --duration 20 --exclude agent --exclude push-to-confluence \\
+        --report /reports/stress.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+import time
+import warnings
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode
+
+import aiohttp
+import schemathesis
+from hypothesis import HealthCheck, Phase, given, seed as hypothesis_seed, settings
+from yarl import URL
+
+# Upper bounds of the latency histogram buckets, in ms (the last bucket is open)
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+HISTOGRAM_WIDTH = 40
+
+# A stage is saturated when it adds less than this much throughput over the previous
+# one, or when more than this share of its requests fail
+SATURATION_GAIN = 0.10
+SATURATION_ERROR_RATE = 0.01
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def histogram(latencies_ms):
+    """Count latencies per bucket: [(label, count), ...]."""
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for value in latencies_ms:
+        index = next((i for i, bound in enumerate(HISTOGRAM_BUCKETS_MS) if value <= bound), len(HISTOGRAM_BUCKETS_MS))
+        counts[index] += 1
+    labels = [f"<= {bound} ms" for bound in HISTOGRAM_BUCKETS_MS] + [f"> {HISTOGRAM_BUCKETS_MS[-1]} ms"]
+    return list(zip(labels, counts))
+
+
+def parse_weights(values):
+    """Parse 'OPERATION=WEIGHT' options, e.g. 'GET /api/decisions=5'."""
+    weights = {}
+    for value in values or []:
+        operation, _, weight = value.rpartition('=')
+        try:
+            weights[operation.strip()] = float(weight)
+        except ValueError:
+            print(f"Error: Invalid --weight '{value}', expected 'METHOD /path=WEIGHT'", file=sys.stderr)
+            sys.exit(1)
+    return weights
+
+
+def select_operations(schema, include, exclude):
+    """Schema operations whose 'METHOD /path' matches include and none of exclude."""
+    operations = []
+    for result in schema.get_all_operations():
+        operation = result.ok()
+        name = operation.verbose_name
+        if include and not any(re.search(pattern, name) for pattern in include):
+            continue
+        if any(re.search(pattern, name) for pattern in exclude):
+            continue
+        operations.append(operation)
+    return operations
+
+
+def generate_requests(operation, base_url, examples, seed):
+    """Draw up to `examples` valid requests for one operation, as aiohttp request arguments."""
+    cases = []
+
+    @given(operation.as_strategy())
+    @settings(max_examples=examples, database=None, deadline=None,
+              phases=[Phase.generate], suppress_health_check=list(HealthCheck))
+    def collect(case):
+        cases.append(case)
+
+    if seed is not None:
+        collect = hypothesis_seed(seed)(collect)
+    collect()
+
+    requests = []
+    for case in cases:
+        kwargs = case.as_transport_kwargs(base_url=base_url)
+        url = kwargs['url']
+        if kwargs.get('params'):
+            url += ('&' if '?' in url else '?') + urlencode(kwargs['params'], doseq=True)
+        request = {'method': kwargs['method'], 'url': URL(url, encoded=True), 'headers': kwargs.get('headers') or {}}
+        if kwargs.get('cookies'):
+            request['cookies'] = kwargs['cookies']
+        if 'json' in kwargs:
+            request['json'] = kwargs['json']
+        elif kwargs.get('data') is not None:
+            request['data'] = kwargs['data']
+        requests.append(request)
+    return requests
+
+
+async def run_stage(session, pools, weights, concurrency, config, rng):
+    """
+    Run one stage: `concurrency` workers send requests back to back for the
+    configured duration, paced to --rps if set. Returns {operation: [(seconds,
+    status or None), ...]} for requests completed after the warmup, and the
+    measured seconds.
+    """
+    names = list(pools)
+    samples = defaultdict(list)
+    interval = 1 / config.rps if config.rps else 0
+    start = time.perf_counter()
+    measure_from = start + config.warmup
+    stop = measure_from + config.duration
+    next_slot = start
+
+    async def worker():
+        nonlocal next_slot
+        while True:
+            if interval:
+                slot = max(next_slot, time.perf_counter())
+                next_slot = slot + interval
+                delay = slot - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            sent = time.perf_counter()
+            if sent >= stop:
+                return
+            name = rng.choices(names, weights)[0]
+            request = rng.choice(pools[name])
+            try:
+                async with session.request(**request) as response:
+                    await response.read()
+                    status = response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = None
+            if sent >= measure_from:
+                samples[name].append((time.perf_counter() - sent, status))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - measure_from
+
+
+def summarize(calls, seconds):
+    """Throughput, latency and error summary of one operation (or all of them)."""
+    latencies = sorted(elapsed * 1000 for elapsed, _ in calls)
+    statuses = defaultdict(int)
+    for _, status in calls:
+        statuses[str(status) if status is not None else 'failed'] += 1
+    errors = sum(count for status, count in statuses.items() if status == 'failed' or status.startswith('5'))
+    return {
+        'requests': len(calls),
+        'rps': round(len(calls) / seconds, 2) if seconds else None,
+        'errors': errors,
+        'error_rate': round(errors / len(calls), 6) if calls else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 3) if latencies else None,
+            'p90': round(percentile(latencies, 90), 3) if latencies else None,
+            'p95': round(percentile(latencies, 95), 3) if latencies else None,
+            'p99': round(percentile(latencies, 99), 3) if latencies else None,
+            'max': round(latencies[-1], 3) if latencies else None,
+        },
+        'histogram': histogram(latencies),
+        'statuses': dict(sorted(statuses.items())),
+    }
+
+
+def print_stage(stage):
+    total = stage['total']
+    latency = total['latency_ms']
+    print(f"\n── Concurrency {stage['concurrency']}: {total['requests']} requests in {stage['seconds']:.1f} s, "
+          f"{total['rps']} req/s, p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms, "
+          f"errors {total['error_rate']:.2%}")
+
+    width = max(len(name) for name in stage['operations'])
+    print(f"   {'operation':<{width}} {'req':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'errors':>7}  statuses")
+    for name, stats in stage['operations'].items():
+        latency = stats['latency_ms']
+        statuses = ', '.join(f"{status}: {count}" for status, count in stats['statuses'].items())
+        print(f"   {name:<{width}} {stats['requests']:>7} {stats['rps']:>8} {latency['p50']:>8} {latency['p95']:>8} "
+              f"{latency['p99']:>8} {stats['error_rate']:>7.2%}  {statuses}")
+
+    largest = max((count for _, count in total['histogram']), default=0)
+    print("   Latency histogram:")
+    for label, count in total['histogram']:
+        if count:
+            bar = '█' * max(1, round(count / largest * HISTOGRAM_WIDTH))
+            print(f"   {label:>12} {count:>8} {bar}")
+
+
+def find_saturation(stages):
+    """First stage whose extra concurrency no longer buys throughput (or starts failing)."""
+    for previous, stage in zip(stages, stages[1:]):
+        before, now = previous['total']['rps'] or 0, stage['total']['rps'] or 0
+        if now < before * (1 + SATURATION_GAIN) or stage['total']['error_rate'] > SATURATION_ERROR_RATE:
+            return previous
+    return None
+
+
+async def run(config, pools, weights):
+    rng = random.Random(config.seed)
+    stages = []
+    timeout = aiohttp.ClientTimeout(total=config.timeout)
+    for concurrency in config.concurrency:
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            samples, seconds = await run_stage(session, pools, weights, concurrency, config, rng)
+        stage = {
+            'concurrency': concurrency,
+            'seconds': round(seconds, 3),
+            'total': summarize([call for calls in samples.values() for call in calls], seconds),
+            'operations': {name: summarize(samples[name], seconds) for name in pools if samples[name]},
+        }
+        stages.append(stage)
+        print_stage(stage)
+    return stages
+
+
+def concurrency_stages(value):
+    try:
+        stages = [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got '{value}'")
+    if not stages or min(stages) < 1:
+        raise argparse.ArgumentTypeError("concurrency levels must be positive")
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive a backend with a request mix generated from its OpenAPI schema")
+    parser.add_argument("--schema", type=Path, default=Path("/schema/openapi.yaml"), help="OpenAPI schema")
+    parser.add_argument("--base-url", required=True, help="Base URL of the backend under test")
+    parser.add_argument("--concurrency", type=concurrency_stages, default=[1, 4, 16, 64],
+                        help="Comma-separated concurrency levels, one stage each (default: 1,4,16,64)")
+    parser.add_argument("--rps", type=float, default=None,
+                        help="Cap the request rate of every stage at this many requests/s (default: as fast as possible)")
+    parser.add_argument("--duration", type=float, default=20, help="Measured seconds per stage (default: 20)")
+    parser.add_argument("--warmup", type=float, default=2, help="Unmeasured seconds before each stage (default: 2)")
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout in seconds (default: 30)")
+    parser.add_argument("--include", action="append", default=[],
+                        help="Only operations matching this regex, e.g. '^GET '; repeatable")
+    parser.add_argument("--exclude", action="append", default=[],
+                        help="Skip operations matching this regex, e.g. 'agent'; repeatable")
+    parser.add_argument("--weight", action="append", metavar="OPERATION=WEIGHT",
+                        help="Relative share of an operation in the mix, e.g. 'GET /api/decisions=5' (default: 1)")
+    parser.add_argument("--examples", type=int, default=50,
+                        help="Requests generated per operation and replayed during the run (default: 50)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a reproducible request mix")
+    parser.add_argument("--max-error-rate", type=float, default=None,
+                        help="Exit with status 1 if any stage has a higher error rate, e.g. 0.01")
+    parser.add_argument("--report", type=Path, default=None, help="Write the results as a JSON report")
+    config = parser.parse_args()
+
+    if not config.schema.exists():
+        print(f"Error: Schema not found: {config.schema}", file=sys.stderr)
+        sys.exit(1)
+
+    # Hypothesis warns when examples are drawn outside of a test run
+    warnings.simplefilter("ignore")
+    schema = schemathesis.openapi.from_path(str(config.schema))
+    operations = select_operations(schema, config.include, config.exclude)
+    if not operations:
+        print("Error: No operations left after --include/--exclude", file=sys.stderr)
+        sys.exit(1)
+
+    explicit_weights = parse_weights(config.weight)
+    unknown = set(explicit_weights) - {operation.verbose_name for operation in operations}
+    if unknown:
+        print(f"Error: --weight for unknown or excluded operation(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"🧪 Generating up to {config.examples} requests for each of {len(operations)} operations...")
+    pools = {}
+    for operation in operations:
+        requests = generate_requests(operation, config.base_url, config.examples, config.seed)
+        if requests:
+            pools[operation.verbose_name] = requests
+    weights = [explicit_weights.get(name, 1.0) for name in pools]
+
+    rate = f", capped at {config.rps} req/s" if config.rps else ""
+    print(f"🚀 {len(config.concurrency)} stage(s) of {config.duration:g} s against {config.base_url}{rate}")
+    stages = asyncio.run(run(config, pools, weights))
+
+    print("\nThroughput by concurrency:")
+    for stage in stages:
+        total = stage['total']
+        print(f"   {stage['concurrency']:>5}  {total['rps']:>10} req/s   p95 {total['latency_ms']['p95']} ms   "
+              f"errors {total['error_rate']:.2%}")
+    saturated = find_saturation(stages)
+    if saturated:
+        print(f"⚠️  Throughput stops scaling beyond concurrency {saturated['concurrency']} "
+              f"({saturated['total']['rps']} req/s)")
+    elif len(stages) > 1:
+        print("✓ Throughput still scaling at the highest concurrency; add higher stages to find saturation")
+
+    if config.report:
+        config.report.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'base_url': config.base_url,
+            'config': {
+                'concurrency': config.concurrency, 'rps': config.rps, 'duration': config.duration,
+                'warmup': config.warmup, 'weights': dict(zip(pools, weights)), 'examples': config.examples,
+            },
+            'saturation_concurrency': saturated['concurrency'] if saturated else None,
+            'stages': stages,
+        }
+        config.report.write_text(json.dumps(report, indent=2) + '\n')
+        print(f"\n✓ Report written to {config.report}")
+
+    if config.max_error_rate is not None:
+        failing = [stage['concurrency'] for stage in stages if stage['total']['error_rate'] > config.max_error_rate]
+        if failing:
+            print(f"Error: Error rate above {config.max_error_rate:.2%} at concurrency "
+                  f"{', '.join(map(str, failing))}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
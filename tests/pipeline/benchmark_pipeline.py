@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of the process_batch_recordings DAG.
+
+Runs N synthetic recordings through the real DAG tasks without network access
+or a running Airflow scheduler:
+1. Build a sandbox HOME (recordings dir, Obsidian vault, repositories/magik
+   pointing at this checkout) so the DAG's paths resolve inside it
+2. Write speech-like WAVs and .meta.json files the way `magik record` does
+3. Start fake Speechmatics, Gemini and backend-socket services (with
+   configurable latency) and point the DAG at them (SPEECHMATICS_API_URL,
+   GOOGLE_GEMINI_BASE_URL, SOCKET_SERVER_URL)
+4. Import the DAG and run its tasks in dependency order for every recording,
+   with --concurrency recordings in flight (like concurrent DAG runs).
+   BashOperator commands and env are rendered with Airflow's templating and
+   run with bash; Python callables run in-process with a task-instance stand-in
+   that provides XCom. Task callbacks (progress events) run around every task
+   as Airflow runs them, each task with its own progress publisher as in a
+   separate task process, so broadcasts only carry the stages of earlier tasks
+   through the recording's progress snapshot file, as they do under Airflow
+5. Report throughput, per-stage wall time, CPU time and block I/O, and what
+   the fake services received
+
+CPU and I/O of bash tasks come from wait4() and include every process the task
+waited for (ffmpeg, curl, uv, jq). Block I/O only counts reads and writes that
+reached the disk, not the page cache. ShortCircuit tasks (the metadata claim)
+run one at a time, as the scheduler would start them.
+
+Requires the DAG's dependencies (apache-airflow) and the tools its tasks use
+(ffmpeg, curl, jq, uv). Run from the repository root:
+    uv run python tests/pipeline/benchmark_pipeline.py --recordings 8 --minutes 10 --concurrency 4
+"""
+
+import argparse
+import importlib.util
+import inspect
+import json
+import math
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+from fake_services import FakeGemini, FakeSocket, FakeSpeechmatics
+from synthetic_speech import SpeechSynthesizer
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+DAG_FILE = REPO_DIR / "dags" / "process_batch_recordings.py"
+DEFAULT_REPORT = REPO_DIR / "tests" / "pipeline" / "reports" / "pipeline-benchmark.json"
+
+# ru_inblock / ru_oublock count 512-byte blocks
+BLOCK_BYTES = 512
+RUSAGE_THREAD = getattr(resource, "RUSAGE_THREAD", resource.RUSAGE_SELF)
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def build_sandbox(root):
+    """Create the HOME layout the DAG and its scripts expect. Returns the sandbox HOME."""
+    home = root / "home"
+    for directory in ("Documents/recordings", "Obsidian/magic/Meetings", "Obsidian/magic/Transcriptions",
+                      "repositories", "airflow", ".cache"):
+        (home / directory).mkdir(parents=True, exist_ok=True)
+    (home / "repositories" / "magik").symlink_to(REPO_DIR)
+
+    # Reuse the real uv cache so `uv run` in the gemini scripts does not reinstall
+    uv_cache = Path(os.environ.get("UV_CACHE_DIR", Path.home() / ".cache" / "uv"))
+    if uv_cache.exists():
+        (home / ".cache" / "uv").symlink_to(uv_cache)
+    (root / "logs").mkdir()
+    return home
+
+
+def write_recordings(recordings_dir, count, minutes, seed):
+    """Write WAVs and metadata files, oldest first. Returns {meeting_name: seconds}."""
+    synthesizer = SpeechSynthesizer(seed)
+    durations = {}
+    started = datetime.now(timezone.utc) - timedelta(hours=count)
+    for i in range(count):
+        name = f"bench_{i:04d}"
+        seconds = minutes[i % len(minutes)] * 60
+        wav_path = recordings_dir / f"{name}.wav"
+        synthesizer.write(wav_path, seconds, seed + i)
+
+        metadata_path = recordings_dir / f"{name}.meta.json"
+        metadata_path.write_text(json.dumps({
+            "meeting_name": name,
+            "language": "de" if i % 4 == 3 else "en",
+            "wav_path": str(wav_path),
+            "timestamp": (started + timedelta(hours=i)).isoformat().replace("+00:00", "Z"),
+        }, indent=2))
+        # check_for_metadata claims the oldest metadata file first
+        mtime = time.time() - (count - i)
+        os.utime(metadata_path, (mtime, mtime))
+        durations[name] = seconds
+    return durations
+
+
+def load_dag():
+    """Import the DAG file (after the sandbox environment is set) and return the module."""
+    spec = importlib.util.spec_from_file_location("process_batch_recordings", DAG_FILE)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError as e:
+        print(f"Error: Could not import the DAG: {e}", file=sys.stderr)
+        print("Run with the root project's environment: uv run python tests/pipeline/benchmark_pipeline.py",
+              file=sys.stderr)
+        sys.exit(1)
+    return module
+
+
+def ordered_tasks(dag):
+    """Tasks in dependency order (stable with respect to definition order)."""
+    remaining = list(dag.tasks)
+    done = set()
+    ordered = []
+    while remaining:
+        ready = [task for task in remaining if task.upstream_task_ids <= done]
+        if not ready:
+            print("Error: DAG has a dependency cycle", file=sys.stderr)
+            sys.exit(1)
+        for task in ready:
+            ordered.append(task)
+            done.add(task.task_id)
+            remaining.remove(task)
+    return ordered
+
+
+class TaskInstance:
+    """Minimal stand-in for the XCom and identity parts of an Airflow TaskInstance."""
+
+    def __init__(self, dag_run):
+        self.dag_run = dag_run
+        self.task_id = None
+        self.run_id = f"benchmark__{dag_run.number:04d}"
+        self.try_number = 1
+        self.start_date = None
+
+    def xcom_push(self, key, value):
+        self.dag_run.xcom[(self.task_id, key)] = value
+
+    def xcom_pull(self, task_ids=None, key="return_value"):
+        return self.dag_run.xcom.get((task_ids, key))
+
+
+class TaskPublishers:
+    """
+    A fresh progress publisher for every task, like Airflow's process per task instance.
+
+    Replaces pipeline_progress.get_publisher (as loaded by the DAG) with one that
+    returns the publisher of the task running on the calling thread.
+    """
+
+    def __init__(self, progress):
+        self.progress = progress
+        self.current = threading.local()
+        self.totals = defaultdict(int)
+        self.lock = threading.Lock()
+        progress.get_publisher = lambda base_url=None: self.current.publisher
+
+    def start(self):
+        self.current.publisher = self.progress.ProgressPublisher(os.environ["SOCKET_SERVER_URL"])
+
+    def finish(self):
+        """Close the task's publisher, as the task process exits."""
+        publisher = self.current.publisher
+        publisher.close(self.progress.EXIT_FLUSH_SECONDS)
+        with self.lock:
+            for key, value in publisher.stats().items():
+                self.totals[key] += value
+
+
+class DagRun:
+    """One recording's pass through the DAG, with per-task measurements."""
+
+    def __init__(self, number, dag, logs_dir, publishers):
+        self.number = number
+        self.dag = dag
+        self.logs_dir = logs_dir
+        self.publishers = publishers
+        self.xcom = {}
+        self.ti = TaskInstance(self)
+        self.stages = []
+        self.status = "running"
+
+    @property
+    def meeting_name(self):
+        return self.xcom.get(("check_for_metadata", "meeting_name"))
+
+    def context(self, task):
+        self.ti.task_id = task.task_id
+        now = datetime.now(timezone.utc)
+        return {
+            "dag": self.dag,
+            "task": task,
+            "ti": self.ti,
+            "task_instance": self.ti,
+            "run_id": self.ti.run_id,
+            "logical_date": now,
+            "ds": now.strftime("%Y-%m-%d"),
+            "params": {},
+        }
+
+    def run_bash(self, task, context):
+        command = task.render_template(task.bash_command, context)
+        env = task.render_template(task.env, context) if task.env is not None else None
+        log_path = self.logs_dir / f"run{self.number:04d}.{task.task_id}.log"
+        with tempfile.TemporaryDirectory(prefix="airflowtmp") as cwd, open(log_path, "wb") as log:
+            process = subprocess.Popen(["bash", "-c", command], cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                                       stdout=log, stderr=subprocess.STDOUT)
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+        return process.returncode == 0, True, usage
+
+    def run_python(self, task, context, claim_lock):
+        kwargs = {**context, **(task.op_kwargs or {})}
+        parameters = inspect.signature(task.python_callable).parameters
+        if not any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+            kwargs = {key: value for key, value in kwargs.items() if key in parameters}
+
+        short_circuit = type(task).__name__ == "ShortCircuitOperator"
+        with claim_lock if short_circuit else nullcontext():
+            before = resource.getrusage(RUSAGE_THREAD)
+            try:
+                result = task.python_callable(*(task.op_args or ()), **kwargs)
+                ok = True
+            except Exception as e:
+                print(f"   ✗ {task.task_id}: {e}", file=sys.stderr)
+                result, ok = None, False
+            after = resource.getrusage(RUSAGE_THREAD)
+
+        if ok and not short_circuit and result is not None:
+            self.ti.xcom_push("return_value", result)
+        usage = SimpleNamespace(**{field: getattr(after, field) - getattr(before, field)
+                                   for field in ("ru_utime", "ru_stime", "ru_inblock", "ru_oublock")})
+        return ok, bool(result) if short_circuit else True, usage
+
+    def run_callbacks(self, task, kind, context):
+        callbacks = getattr(task, f"on_{kind}_callback", None) or []
+        for callback in callbacks if isinstance(callbacks, (list, tuple)) else [callbacks]:
+            callback(context)
+
+    def run(self, tasks, claim_lock):
+        """Run every task (and its callbacks) in order; stop at the first failure or short circuit."""
+        for task in tasks:
+            context = self.context(task)
+            start = time.perf_counter()
+            self.ti.start_date = datetime.now(timezone.utc)
+            self.publishers.start()
+            self.run_callbacks(task, "execute", context)
+            if hasattr(task, "bash_command"):
+                ok, proceed, usage = self.run_bash(task, context)
+            else:
+                ok, proceed, usage = self.run_python(task, context, claim_lock)
+            if ok:
+                self.run_callbacks(task, "success", context)
+            else:
+                self.run_callbacks(task, "failure", {**context, "exception": RuntimeError(f"{task.task_id} failed")})
+            self.publishers.finish()
+            self.stages.append({
+                "task_id": task.task_id,
+                "ok": ok,
+                "wall_seconds": time.perf_counter() - start,
+                "cpu_seconds": usage.ru_utime + usage.ru_stime,
+                "read_bytes": usage.ru_inblock * BLOCK_BYTES,
+                "write_bytes": usage.ru_oublock * BLOCK_BYTES,
+            })
+            if not ok:
+                self.status = f"failed at {task.task_id}"
+                return self
+            if not proceed:
+                self.status = "skipped"
+                return self
+        self.status = "success"
+        return self
+
+
+def summarize_stages(runs, tasks):
+    """Per-task totals and latency percentiles across all runs."""
+    by_task = defaultdict(list)
+    for run in runs:
+        for stage in run.stages:
+            by_task[stage["task_id"]].append(stage)
+
+    summary = []
+    for task in tasks:
+        stages = by_task.get(task.task_id, [])
+        wall = sorted(stage["wall_seconds"] for stage in stages)
+        summary.append({
+            "task_id": task.task_id,
+            "runs": len(stages),
+            "failures": sum(1 for stage in stages if not stage["ok"]),
+            "wall_total": round(sum(wall), 3),
+            "wall_mean": round(sum(wall) / len(wall), 3) if wall else None,
+            "wall_p50": round(percentile(wall, 50), 3) if wall else None,
+            "wall_p95": round(percentile(wall, 95), 3) if wall else None,
+            "cpu_seconds": round(sum(stage["cpu_seconds"] for stage in stages), 3),
+            "read_mb": round(sum(stage["read_bytes"] for stage in stages) / 1024 ** 2, 2),
+            "write_mb": round(sum(stage["write_bytes"] for stage in stages) / 1024 ** 2, 2),
+        })
+    return summary
+
+
+def print_report(report):
+    print(f"\n{'task':<26} {'runs':>5} {'fail':>5} {'mean s':>8} {'p50 s':>8} {'p95 s':>8} "
+          f"{'total s':>9} {'cpu s':>8} {'read MB':>9} {'write MB':>9}")
+    for stage in report["stages"]:
+        print(f"{stage['task_id']:<26} {stage['runs']:>5} {stage['failures']:>5} {stage['wall_mean'] or '-':>8} "
+              f"{stage['wall_p50'] or '-':>8} {stage['wall_p95'] or '-':>8} {stage['wall_total']:>9} "
+              f"{stage['cpu_seconds']:>8} {stage['read_mb']:>9} {stage['write_mb']:>9}")
+
+    total = report["totals"]
+    print(f"\n✓ {total['succeeded']}/{total['recordings']} recordings in {total['wall_seconds']} s "
+          f"({total['recordings_per_hour']} recordings/hour, {total['audio_speedup']}x realtime)")
+    print(f"   CPU {total['cpu_seconds']} s ({total['cpu_utilization_percent']}% of {total['cpus']} CPUs), "
+          f"read {total['read_mb']} MB, written {total['write_mb']} MB")
+    services = report["services"]
+    print(f"   Speechmatics: {services['speechmatics']['jobs']['submitted']} jobs, "
+          f"{services['speechmatics']['jobs']['uploaded_bytes'] / 1024 ** 2:.1f} MB uploaded; "
+          f"Gemini: {services['gemini']['file_search']['documents']} documents, "
+          f"{services['gemini']['file_search']['uploaded_bytes'] / 1024:.1f} KB uploaded")
+    broadcast = services["socket"]["broadcast"]
+    statuses = ", ".join(f"{count} {status}" for status, count in sorted(broadcast["statuses"].items()))
+    final_stages = ", ".join(f"{channels} with {count}" for count, channels in sorted(broadcast["final_stages"].items()))
+    print(f"   backend-socket: {broadcast['broadcasts']} progress broadcasts on {broadcast['channels']} channels "
+          f"over {services['socket']['connections']} connections, one publisher per task ({statuses or 'none'}; "
+          f"stages in the last broadcast: {final_stages or 'none'})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recording pipeline offline with synthetic recordings")
+    parser.add_argument("--recordings", type=int, default=4, help="Number of recordings (default: 4)")
+    parser.add_argument("--minutes", default="5",
+                        help="Recording length in minutes; a comma-separated list is cycled (default: 5)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Recordings processed at once (default: 1)")
+    parser.add_argument("--transcription-seconds", type=float, default=2.0,
+                        help="Fixed fake Speechmatics time per job (default: 2.0)")
+    parser.add_argument("--transcription-rtf", type=float, default=0.0,
+                        help="Fake Speechmatics time per second of audio (default: 0.0)")
+    parser.add_argument("--upload-seconds", type=float, default=0.5,
+                        help="Fake Gemini time to finalize an upload (default: 0.5)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic audio (default: 0)")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT, help=f"JSON report path (default: {DEFAULT_REPORT})")
+    parser.add_argument("--keep", action="store_true", help="Keep the sandbox directory for inspection")
+    args = parser.parse_args()
+
+    try:
+        minutes = [float(value) for value in args.minutes.split(",")]
+    except ValueError:
+        print(f"Error: Invalid --minutes '{args.minutes}'", file=sys.stderr)
+        sys.exit(1)
+    if args.recordings < 1 or args.concurrency < 1 or min(minutes) <= 0:
+        print("Error: --recordings, --concurrency and --minutes must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    for tool in ("bash", "ffmpeg", "curl", "jq", "uv"):
+        if not shutil.which(tool):
+            print(f"Error: {tool} is not installed (the DAG's tasks need it)", file=sys.stderr)
+            sys.exit(1)
+
+    root = Path(tempfile.mkdtemp(prefix="magik-pipeline-bench-"))
+    home = build_sandbox(root)
+    recordings_dir = home / "Documents" / "recordings"
+    print(f"📁 Sandbox: {root}")
+
+    start = time.perf_counter()
+    durations = write_recordings(recordings_dir, args.recordings, minutes, args.seed)
+    audio_seconds = sum(durations.values())
+    print(f"🎙️  Wrote {args.recordings} recordings ({audio_seconds / 60:g} min of audio) "
+          f"in {time.perf_counter() - start:.1f} s")
+
+    speechmatics = FakeSpeechmatics(fixed_seconds=args.transcription_seconds,
+                                    realtime_factor=args.transcription_rtf, durations=durations, seed=args.seed)
+    gemini = FakeGemini(latency_seconds=args.upload_seconds)
+    socket = FakeSocket()
+
+    try:
+        with speechmatics, gemini, socket:
+            # The DAG reads HOME and the service settings when it is imported
+            os.environ.update({
+                "HOME": str(home),
+                "AIRFLOW_HOME": str(home / "airflow"),
+                "SPEECHMATICS_API_KEY": FakeSpeechmatics.api_key,
+                "SPEECHMATICS_API_URL": speechmatics.api_url,
+                "GOOGLE_API_KEY": FakeGemini.api_key,
+                "GOOGLE_GEMINI_BASE_URL": gemini.url,
+                "SOCKET_SERVER_URL": socket.url,
+            })
+            dag_module = load_dag()
+            dag = dag_module.dag
+            tasks = ordered_tasks(dag)
+            publishers = TaskPublishers(dag_module.load_package_script('audio', 'pipeline_progress'))
+            print(f"🔁 Running {len(tasks)} tasks per recording, {args.concurrency} at a time...")
+
+            claim_lock = threading.Lock()
+            usage_before = resource.getrusage(resource.RUSAGE_SELF)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                runs = list(pool.map(lambda number: DagRun(number, dag, root / "logs", publishers).run(tasks, claim_lock),
+                                     range(args.recordings)))
+            wall_seconds = time.perf_counter() - start
+            usage_after = resource.getrusage(resource.RUSAGE_SELF)
+            services = {"speechmatics": speechmatics.stats(), "gemini": gemini.stats(),
+                        "socket": {**socket.stats(), "publishers": dict(publishers.totals)}}
+
+        for run in runs:
+            if run.status != "success":
+                print(f"   ✗ {run.meeting_name or f'run {run.number}'}: {run.status} "
+                      f"(logs in {root / 'logs'})", file=sys.stderr)
+
+        stages = summarize_stages(runs, tasks)
+        # Harness CPU covers the fake services and in-process Python tasks
+        harness_cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+        task_cpu = sum(stage["cpu_seconds"] for stage in stages)
+        cpus = os.cpu_count() or 1
+        succeeded = sum(1 for run in runs if run.status == "success")
+        report = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "config": {
+                "recordings": args.recordings,
+                "minutes": minutes,
+                "concurrency": args.concurrency,
+                "transcription_seconds": args.transcription_seconds,
+                "transcription_rtf": args.transcription_rtf,
+                "upload_seconds": args.upload_seconds,
+                "seed": args.seed,
+            },
+            "totals": {
+                "recordings": args.recordings,
+                "succeeded": succeeded,
+                "audio_seconds": audio_seconds,
+                "wall_seconds": round(wall_seconds, 3),
+                "recordings_per_hour": round(succeeded / wall_seconds * 3600, 1),
+                "audio_speedup": round(audio_seconds / wall_seconds, 1),
+                "cpus": cpus,
+                "cpu_seconds": round(task_cpu, 3),
+                "harness_cpu_seconds": round(harness_cpu, 3),
+                "cpu_utilization_percent": round(task_cpu / (wall_seconds * cpus) * 100, 1),
+                "read_mb": round(sum(stage["read_mb"] for stage in stages), 2),
+                "write_mb": round(sum(stage["write_mb"] for stage in stages), 2),
+            },
+            "stages": stages,
+            "runs": [{"meeting_name": run.meeting_name, "status": run.status, "stages": run.stages} for run in runs],
+            "services": services,
+        }
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2) + "\n")
+
+        print_report(report)
+        print(f"Report written to {args.report}")
+    finally:
+        if args.keep:
+            print(f"Sandbox kept at {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if succeeded < args.recordings:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Offline stand-ins for the external services the recording pipeline calls.
+
+FakeSpeechmatics implements the batch jobs API used by transcribeAudio.sh:
+    POST /v2/jobs                    submit (multipart data_file + config)
+    GET  /v2/jobs/{id}               status: running until the job's latency has passed, then done
+    GET  /v2/jobs/{id}/transcript    json-v2 transcript covering the audio duration
+
+A job takes fixed_seconds + realtime_factor * audio duration. The duration is
+taken from the durations map (meeting name -> seconds) when the caller knows
+it, otherwise estimated from the MP3 size at the bitrate convertToMp3.sh uses.
+
+FakeGemini implements the File Search calls made by upload_transcript.py
+through google-genai (point it here with GOOGLE_GEMINI_BASE_URL):
+    GET/POST /v1beta/fileSearchStores                               list / create store
+    POST     /upload/v1beta/{store}:uploadToFileSearchStore          start resumable upload
+    POST     /upload-session/{id}                                    upload and finalize
+
+FakeSocket implements backend-socket's broadcast endpoint used by the DAG's
+progress events (point it here with SOCKET_SERVER_URL):
+    POST /api/broadcast              {"channel", "payload"}; keeps the last payload per channel
+
+All servers run in a background thread and record per-endpoint request counts,
+bytes and connections; Speechmatics and Gemini reject requests without the
+expected credentials.
+
+Usage: python fake_services.py [--speechmatics-port 14100] [--gemini-port 14101] [--socket-port 14102]
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Transcript generation is shared with the backend-audio recordings fixture
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "e2e" / "backend-audio-e2e" / "schemathesis-tests"))
+from recordings_fixture import LANGUAGES, transcript_header, transcript_results  # noqa: E402
+
+# convertToMp3.sh encodes with -q:a 2 (VBR, ~190 kbps)
+MP3_BYTES_PER_SECOND = 190_000 / 8
+
+
+class FakeService:
+    """Threaded HTTP server with request accounting; subclasses provide the handler."""
+
+    name = "service"
+
+    def __init__(self, port=0, host="127.0.0.1"):
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.connections = 0
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed ACKs stall keep-alive clients
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with service.lock:
+                    service.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                service.dispatch(self, "GET")
+
+            def do_POST(self):
+                service.dispatch(self, "POST")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name=self.name, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def dispatch(self, handler, method):
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        path = handler.path.split("?", 1)[0]
+        try:
+            endpoint, status, payload, headers = self.handle(method, path, handler.headers, body)
+        except Exception as e:
+            endpoint, status, payload, headers = "error", 500, {"error": str(e)}, {}
+
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+        with self.lock:
+            self.requests[f"{method} {endpoint} {status}"] += 1
+            self.bytes_in += len(body)
+            self.bytes_out += len(data)
+
+    def handle(self, method, path, headers, body):
+        """Return (endpoint label, status, JSON payload or bytes, extra headers)."""
+        raise NotImplementedError
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": dict(sorted(self.requests.items())),
+                "total_requests": sum(self.requests.values()),
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "connections": self.connections,
+            }
+
+
+class FakeSpeechmatics(FakeService):
+    """Speechmatics batch jobs API with simulated processing time."""
+
+    name = "fake-speechmatics"
+    api_key = "fake-speechmatics-key"
+
+    def __init__(self, port=0, fixed_seconds=2.0, realtime_factor=0.0, durations=None, seed=0):
+        super().__init__(port)
+        self.fixed_seconds = fixed_seconds
+        self.realtime_factor = realtime_factor
+        self.durations = durations if durations is not None else {}
+        self.seed = seed
+        self.jobs = {}
+        self.job_ids = itertools.count(1)
+
+    @property
+    def api_url(self):
+        return f"{self.url}/v2"
+
+    def job_stats(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return {
+            "submitted": len(jobs),
+            "audio_seconds": round(sum(job["duration"] for job in jobs), 1),
+            "uploaded_bytes": sum(job["size"] for job in jobs),
+        }
+
+    def stats(self):
+        return {**super().stats(), "jobs": self.job_stats()}
+
+    def submit(self, headers, body):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {headers['Content-Type']}\r\n\r\n".encode() + body)
+        parts = {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+        if "data_file" not in parts or "config" not in parts:
+            return "jobs", 400, {"error": "data_file and config are required"}, {}
+
+        audio = parts["data_file"]
+        config = json.loads(parts["config"].get_content())
+        language = config["transcription_config"]["language"]
+        size = len(audio.get_payload(decode=True))
+        name = Path(audio.get_filename() or "recording.mp3").stem
+        duration = self.durations.get(name, size / MP3_BYTES_PER_SECOND)
+
+        job_id = f"job{next(self.job_ids):06d}"
+        with self.lock:
+            self.jobs[job_id] = {
+                "name": name,
+                "language": language if language in LANGUAGES else "en",
+                "duration": round(duration, 2),
+                "size": size,
+                "submitted_at": datetime.now(timezone.utc),
+                "ready_at": time.monotonic() + self.fixed_seconds + self.realtime_factor * duration,
+            }
+        return "jobs", 201, {"id": job_id}, {}
+
+    def transcript(self, job_id):
+        job = self.jobs[job_id]
+        rng = random.Random(f"{self.seed}-{job_id}")
+        transcript = transcript_header(job["name"], job["language"], job["duration"], job["submitted_at"], rng)
+        transcript["job"]["id"] = job_id
+        transcript["results"] = transcript_results(job["language"], job["duration"], f"{self.seed}-{job['name']}")
+        return transcript
+
+    def handle(self, method, path, headers, body):
+        if headers.get("Authorization") != f"Bearer {self.api_key}":
+            return "auth", 401, {"error": "Permission Denied"}, {}
+
+        if method == "POST" and path == "/v2/jobs":
+            return self.submit(headers, body)
+
+        match = re.fullmatch(r"/v2/jobs/([^/]+)(/transcript)?", path)
+        if method != "GET" or not match:
+            return "unknown", 404, {"error": "Not Found"}, {}
+        job_id, transcript = match.groups()
+        if job_id not in self.jobs:
+            return "job", 404, {"error": "Job not found"}, {}
+        done = time.monotonic() >= self.jobs[job_id]["ready_at"]
+
+        if transcript:
+            if not done:
+                return "transcript", 404, {"error": "Job not done"}, {}
+            return "transcript", 200, self.transcript(job_id), {}
+        return "job", 200, {"job": {"id": job_id, "status": "done" if done else "running"}}, {}
+
+
+class FakeGemini(FakeService):
+    """Gemini File Search store listing, creation and resumable uploads."""
+
+    name = "fake-gemini"
+    api_key = "fake-gemini-key"
+
+    def __init__(self, port=0, latency_seconds=0.5):
+        super().__init__(port)
+        self.latency_seconds = latency_seconds
+        self.stores = {}
+        self.sessions = {}
+        self.documents = []
+        self.ids = itertools.count(1)
+
+    def document_stats(self):
+        with self.lock:
+            return {
+                "stores": len(self.stores),
+                "documents": len(self.documents),
+                "uploaded_bytes": sum(document["size"] for document in self.documents),
+            }
+
+    def stats(self):
+        return {**super().stats(), "file_search": self.document_stats()}
+
+    def handle(self, method, path, headers, body):
+        if path.startswith("/upload-session/"):
+            return self.upload(path.rsplit("/", 1)[1], headers, body)
+
+        if headers.get("x-goog-api-key") != self.api_key:
+            return "auth", 403, {"error": {"code": 403, "message": "API key not valid", "status": "PERMISSION_DENIED"}}, {}
+
+        if path == "/v1beta/fileSearchStores":
+            if method == "GET":
+                with self.lock:
+                    stores = list(self.stores.values())
+                return "stores.list", 200, {"fileSearchStores": stores}, {}
+            config = json.loads(body or b"{}")
+            store = {
+                "name": f"fileSearchStores/store-{next(self.ids)}",
+                "displayName": config.get("displayName", ""),
+                "createTime": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            }
+            with self.lock:
+                self.stores[store["name"]] = store
+            return "stores.create", 200, store, {}
+
+        match = re.fullmatch(r"/upload/v1beta/(fileSearchStores/[^/:]+):uploadToFileSearchStore", path)
+        if method == "POST" and match:
+            if match.group(1) not in self.stores:
+                return "upload.start", 404, {"error": {"code": 404, "message": "Store not found"}}, {}
+            session_id = str(next(self.ids))
+            with self.lock:
+                self.sessions[session_id] = {"store": match.group(1), "metadata": json.loads(body or b"{}")}
+            return "upload.start", 200, b"", {"X-Goog-Upload-URL": f"{self.url}/upload-session/{session_id}",
+                                               "X-Goog-Upload-Status": "active"}
+
+        return "unknown", 404, {"error": {"code": 404, "message": "Not Found"}}, {}
+
+    def upload(self, session_id, headers, body):
+        if session_id not in self.sessions:
+            return "upload.session", 404, {"error": {"code": 404, "message": "Upload session not found"}}, {}
+        session = self.sessions[session_id]
+        session["size"] = session.get("size", 0) + len(body)
+        if "finalize" not in headers.get("X-Goog-Upload-Command", ""):
+            return "upload.chunk", 200, b"", {"X-Goog-Upload-Status": "active"}
+
+        # Indexing happens server-side before the operation is returned
+        time.sleep(self.latency_seconds)
+        with self.lock:
+            self.documents.append({"store": session["store"], "size": session["size"],
+                                   "display_name": session["metadata"].get("displayName")})
+            del self.sessions[session_id]
+        operation = {"name": f"{session['store']}/upload/operations/op-{session_id}", "done": False}
+        return "upload.finalize", 200, operation, {"X-Goog-Upload-Status": "final"}
+
+
+class FakeSocket(FakeService):
+    """backend-socket broadcast endpoint that keeps what was broadcast on each channel."""
+
+    name = "fake-socket"
+
+    def __init__(self, port=0):
+        super().__init__(port)
+        self.channels = {}
+
+    def broadcast_stats(self):
+        with self.lock:
+            return {
+                "broadcasts": sum(channel["broadcasts"] for channel in self.channels.values()),
+                "channels": len(self.channels),
+                "statuses": dict(Counter(channel["last"].get("status") for channel in self.channels.values()
+                                         if isinstance(channel["last"], dict))),
+                # How many stages the last broadcast of each channel carried: {stage count: channels}
+                "final_stages": dict(Counter(len(channel["last"].get("stages") or {})
+                                             for channel in self.channels.values()
+                                             if isinstance(channel["last"], dict))),
+            }
+
+    def stats(self):
+        return {**super().stats(), "broadcast": self.broadcast_stats()}
+
+    def handle(self, method, path, headers, body):
+        if method != "POST" or path != "/api/broadcast":
+            return "unknown", 404, {"error": "Not Found"}, {}
+        try:
+            message = json.loads(body)
+        except json.JSONDecodeError:
+            return "broadcast", 400, {"error": "Invalid JSON"}, {}
+        if not isinstance(message, dict) or not message.get("channel"):
+            return "broadcast", 400, {"error": "Channel must not be empty"}, {}
+        with self.lock:
+            channel = self.channels.setdefault(message["channel"], {"broadcasts": 0, "last": None})
+            channel["broadcasts"] += 1
+            channel["last"] = message.get("payload")
+        return "broadcast", 200, {"success": True, "channel": message["channel"], "clientCount": 0}, {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the fake Speechmatics and Gemini services")
+    parser.add_argument("--speechmatics-port", type=int, default=14100, help="Port for fake Speechmatics (default: 14100)")
+    parser.add_argument("--gemini-port", type=int, default=14101, help="Port for fake Gemini (default: 14101)")
+    parser.add_argument("--socket-port", type=int, default=14102, help="Port for fake backend-socket (default: 14102)")
+    parser.add_argument("--transcription-seconds", type=float, default=2.0,
+                        help="Fixed time per transcription job (default: 2.0)")
+    parser.add_argument("--transcription-rtf", type=float, default=0.0,
+                        help="Additional transcription time per second of audio (default: 0.0)")
+    parser.add_argument("--upload-seconds", type=float, default=0.5, help="Time to finalize an upload (default: 0.5)")
+    args = parser.parse_args()
+
+    speechmatics = FakeSpeechmatics(args.speechmatics_port, args.transcription_seconds, args.transcription_rtf)
+    gemini = FakeGemini(args.gemini_port, args.upload_seconds)
+    socket = FakeSocket(args.socket_port)
+    with speechmatics, gemini, socket:
+        print(f"✓ Fake Speechmatics at {speechmatics.api_url} (key: {FakeSpeechmatics.api_key})")
+        print(f"✓ Fake Gemini at {gemini.url} (key: {FakeGemini.api_key})")
+        print(f"✓ Fake backend-socket at {socket.url}")
+        print("Press Ctrl+C to stop")
+        stopped = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopped.set())
+        stopped.wait()
+        print(json.dumps({"speechmatics": speechmatics.stats(), "gemini": gemini.stats(), "socket": socket.stats()},
+                         indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Simulation of the recording intake policies on a realistic workday backlog.
+
+process_batch_recordings claims one queued recording per scheduler tick, in
+the order recording_queue.py gives for RECORDING_INTAKE_POLICY. The order only
+matters while more recordings are queued than the pipeline can take, so this
+replays whole workdays through a discrete-event model instead of running the
+DAG:
+1. Each day starts with a --backlog of recordings queued during the previous
+   hour (the pipeline was not running: laptop asleep, Airflow restarted), then
+   --recordings more arrive over --hours, each queued when its meeting ends.
+   Recordings are stand-ups (10-20 min), meetings (25-60 min) and workshops
+   (90-180 min); --priority-share of the meetings are queued with priority 1
+2. --workers recordings are processed at once; a free worker claims the next
+   recording at the following scheduler tick (one claim per tick, like the
+   DAG's 5 s schedule), using recording_queue.schedule() itself
+3. A recording takes --overhead-seconds plus --rtf times its duration
+   (conversion, transcription, note and uploads)
+
+Reports time-to-transcript (queued until processed) per policy: mean, p50,
+p95 and max, overall and per recording class, averaged over --days seeded
+days so every policy sees exactly the same backlog.
+
+Usage (from the repository root):
+    python tests/pipeline/simulate_scheduling.py --days 200 --workers 1
+"""
+
+import argparse
+import heapq
+import importlib.util
+import json
+import math
+import random
+import statistics
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+QUEUE_SCRIPT = REPO_DIR / "packages" / "audio" / "scripts" / "recording_queue.py"
+DEFAULT_REPORT = REPO_DIR / "tests" / "pipeline" / "reports" / "scheduling-simulation.json"
+SCHEDULER_TICK_SECONDS = 5
+
+# class: (share of recordings, duration range in minutes)
+RECORDING_CLASSES = {
+    'standup': (0.35, (10, 20)),
+    'meeting': (0.45, (25, 60)),
+    'workshop': (0.20, (90, 180)),
+}
+
+
+def load_recording_queue():
+    spec = importlib.util.spec_from_file_location("recording_queue", QUEUE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def workday(rng, recording_queue, recordings, backlog, hours, priority_share):
+    """Recordings of one day, as (class, QueuedRecording) with queued_at in seconds from the start of the day."""
+    day = []
+    classes = list(RECORDING_CLASSES)
+    weights = [RECORDING_CLASSES[c][0] for c in classes]
+    for index in range(backlog + recordings):
+        recording_class = rng.choices(classes, weights)[0]
+        low, high = RECORDING_CLASSES[recording_class][1]
+        duration = rng.uniform(low, high) * 60
+        if index < backlog:
+            queued_at = -rng.uniform(0, 3600)
+        else:
+            queued_at = rng.uniform(0, hours * 3600 - duration) + duration
+        priority = 1 if recording_class == 'meeting' and rng.random() < priority_share else 0
+        day.append((recording_class, recording_queue.QueuedRecording(
+            f"{recording_class}-{index}", queued_at, duration, priority)))
+    return day
+
+
+def simulate(recording_queue, day, policy, workers, max_wait, overhead, rtf):
+    """Process one day's recordings. Returns [(class, priority, time to transcript, starved)]."""
+    classes = {id(recording): recording_class for recording_class, recording in day}
+    arrivals = sorted((recording for _, recording in day), key=lambda r: r.queued_at)
+    free_at = [0.0] * workers
+    queue, results = [], []
+    next_arrival = 0
+    last_claim = -math.inf
+
+    while next_arrival < len(arrivals) or queue:
+        now = heapq.heappop(free_at)
+        if not queue and arrivals[next_arrival].queued_at > now:
+            now = arrivals[next_arrival].queued_at
+        # Claims happen at scheduler ticks, at most one per tick
+        now = max(math.ceil(now / SCHEDULER_TICK_SECONDS) * SCHEDULER_TICK_SECONDS,
+                  last_claim + SCHEDULER_TICK_SECONDS)
+        while next_arrival < len(arrivals) and arrivals[next_arrival].queued_at <= now:
+            queue.append(arrivals[next_arrival])
+            next_arrival += 1
+
+        recording = recording_queue.next_recording(queue, policy, now, max_wait)
+        queue.remove(recording)
+        last_claim = now
+        finished = now + overhead + rtf * recording.duration
+        heapq.heappush(free_at, finished)
+        results.append((classes[id(recording)], recording.priority, finished - recording.queued_at,
+                        max_wait is not None and now - recording.queued_at > max_wait))
+    return results
+
+
+def summarize(times):
+    """Time-to-transcript statistics in minutes."""
+    times = sorted(t / 60 for t in times)
+    if not times:
+        return None
+    return {
+        'count': len(times),
+        'mean': round(statistics.fmean(times), 1),
+        'p50': round(percentile(times, 50), 1),
+        'p95': round(percentile(times, 95), 1),
+        'max': round(times[-1], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate recording intake policies on a workday backlog")
+    parser.add_argument("--days", type=int, default=200, help="Simulated workdays (default: 200)")
+    parser.add_argument("--recordings", type=int, default=16, help="Recordings arriving per day (default: 16)")
+    parser.add_argument("--backlog", type=int, default=6, help="Recordings queued at the start of a day (default: 6)")
+    parser.add_argument("--hours", type=float, default=9, help="Length of the workday (default: 9)")
+    parser.add_argument("--priority-share", type=float, default=0.2,
+                        help="Share of meetings queued with priority 1 (default: 0.2)")
+    parser.add_argument("--workers", type=int, default=1, help="Recordings processed at once (default: 1)")
+    parser.add_argument("--overhead-seconds", type=float, default=90,
+                        help="Fixed processing time per recording (default: 90)")
+    parser.add_argument("--rtf", type=float, default=0.25,
+                        help="Processing seconds per second of audio (default: 0.25)")
+    parser.add_argument("--max-wait-minutes", type=float, default=120,
+                        help="Starvation limit, 0 to disable (default: 120)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first day (default: 0)")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT, help=f"JSON report path (default: {DEFAULT_REPORT})")
+    args = parser.parse_args()
+
+    if args.days < 1 or args.workers < 1 or args.recordings + args.backlog < 1:
+        print("Error: --days, --workers and --recordings + --backlog must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    recording_queue = load_recording_queue()
+    max_wait = args.max_wait_minutes * 60 if args.max_wait_minutes > 0 else None
+    days = [workday(random.Random(args.seed + index), recording_queue, args.recordings, args.backlog,
+                    args.hours, args.priority_share) for index in range(args.days)]
+    audio_hours = sum(recording.duration for day in days for _, recording in day) / 3600 / args.days
+    work_hours = sum(args.overhead_seconds + args.rtf * recording.duration
+                     for day in days for _, recording in day) / 3600 / args.days
+
+    report = {'parameters': {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+              'audio_hours_per_day': round(audio_hours, 2),
+              'processing_hours_per_day': round(work_hours, 2),
+              'policies': {}}
+    for policy in recording_queue.POLICIES:
+        results = [result for day in days for result in simulate(
+            recording_queue, day, policy, args.workers, max_wait, args.overhead_seconds, args.rtf)]
+        entry = summarize([t for _, _, t, _ in results])
+        entry['classes'] = {c: summarize([t for rc, _, t, _ in results if rc == c]) for c in RECORDING_CLASSES}
+        entry['classes']['priority'] = summarize([t for _, p, t, _ in results if p > 0])
+        entry['starved'] = sum(1 for *_, starved in results if starved)
+        report['policies'][policy] = entry
+
+    print(f"{args.days} days of {args.backlog} + {args.recordings} recordings "
+          f"({audio_hours:.1f} h audio, {work_hours:.1f} h processing per day), {args.workers} worker(s)")
+    print("Time to transcript in minutes:")
+    print(f"{'policy':<9} {'mean':>6} {'p50':>6} {'p95':>6} {'max':>6}  "
+          f"{'standup p95':>11} {'meeting p95':>11} {'workshop p95':>12} {'priority p95':>12} {'starved':>8}")
+    for policy, entry in report['policies'].items():
+        classes = entry['classes']
+        priority_p95 = classes['priority']['p95'] if classes['priority'] else '-'
+        print(f"{policy:<9} {entry['mean']:>6} {entry['p50']:>6} {entry['p95']:>6} {entry['max']:>6}  "
+              f"{classes['standup']['p95']:>11} {classes['meeting']['p95']:>11} "
+              f"{classes['workshop']['p95']:>12} {priority_p95:>12} {entry['starved']:>8}")
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Report written to {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Synthetic speech-like WAV recordings for pipeline benchmarks.
+
+Writes recordings in the format recordAudio.sh produces (48 kHz, stereo,
+32-bit float). The audio is built from a pool of synthesized syllables: a
+voiced harmonic series with a pitch glide, shaped by two formants, with a
+short noise burst for the consonant onset. Syllables are strung into
+utterances separated by pauses and speaker turns, so encoders and silence
+detection see something close to a meeting rather than a tone or noise.
+
+The syllable pool is synthesized once with the standard library; recordings of
+any length are then assembled from it block by block, so an hour of audio
+takes seconds and constant memory.
+
+Usage: python synthetic_speech.py <output.wav> --seconds 600 [--seed 0]
+"""
+
+import argparse
+import math
+import random
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+SAMPLE_RATE = 48000
+CHANNELS = 2
+BYTES_PER_SAMPLE = 4
+
+SYLLABLES = 48
+SYLLABLE_SECONDS = (0.12, 0.32)
+SYLLABLES_PER_UTTERANCE = (3, 14)
+SYLLABLE_GAP_SECONDS = (0.02, 0.08)
+UTTERANCE_PAUSE_SECONDS = (0.25, 1.2)
+TURN_PAUSE_SECONDS = (1.0, 3.0)
+TURN_PROBABILITY = 0.2
+
+# Speakers differ in pitch (Hz) and loudness
+VOICES = [(110, 0.30), (190, 0.25), (140, 0.35), (220, 0.22)]
+NOISE_FLOOR = 0.0005
+
+
+def wav_header(data_bytes):
+    """RIFF/WAVE header for IEEE float PCM (format tag 3)."""
+    block_align = CHANNELS * BYTES_PER_SAMPLE
+    return (
+        b'RIFF' + struct.pack('<I', 36 + data_bytes) + b'WAVE'
+        + b'fmt ' + struct.pack('<IHHIIHH', 16, 3, CHANNELS, SAMPLE_RATE,
+                                SAMPLE_RATE * block_align, block_align, BYTES_PER_SAMPLE * 8)
+        + b'data' + struct.pack('<I', data_bytes)
+    )
+
+
+def stereo_block(samples, gain_left=1.0, gain_right=0.9):
+    """Interleave a mono sample list into little-endian float32 stereo bytes."""
+    frames = array('f', [0.0]) * (2 * len(samples))
+    frames[0::2] = array('f', (sample * gain_left for sample in samples))
+    frames[1::2] = array('f', (sample * gain_right for sample in samples))
+    if sys.byteorder != 'little':
+        frames.byteswap()
+    return frames.tobytes()
+
+
+def synthesize_syllable(rng, pitch):
+    """One syllable: noise onset, then a formant-shaped harmonic vowel with a pitch glide."""
+    length = int(rng.uniform(*SYLLABLE_SECONDS) * SAMPLE_RATE)
+    onset = int(length * rng.uniform(0.05, 0.2))
+    formants = (rng.uniform(300, 900), rng.uniform(900, 2500))
+    glide = rng.uniform(-0.15, 0.15)
+    f0 = pitch * rng.uniform(0.85, 1.15)
+
+    # Harmonic amplitudes follow two formant resonances
+    harmonics = []
+    for k in range(1, int(3500 / f0) + 1):
+        frequency = k * f0
+        weight = sum(math.exp(-((frequency - formant) / 150) ** 2) for formant in formants) + 0.05 / k
+        harmonics.append((k, weight))
+    norm = sum(weight for _, weight in harmonics)
+
+    samples = []
+    phase = 0.0
+    for i in range(length):
+        t = i / length
+        envelope = math.sin(math.pi * t) ** 0.6
+        if i < onset:
+            samples.append(rng.uniform(-1, 1) * 0.3 * envelope)
+            continue
+        phase += 2 * math.pi * f0 * (1 + glide * t) / SAMPLE_RATE
+        value = sum(weight * math.sin(k * phase) for k, weight in harmonics) / norm
+        samples.append(value * envelope)
+    return samples
+
+
+class SpeechSynthesizer:
+    """Assembles speech-like audio from a syllable pool shared by all recordings."""
+
+    def __init__(self, seed=0):
+        rng = random.Random(seed)
+        self.syllables = []
+        for i in range(SYLLABLES):
+            pitch, loudness = VOICES[i % len(VOICES)]
+            samples = synthesize_syllable(rng, pitch)
+            self.syllables.append((i % len(VOICES), stereo_block([s * loudness for s in samples])))
+        noise = [rng.gauss(0, NOISE_FLOOR) for _ in range(SAMPLE_RATE)]
+        self.silence = stereo_block(noise)
+
+    def pause(self, seconds):
+        """Room-noise block of the given length."""
+        size = int(seconds * SAMPLE_RATE) * CHANNELS * BYTES_PER_SAMPLE
+        repeats = size // len(self.silence) + 1
+        return (self.silence * repeats)[:size]
+
+    def blocks(self, seconds, seed=0):
+        """Yield audio byte blocks totalling exactly seconds of audio."""
+        rng = random.Random(seed)
+        remaining = int(seconds * SAMPLE_RATE) * CHANNELS * BYTES_PER_SAMPLE
+        voice = rng.randrange(len(VOICES))
+
+        while remaining > 0:
+            if rng.random() < TURN_PROBABILITY:
+                voice = rng.randrange(len(VOICES))
+                block = self.pause(rng.uniform(*TURN_PAUSE_SECONDS))
+            else:
+                block = self.pause(rng.uniform(*UTTERANCE_PAUSE_SECONDS))
+            candidates = [samples for speaker, samples in self.syllables if speaker == voice]
+            parts = [block]
+            for _ in range(rng.randint(*SYLLABLES_PER_UTTERANCE)):
+                parts.append(rng.choice(candidates))
+                parts.append(self.pause(rng.uniform(*SYLLABLE_GAP_SECONDS)))
+            block = b''.join(parts)[:remaining]
+            remaining -= len(block)
+            yield block
+
+    def write(self, path, seconds, seed=0):
+        """Write a WAV file of the given length. Returns its size in bytes."""
+        data_bytes = int(seconds * SAMPLE_RATE) * CHANNELS * BYTES_PER_SAMPLE
+        path = Path(path)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(wav_header(data_bytes))
+            for block in self.blocks(seconds, seed):
+                f.write(block)
+        tmp_path.replace(path)
+        return 44 + data_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic speech-like WAV recording")
+    parser.add_argument("output", type=Path, help="WAV file to write")
+    parser.add_argument("--seconds", type=float, required=True, help="Length of the recording")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the utterance sequence (default: 0)")
+    args = parser.parse_args()
+
+    if args.seconds <= 0:
+        print("Error: --seconds must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    size = SpeechSynthesizer().write(args.output, args.seconds, args.seed)
+    print(f"✓ Wrote {args.seconds:g} s of speech-like audio to {args.output} ({size / 1024 ** 2:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()